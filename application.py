@@ -11,18 +11,23 @@ from fastapi import FastAPI, Request, WebSocket, WebSocketDisconnect, HTTPExcept
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import FileResponse, JSONResponse, StreamingResponse
 from pydantic import BaseModel
-from backend.graph import Graph
+from backend.graph import Graph, NODE_FACTORIES
 from backend.services.websocket_manager import WebSocketManager
 import logging
 import uvicorn
-from datetime import datetime
 import asyncio
+import hmac
 import uuid
-from collections import defaultdict
 from backend.services.mongodb import MongoDBService
+from backend.services.job_store import MongoJobStore, InMemoryJobStore
+from backend.services.job_registry import JobRegistry, InvalidTransitionError
+from backend.services.job_scheduler import JobScheduler, QueueFullError
 from backend.services.pdf_service import PDFService
-from tavily import AsyncTavilyClient
-from ibm_watsonx_ai import APIClient, Credentials
+from backend.services.client_pool import client_pool
+from backend.services.llm_cache import llm_cache
+from backend.services.search_cache import search_cache
+from backend.services.checkpoint_store import checkpoint_store
+from backend.services.research_refresh import plan_refresh, record_completed_job
 
 
 # Configure logging
@@ -41,32 +46,74 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-manager = WebSocketManager()
+manager = WebSocketManager(
+    max_buffered_events=int(os.getenv("WS_EVENT_BUFFER_SIZE", "500")),
+    max_buffered_jobs=int(os.getenv("WS_BUFFERED_JOBS", "200")),
+    max_send_queue=int(os.getenv("WS_SEND_QUEUE_SIZE", "256")),
+    coalesce_window=float(os.getenv("WS_COALESCE_WINDOW", "0.25"))
+)
 pdf_service = PDFService({"pdf_output_dir": "pdfs"})
 
-job_status = defaultdict(lambda: {
-    "status": "pending",
-    "result": None,
-    "error": None,
-    "debug_info": [],
-    "company": None,
-    "report": None,
-    "last_update": datetime.now().isoformat()
-})
-
-mongodb = None
+job_store = None
 if mongo_uri := os.getenv("MONGODB_URI"):
     try:
-        mongodb = MongoDBService(mongo_uri)
+        job_store = MongoJobStore(
+            MongoDBService(mongo_uri),
+            debounce=float(os.getenv("MONGODB_UPDATE_DEBOUNCE", "0.5")),
+            max_workers=int(os.getenv("MONGODB_MAX_WORKERS", "4"))
+        )
         logger.info("MongoDB integration enabled")
     except Exception as e:
         logger.warning(f"Failed to initialize MongoDB: {e}. Continuing without persistence.")
+elif os.getenv("JOB_STORE") == "memory":
+    job_store = InMemoryJobStore()
+    logger.info("Using in-memory job store")
+
+job_registry = JobRegistry(
+    max_jobs=int(os.getenv("MAX_TRACKED_JOBS", "1000")),
+    max_age=float(os.getenv("JOB_MAX_AGE", "86400")),
+    max_reports=int(os.getenv("MAX_REPORTS_IN_MEMORY", "100")),
+    job_store=job_store
+)
+
+scheduler = JobScheduler(
+    max_concurrent=int(os.getenv("MAX_CONCURRENT_JOBS", "4")),
+    max_queue=int(os.getenv("MAX_QUEUED_JOBS", "50")),
+    websocket_manager=manager
+)
+
+def update_job_status(job_id: str, status: str, **fields) -> None:
+    """Record a job status transition, logging instead of raising on invalid moves."""
+    try:
+        job_registry.transition(job_id, status, **fields)
+    except (KeyError, InvalidTransitionError) as e:
+        logger.warning(f"Could not move job {job_id} to {status}: {e}")
+
+def job_priority(request: Request) -> int:
+    """Queue priority for a request, assigned on the server.
+
+    Callers cannot pick their own priority. Only requests carrying the
+    operator token from JOB_PRIORITY_TOKEN (as `Authorization: Bearer ...`)
+    may ask for one with `X-Job-Priority`, clamped to +/-MAX_JOB_PRIORITY.
+    """
+    token = os.getenv("JOB_PRIORITY_TOKEN")
+    requested = request.headers.get("X-Job-Priority")
+    if not token or requested is None:
+        return 0
+    if not hmac.compare_digest(request.headers.get("Authorization", ""), f"Bearer {token}"):
+        return 0
+    try:
+        limit = int(os.getenv("MAX_JOB_PRIORITY", "10"))
+        return max(-limit, min(limit, int(requested)))
+    except ValueError:
+        return 0
 
 class ResearchRequest(BaseModel):
     company: str
     company_url: str | None = None
     industry: str | None = None
     hq_location: str | None = None
+    refresh: bool = False  # Reuse fresh results from the latest completed run for this company
 
 class PDFGenerationRequest(BaseModel):
     report_content: str
@@ -97,12 +144,23 @@ async def research(request: Request, data: ResearchRequest):
     
         logger.info(f"Received research request for {data.company}")
         job_id = str(uuid.uuid4())
-        asyncio.create_task(process_research(job_id, data, tavily_api_key, watsonx_api_key, watsonx_project_id))
+        job_registry.create(job_id, company=data.company)
+        try:
+            queue_position = scheduler.submit(
+                job_id,
+                lambda: process_research(job_id, data, tavily_api_key, watsonx_api_key, watsonx_project_id),
+                priority=job_priority(request)
+            )
+        except QueueFullError as e:
+            update_job_status(job_id, JobRegistry.FAILED, error=str(e))
+            raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "30"})
 
         response = JSONResponse(content={
             "status": "accepted",
             "job_id": job_id,
-            "message": "Research started. Connect to WebSocket for updates.",
+            "message": "Research started. Connect to WebSocket for updates." if not queue_position
+                       else f"Research queued at position {queue_position}. Connect to WebSocket for updates.",
+            "queue_position": queue_position,
             "websocket_url": f"/research/ws/{job_id}"
         })
         response.headers["Access-Control-Allow-Origin"] = "*"
@@ -110,22 +168,34 @@ async def research(request: Request, data: ResearchRequest):
         response.headers["Access-Control-Allow-Headers"] = "Content-Type, Authorization"
         return response
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error initiating research: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
 
-async def process_research(job_id: str, data: ResearchRequest, tavily_api_key: str, watsonx_api_key: str, watsonx_project_id: str):
+async def process_research(job_id: str, data: ResearchRequest, tavily_api_key: str, watsonx_api_key: str,
+                           watsonx_project_id: str, resume: bool = False):
     try:
-        if mongodb:
-            mongodb.create_job(job_id, data.dict())
-        await asyncio.sleep(1)  # Allow WebSocket connection
+        if not resume:
+            await checkpoint_store.save_job(job_id, data.dict())
+        if job_store:
+            if not resume:
+                await job_store.create_job(job_id, data.dict())
+            await job_store.update_job(job_id=job_id, status="processing")
+        update_job_status(job_id, JobRegistry.PROCESSING)
         
-        tavily_client = AsyncTavilyClient(api_key=tavily_api_key)
-        watsonx_client = APIClient(Credentials(
-            url=os.getenv("WATSONX_URL"),
+        tavily_client = client_pool.get_tavily_client(tavily_api_key)
+        watsonx_client = await client_pool.get_watsonx_client(
             api_key=watsonx_api_key,
-        ))
+            url=os.getenv("WATSONX_URL"),
+            project_id=watsonx_project_id
+        )
+
 
+        refresh_plan = None
+        if data.refresh and not resume:
+            refresh_plan = await plan_refresh(checkpoint_store, data.company, data.company_url)
 
         await manager.send_status_update(job_id, status="processing", message="Starting research")
 
@@ -138,7 +208,10 @@ async def process_research(job_id: str, data: ResearchRequest, tavily_api_key: s
             job_id=job_id,
             tavily_client=tavily_client,
             watsonx_client=watsonx_client,
-            watsonx_project_id=watsonx_project_id
+            watsonx_project_id=watsonx_project_id,
+            checkpoint_store=checkpoint_store,
+            resume=resume,
+            refresh=refresh_plan
         )
 
         state = {}
@@ -149,15 +222,11 @@ async def process_research(job_id: str, data: ResearchRequest, tavily_api_key: s
         report_content = state.get('report') or (state.get('editor') or {}).get('report')
         if report_content:
             logger.info(f"Found report in final state (length: {len(report_content)})")
-            job_status[job_id].update({
-                "status": "completed",
-                "report": report_content,
-                "company": data.company,
-                "last_update": datetime.now().isoformat()
-            })
-            if mongodb:
-                mongodb.update_job(job_id=job_id, status="completed")
-                mongodb.store_report(job_id=job_id, report_data={"report": report_content})
+            update_job_status(job_id, JobRegistry.COMPLETED, report=report_content, company=data.company)
+            await record_completed_job(checkpoint_store, data.company, data.company_url, job_id)
+            if job_store:
+                await job_store.update_job(job_id=job_id, status="completed")
+                job_registry.persist_report(job_id)
             await manager.send_status_update(
                 job_id=job_id,
                 status="completed",
@@ -175,6 +244,7 @@ async def process_research(job_id: str, data: ResearchRequest, tavily_api_key: s
             error_message = "No report found"
             if error := state.get('error'):
                 error_message = f"Error: {error}"
+            update_job_status(job_id, JobRegistry.FAILED, error=error_message)
             
             await manager.send_status_update(
                 job_id=job_id,
@@ -185,18 +255,87 @@ async def process_research(job_id: str, data: ResearchRequest, tavily_api_key: s
 
     except Exception as e:
         logger.error(f"Research failed: {str(e)}")
+        update_job_status(job_id, JobRegistry.FAILED, error=str(e))
         await manager.send_status_update(
             job_id=job_id,
             status="failed",
             message=f"Research failed: {str(e)}",
             error=str(e)
         )
-        if mongodb:
-            mongodb.update_job(job_id=job_id, status="failed", error=str(e))
+        if job_store:
+            await job_store.update_job(job_id=job_id, status="failed", error=str(e))
+@app.on_event("startup")
+async def startup():
+    if job_store:
+        await job_store.ensure_indexes()
+
+@app.on_event("shutdown")
+async def shutdown():
+    if job_store:
+        await job_store.close()
+
 @app.get("/")
 async def ping():
     return {"message": "Alive"}
 
+@app.post("/research/{job_id}/cancel")
+async def cancel_research(job_id: str):
+    if not scheduler.cancel(job_id):
+        raise HTTPException(status_code=409, detail="Only queued research jobs can be cancelled")
+    update_job_status(job_id, JobRegistry.CANCELLED)
+    await manager.send_status_update(job_id, status="cancelled", message="Research cancelled before it started")
+    return {"status": "cancelled", "job_id": job_id}
+
+@app.post("/research/{job_id}/resume")
+async def resume_research(request: Request, job_id: str):
+    """Restart a job, replaying the nodes it completed before it stopped."""
+    tavily_api_key = request.headers.get("X-Tavily-API-Key")
+    watsonx_api_key = request.headers.get("X-WatsonX-API-Key")
+    watsonx_project_id = request.headers.get("X-WatsonX-Project-ID")
+    if not tavily_api_key or not watsonx_api_key or not watsonx_project_id:
+        raise HTTPException(status_code=400, detail="Missing required API keys in headers")
+
+    if scheduler.is_running(job_id) or scheduler.position(job_id) is not None:
+        raise HTTPException(status_code=409, detail="Research job is already running or queued")
+    if not (request_data := await checkpoint_store.load_job(job_id)):
+        raise HTTPException(status_code=404, detail="No checkpoint found for this research job")
+
+    data = ResearchRequest(**request_data)
+    completed_nodes = await checkpoint_store.completed_nodes(job_id, list(NODE_FACTORIES))
+    logger.info(f"Resuming job {job_id} with completed nodes: {completed_nodes}")
+
+    # Events from the earlier run (e.g. its failure) should not be replayed to new clients
+    manager.clear_events(job_id)
+    job_registry.create(job_id, company=data.company)
+    try:
+        queue_position = scheduler.submit(
+            job_id,
+            lambda: process_research(job_id, data, tavily_api_key, watsonx_api_key, watsonx_project_id, resume=True),
+            priority=job_priority(request)
+        )
+    except QueueFullError as e:
+        update_job_status(job_id, JobRegistry.FAILED, error=str(e))
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "30"})
+
+    return {
+        "status": "accepted",
+        "job_id": job_id,
+        "completed_nodes": completed_nodes,
+        "queue_position": queue_position,
+        "websocket_url": f"/research/ws/{job_id}"
+    }
+
+@app.get("/jobs/stats")
+async def job_stats():
+    return {
+        **job_registry.memory_usage(),
+        "scheduler": scheduler.stats(),
+        "clients": client_pool.stats(),
+        "llm_cache": llm_cache.stats(),
+        "search_cache": search_cache.stats(),
+        "websockets": manager.stats()
+    }
+
 @app.get("/research/pdf/{filename}")
 async def get_pdf(filename: str):
     pdf_path = os.path.join("pdfs", filename)
@@ -210,8 +349,7 @@ async def websocket_endpoint(websocket: WebSocket, job_id: str):
         await websocket.accept()
         await manager.connect(websocket, job_id)
 
-        if job_id in job_status:
-            status = job_status[job_id]
+        if status := job_registry.get(job_id):
             await manager.send_status_update(
                 job_id,
                 status=status["status"],
@@ -219,6 +357,13 @@ async def websocket_endpoint(websocket: WebSocket, job_id: str):
                 error=status["error"],
                 result=status["result"]
             )
+        if (queue_position := scheduler.position(job_id)) is not None:
+            await manager.send_status_update(
+                job_id,
+                status="queued",
+                message=f"Waiting for a free research slot (position {queue_position} in queue)",
+                result={"queue_position": queue_position}
+            )
 
         while True:
             try:
@@ -233,30 +378,28 @@ async def websocket_endpoint(websocket: WebSocket, job_id: str):
 
 @app.get("/research/{job_id}")
 async def get_research(job_id: str):
-    if not mongodb:
+    if not job_store:
         raise HTTPException(status_code=501, detail="Database persistence not configured")
-    job = mongodb.get_job(job_id)
+    job = await job_store.get_job(job_id)
     if not job:
         raise HTTPException(status_code=404, detail="Research job not found")
     return job
 
 @app.get("/research/{job_id}/report")
 async def get_research_report(job_id: str):
-    if not mongodb:
-        if job_id in job_status:
-            result = job_status[job_id]
-            if report := result.get("report"):
-                return {"report": report}
+    if not job_store:
+        if report := await job_registry.get_report(job_id):
+            return {"report": report}
         raise HTTPException(status_code=404, detail="Report not found")
     
-    report = mongodb.get_report(job_id)
+    report = await job_store.get_report(job_id)
     if not report:
         raise HTTPException(status_code=404, detail="Research report not found")
     return report
 
 @app.post("/research/{job_id}/generate-pdf")
 async def generate_pdf(job_id: str):
-    return pdf_service.generate_pdf_from_job(job_id, job_status, mongodb)
+    return await pdf_service.generate_pdf_from_job(job_id, job_registry, job_store)
 
 @app.post("/generate-pdf")
 async def generate_pdf(data: GeneratePDFRequest):
@@ -1,5 +1,4 @@
 from typing import TypedDict, NotRequired, Required, Dict, List, Any
-from backend.services.websocket_manager import WebSocketManager
 
 #Define the input state
 class InputState(TypedDict, total=False):
@@ -7,8 +6,7 @@ class InputState(TypedDict, total=False):
     company_url: NotRequired[str]
     hq_location: NotRequired[str]
     industry: NotRequired[str]
-    websocket_manager: NotRequired[WebSocketManager]
-    job_id: NotRequired[str]
+    previous_briefings: NotRequired[Dict[str, Any]]
 
 class ResearchState(InputState):
     site_scrape: Dict[str, Any]
@@ -27,4 +25,5 @@ class ResearchState(InputState):
     company_briefing: str
     references: List[str]
     briefings: Dict[str, Any]
+    briefing_fingerprints: Dict[str, str]
     report: str
\ No newline at end of file
@@ -1,9 +1,12 @@
 from langchain_core.messages import SystemMessage
+from langchain_core.runnables import RunnableConfig
 from langgraph.graph import StateGraph
-from typing import Dict, Any, AsyncIterator
+from typing import Dict, Any, AsyncIterator, Callable
+from functools import lru_cache
 import logging
+import os
 
-from .classes.state import InputState
+from .classes.state import InputState, ResearchState
 from .nodes import GroundingNode
 from .nodes.researchers import (FinancialAnalyst, NewsScanner, 
                                IndustryAnalyzer, CompanyAnalyzer)
@@ -12,17 +15,154 @@ from .nodes.curator import Curator
 from .nodes.enricher import Enricher
 from .nodes.briefing import Briefing
 from .nodes.editor import Editor
+from .services.client_pool import client_pool
 
 logger = logging.getLogger(__name__)
 
+# Node constructors, given the per-job clients
+NODE_FACTORIES: Dict[str, Callable[[Dict[str, Any]], Any]] = {
+    "grounding": lambda deps: GroundingNode(deps["tavily_client"]),
+    "financial_analyst": lambda deps: FinancialAnalyst(deps["tavily_client"], deps["watsonx_client"], deps["watsonx_project_id"]),
+    "news_scanner": lambda deps: NewsScanner(deps["tavily_client"], deps["watsonx_client"], deps["watsonx_project_id"]),
+    "industry_analyst": lambda deps: IndustryAnalyzer(deps["tavily_client"], deps["watsonx_client"], deps["watsonx_project_id"]),
+    "company_analyst": lambda deps: CompanyAnalyzer(deps["tavily_client"], deps["watsonx_client"], deps["watsonx_project_id"]),
+    "collector": lambda deps: Collector(),
+    "curator": lambda deps: Curator(),
+    "enricher": lambda deps: Enricher(deps["tavily_client"]),
+    "briefing": lambda deps: Briefing(deps["watsonx_client"], deps["watsonx_project_id"]),
+    "editor": lambda deps: Editor(deps["watsonx_client"], deps["watsonx_project_id"])
+}
+
+async def resolve_dependencies(config: RunnableConfig) -> Dict[str, Any]:
+    """Per-job clients from the run config, falling back to pooled clients built from the environment."""
+    configurable = (config or {}).get("configurable", {})
+    project_id = configurable.get("watsonx_project_id") or os.getenv("WATSONX_PROJECT_ID")
+
+    tavily_client = configurable.get("tavily_client")
+    if tavily_client is None and (tavily_api_key := os.getenv("TAVILY_API_KEY")):
+        tavily_client = client_pool.get_tavily_client(tavily_api_key)
+
+    watsonx_client = configurable.get("watsonx_client")
+    if watsonx_client is None and (watsonx_api_key := os.getenv("WATSONX_API_KEY")):
+        watsonx_client = await client_pool.get_watsonx_client(
+            api_key=watsonx_api_key,
+            url=os.getenv("WATSONX_URL"),
+            project_id=project_id
+        )
+
+    return {
+        "tavily_client": tavily_client,
+        "watsonx_client": watsonx_client,
+        "watsonx_project_id": project_id
+    }
+
+# Per-job context handed to nodes from the run config rather than kept in graph state
+JOB_CONTEXT_KEYS = ("websocket_manager", "job_id")
+
+def _node_runner(name: str):
+    """Wrap a node so its instance is built from the clients of the job being run.
+
+    The job's id and WebSocket manager come from `config["configurable"]`;
+    the node sees them alongside the state it is given, and they are taken
+    back out of its output so they never enter graph state or checkpoints.
+    With a checkpoint store configured every node output is checkpointed,
+    and a resumed job replays the outputs of nodes that already completed.
+    A refresh run takes the outputs of still-fresh nodes from an earlier job
+    for the same company.
+    """
+    factory = NODE_FACTORIES[name]
+
+    def without_job_context(output: Dict[str, Any]) -> Dict[str, Any]:
+        return {key: value for key, value in output.items() if key not in JOB_CONTEXT_KEYS}
+
+    async def run(state: ResearchState, config: RunnableConfig) -> ResearchState:
+        configurable = (config or {}).get("configurable", {})
+        store = configurable.get("checkpoint_store")
+        job_id = configurable.get("job_id")
+        websocket_manager = configurable.get("websocket_manager")
+
+        if store and job_id and configurable.get("resume"):
+            if (output := await store.load_node(job_id, name)) is not None:
+                logger.info(f"Restored {name} for job {job_id} from checkpoint")
+                return without_job_context(output)
+
+        refresh = configurable.get("refresh") or {}
+        if store and job_id and name in refresh.get("reuse_nodes", ()):
+            if (output := await store.load_node(refresh["job_id"], name)) is not None:
+                # The earlier job's inputs and identity must not overwrite this job's
+                output = {key: value for key, value in without_job_context(output).items()
+                          if key not in InputState.__annotations__}
+                logger.info(f"Reusing {name} output from job {refresh['job_id']} for job {job_id}")
+                if websocket_manager:
+                    await websocket_manager.send_status_update(
+                        job_id=job_id,
+                        status="processing",
+                        message=f"Reusing recent {name.replace('_', ' ')} results",
+                        result={"step": name, "reused": True}
+                    )
+                await store.save_node(job_id, name, output)
+                return output
+
+        node = factory(await resolve_dependencies(config))
+        output = await node.run({**state, "websocket_manager": websocket_manager, "job_id": job_id})
+        if isinstance(output, dict):
+            output = without_job_context(output)
+            if store and job_id:
+                await store.save_node(job_id, name, output)
+        return output
+
+    run.__name__ = name
+    return run
+
+def build_workflow() -> StateGraph:
+    """Configure the job-independent state graph workflow"""
+    workflow = StateGraph(InputState)
+
+    # Add nodes with their respective processing functions
+    for name in NODE_FACTORIES:
+        workflow.add_node(name, _node_runner(name))
+
+    # Configure workflow edges
+    workflow.set_entry_point("grounding")
+    workflow.set_finish_point("editor")
+
+    research_nodes = [
+        "financial_analyst", 
+        "news_scanner",
+        "industry_analyst", 
+        "company_analyst"
+    ]
+
+    # Connect grounding to all research nodes
+    for node in research_nodes:
+        workflow.add_edge("grounding", node)
+        workflow.add_edge(node, "collector")
+
+    # Connect remaining nodes
+    workflow.add_edge("collector", "curator")
+    workflow.add_edge("curator", "enricher")
+    workflow.add_edge("enricher", "briefing")
+    workflow.add_edge("briefing", "editor")
+    return workflow
+
+@lru_cache(maxsize=None)
+def compiled_workflow():
+    """The compiled workflow, built once per process and shared by every job."""
+    logger.info("Compiling research workflow")
+    return build_workflow().compile()
+
 class Graph:
     def __init__(self, company=None, url=None, hq_location=None, industry=None,
-                 websocket_manager=None, job_id=None, tavily_client=None, watsonx_client=None, watsonx_project_id=None):
+                 websocket_manager=None, job_id=None, tavily_client=None, watsonx_client=None, watsonx_project_id=None,
+                 checkpoint_store=None, resume=False, refresh=None):
         self.websocket_manager = websocket_manager
         self.job_id = job_id
         self.tavily_client = tavily_client
         self.watsonx_client = watsonx_client
         self.watsonx_project_id = watsonx_project_id
+        self.checkpoint_store = checkpoint_store
+        self.resume = resume
+        self.refresh = refresh
         
         # Initialize InputState
         self.input_state = InputState(
@@ -30,75 +170,33 @@ class Graph:
             company_url=url,
             hq_location=hq_location,
             industry=industry,
-            websocket_manager=websocket_manager,
-            job_id=job_id,
+            previous_briefings=(refresh or {}).get("previous_briefings", {}),
             messages=[
                 SystemMessage(content="Expert researcher starting investigation")
             ]
         )
 
-        # Initialize nodes with WebSocket manager and job ID
-        self._init_nodes()
-        self._build_workflow()
-
-    def _init_nodes(self):
-        """Initialize all workflow nodes"""
-        self.ground = GroundingNode(self.tavily_client)
-        self.financial_analyst = FinancialAnalyst(self.tavily_client, self.watsonx_client, self.watsonx_project_id)
-        self.news_scanner = NewsScanner(self.tavily_client, self.watsonx_client, self.watsonx_project_id)
-        self.industry_analyst = IndustryAnalyzer(self.tavily_client, self.watsonx_client, self.watsonx_project_id)
-        self.company_analyst = CompanyAnalyzer(self.tavily_client, self.watsonx_client, self.watsonx_project_id)
-        self.collector = Collector()
-        self.curator = Curator()
-        self.enricher = Enricher(self.tavily_client)
-        self.briefing = Briefing(self.watsonx_client, self.watsonx_project_id)
-        self.editor = Editor(self.watsonx_client, self.watsonx_project_id)
-
-    def _build_workflow(self):
-        """Configure the state graph workflow"""
-        self.workflow = StateGraph(InputState)
-        
-        # Add nodes with their respective processing functions
-        self.workflow.add_node("grounding", self.ground.run)
-        self.workflow.add_node("financial_analyst", self.financial_analyst.run)
-        self.workflow.add_node("news_scanner", self.news_scanner.run)
-        self.workflow.add_node("industry_analyst", self.industry_analyst.run)
-        self.workflow.add_node("company_analyst", self.company_analyst.run)
-        self.workflow.add_node("collector", self.collector.run)
-        self.workflow.add_node("curator", self.curator.run)
-        self.workflow.add_node("enricher", self.enricher.run)
-        self.workflow.add_node("briefing", self.briefing.run)
-        self.workflow.add_node("editor", self.editor.run)
-
-        # Configure workflow edges
-        self.workflow.set_entry_point("grounding")
-        self.workflow.set_finish_point("editor")
-        
-        research_nodes = [
-            "financial_analyst", 
-            "news_scanner",
-            "industry_analyst", 
-            "company_analyst"
-        ]
-
-        # Connect grounding to all research nodes
-        for node in research_nodes:
-            self.workflow.add_edge("grounding", node)
-            self.workflow.add_edge(node, "collector")
-
-        # Connect remaining nodes
-        self.workflow.add_edge("collector", "curator")
-        self.workflow.add_edge("curator", "enricher")
-        self.workflow.add_edge("enricher", "briefing")
-        self.workflow.add_edge("briefing", "editor")
+    def _configurable(self) -> Dict[str, Any]:
+        """Per-job dependencies handed to the nodes through the run config."""
+        return {
+            "websocket_manager": self.websocket_manager,
+            "job_id": self.job_id,
+            "tavily_client": self.tavily_client,
+            "watsonx_client": self.watsonx_client,
+            "watsonx_project_id": self.watsonx_project_id,
+            "checkpoint_store": self.checkpoint_store,
+            "resume": self.resume,
+            "refresh": self.refresh
+        }
 
     async def run(self, thread: Dict[str, Any]) -> AsyncIterator[Dict[str, Any]]:
         """Execute the research workflow"""
-        compiled_graph = self.workflow.compile()
-        
-        async for state in compiled_graph.astream(
+        config = dict(thread or {})
+        config["configurable"] = {**config.get("configurable", {}), **self._configurable()}
+
+        async for state in compiled_workflow().astream(
             self.input_state,
-            thread
+            config
         ):
             if self.websocket_manager and self.job_id:
                 await self._handle_ws_update(state)
@@ -120,5 +218,4 @@ class Graph:
         )
     
     def compile(self):
-        graph = self.workflow.compile()
-        return graph
\ No newline at end of file
+        return compiled_workflow()
\ No newline at end of file
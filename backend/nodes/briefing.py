@@ -2,18 +2,26 @@
 from typing import Dict, Any, Union, List
 import os
 from ibm_watsonx_ai import APIClient, Credentials
-from ibm_watsonx_ai.foundation_models import ModelInference
 import logging
 from ..classes import ResearchState
+from ..utils.rate_limiter import watsonx_rate_limiter
+from ..utils.fingerprint import fingerprint, documents_fingerprint
+from ..utils.prompt_packing import pack_documents, passage_limit, token_budget
+from ..utils.passage_filter import PassageIndex, category_query
+from ..services.llm_cache import llm_cache
+from ..services.client_pool import client_pool
 import asyncio
 
 logger = logging.getLogger(__name__)
 
 class Briefing:
     """Creates briefings for each research category and updates the ResearchState."""
+
+    # Bump when the briefing prompts change so cached briefings are not reused
+    PROMPT_VERSION = "3"
     
     def __init__(self, watsonx_client: APIClient, watsonx_project_id: str) -> None:
-        self.max_doc_length = 6000  # Maximum document content length
+        self.max_doc_tokens = 2000  # Largest share of the prompt budget one document may take
         # self.gemini_key = os.getenv("GEMINI_API_KEY")
         # if not self.gemini_key:
         #     raise ValueError("GEMINI_API_KEY environment variable is not set")
@@ -33,11 +41,13 @@ class Briefing:
             "temperature": 0.7
         }
         
-        self.watsonx_model = ModelInference(
-            model_id="ibm/granite-3-2-8b-instruct",
+        self.model_id = "ibm/granite-3-2-8b-instruct"
+        self.watsonx_params = watsonx_params
+        self.watsonx_model = client_pool.get_model(
+            model_id=self.model_id,
             api_client=self.watsonx_client,
             project_id=watsonx_project_id,
-            params = watsonx_params
+            params=watsonx_params
         )
 
     async def generate_category_briefing(
@@ -174,19 +184,31 @@ Key requirements:
             reverse=True
         )
         
-        doc_texts = []
-        total_length = 0
-        for _ , doc in sorted_items:
-            title = doc.get('title', '')
-            content = doc.get('raw_content') or doc.get('content', '')
-            if len(content) > self.max_doc_length:
-                content = content[:self.max_doc_length] + "... [content truncated]"
-            doc_entry = f"Title: {title}\n\nContent: {content}"
-            if total_length + len(doc_entry) < 120000:  # Keep under limit
-                doc_texts.append(doc_entry)
-                total_length += len(doc_entry)
-            else:
-                break
+        # Documents are cleaned and split into passages ranked by BM25 against the
+        # category. The index holds this category's documents only, so the prompt
+        # depends on nothing but them and stays cacheable across jobs.
+        passage_index = await asyncio.to_thread(PassageIndex.from_documents, [
+            (url, doc.get('raw_content') or doc.get('content', '')) for url, doc in sorted_items
+        ])
+        packed_docs = [
+            (
+                doc.get('title', ''),
+                passage_index.passages_for(url),
+                float(doc.get('evaluation', {}).get('overall_score', '0'))
+            )
+            for url, doc in sorted_items
+        ]
+        scorer = passage_index.scorer(category_query(category, company, industry))
+        doc_texts, packing = pack_documents(
+            packed_docs,
+            budget_tokens=token_budget(category),
+            max_doc_tokens=self.max_doc_tokens,
+            scorer=scorer,
+            max_passages=passage_limit()
+        )
+        logger.info(f"Packed {packing['passages']}/{packing['passages_total']} passages from "
+                    f"{packing['documents']} documents into {packing['tokens']}/{packing['budget']} tokens "
+                    f"for {category} briefing ({packing['duplicates']} duplicate passages dropped)")
         
         separator = "\n" + "-" * 40 + "\n"
         prompt = f"""{prompts.get(category, 'Create a focused, informative and insightful research briefing on the company: {company} in the {industry} industry based on the provided documents.')}
@@ -198,13 +220,17 @@ Analyze the following documents and extract key information. Provide only the br
 """
         
         try:
-            logger.info("Sending prompt to LLM")
-            #response = self.gemini_model.generate_content(prompt)
-            response = self.watsonx_model.generate_text(prompt)
-            content = response.strip()
-            if not content:
-                logger.error(f"Empty response from LLM for {category} briefing")
-                return {'content': ''}
+            cache_key = llm_cache.make_key("briefing", self.model_id, self.watsonx_params, self.PROMPT_VERSION, prompt)
+            if content := await llm_cache.get("briefing", cache_key):
+                logger.info(f"Using cached {category} briefing")
+            else:
+                logger.info("Sending prompt to LLM")
+                #response = self.gemini_model.generate_content(prompt)
+                content = (await self._stream_briefing(prompt, category, context)).strip()
+                if not content:
+                    logger.error(f"Empty response from LLM for {category} briefing")
+                    return {'content': ''}
+                await llm_cache.set(cache_key, content)
 
             # Send completion status
             if websocket_manager := context.get('websocket_manager'):
@@ -224,6 +250,44 @@ Analyze the following documents and extract key information. Provide only the br
             logger.error(f"Error generating {category} briefing: {e}")
             return {'content': ''}
 
+    async def _stream_briefing(self, prompt: str, category: str, context: Dict[str, Any]) -> str:
+        """Generate a briefing on the async streaming endpoint, forwarding text to clients line by line."""
+        websocket_manager = context.get('websocket_manager')
+        job_id = context.get('job_id')
+
+        async def send_chunk(chunk: str) -> None:
+            if websocket_manager and job_id:
+                await websocket_manager.send_status_update(
+                    job_id=job_id,
+                    status="briefing_chunk",
+                    message=f"Generating {category} briefing",
+                    result={
+                        "step": "Briefing",
+                        "category": category,
+                        "chunk": chunk
+                    }
+                )
+
+        await watsonx_rate_limiter.acquire()
+        response = await self.watsonx_model.agenerate_stream(prompt=prompt)
+
+        accumulated_text = ""
+        buffer = ""
+        async for chunk in response:
+            if not chunk:
+                continue
+            accumulated_text += chunk
+            buffer += chunk
+            # Send whole lines so clients render complete bullets
+            if '\n' in buffer:
+                complete, buffer = buffer.rsplit('\n', 1)
+                await send_chunk(complete + '\n')
+
+        if buffer:
+            await send_chunk(buffer)
+
+        return accumulated_text
+
     async def create_briefings(self, state: ResearchState) -> ResearchState:
         """Create briefings for all categories in parallel."""
         company = state.get('company', 'Unknown Company')
@@ -257,6 +321,8 @@ Analyze the following documents and extract key information. Provide only the br
         }
         
         briefings = {}
+        fingerprints = {}
+        previous_briefings = state.get('previous_briefings') or {}
 
         # Create tasks for parallel processing
         briefing_tasks = []
@@ -265,6 +331,29 @@ Analyze the following documents and extract key information. Provide only the br
             curated_data = state.get(curated_key, {})
             
             if curated_data:
+                # Briefings from an earlier run are reused when their inputs are unchanged
+                fingerprints[cat] = fingerprint(
+                    cat, company, context['industry'], context['hq_location'], self.PROMPT_VERSION,
+                    token_budget(cat), passage_limit(), documents_fingerprint(curated_data)
+                )
+                previous = previous_briefings.get(cat) or {}
+                if previous.get('content') and previous.get('fingerprint') == fingerprints[cat]:
+                    logger.info(f"Reusing {cat} briefing from an earlier run; inputs unchanged")
+                    briefings[cat] = previous['content']
+                    state[briefing_key] = previous['content']
+                    if websocket_manager and job_id:
+                        await websocket_manager.send_status_update(
+                            job_id=job_id,
+                            status="briefing_complete",
+                            message=f"Reused {cat} briefing",
+                            result={
+                                "step": "Briefing",
+                                "category": cat,
+                                "reused": True
+                            }
+                        )
+                    continue
+
                 logger.info(f"Processing {data_field} with {len(curated_data)} documents")
                 
                 # Create task for this category
@@ -318,6 +407,7 @@ Analyze the following documents and extract key information. Provide only the br
             logger.info(f"Generated {successful_briefings}/{len(briefing_tasks)} briefings with total length {total_length}")
 
         state['briefings'] = briefings
+        state['briefing_fingerprints'] = fingerprints
         return state
 
     async def run(self, state: ResearchState) -> ResearchState:
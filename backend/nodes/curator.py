@@ -1,89 +1,151 @@
 from langchain_core.messages import AIMessage
-from typing import Dict
+from array import array
+from typing import Dict, List, Any, Tuple
 from ..classes import ResearchState
-from urllib.parse import urlparse, urljoin
+from urllib.parse import urlparse
+import asyncio
 import logging
+import os
 from ..utils.references import process_references_from_search_results
+from ..utils.near_duplicates import MinHasher
+from ..utils.relevance import RelevanceScorer
 
 logger = logging.getLogger(__name__)
 
 class Curator:
+    # Document categories: state field -> (label, doc type)
+    DATA_TYPES = {
+        'financial_data': ('💰 Financial', 'financial'),
+        'news_data': ('📰 News', 'news'),
+        'industry_data': ('🏭 Industry', 'industry'),
+        'company_data': ('🏢 Company', 'company')
+    }
+
     def __init__(self) -> None:
-        self.relevance_threshold = 0.4  # Fixed initialization of class attribute
-        logger.info("Curator initialized with relevance threshold: {relevance_threshhold}")
+        self.relevance_threshold = float(os.getenv("CURATION_THRESHOLD", "0.4"))
+        self.max_docs = int(os.getenv("CURATION_TOP_K", "30"))
+        # Per-category overrides, e.g. CURATION_THRESHOLD_NEWS=0.3 or CURATION_TOP_K_FINANCIAL=20
+        self.thresholds = {
+            doc_type: float(os.getenv(f"CURATION_THRESHOLD_{doc_type.upper()}", str(self.relevance_threshold)))
+            for _, doc_type in self.DATA_TYPES.values()
+        }
+        self.top_k = {
+            doc_type: int(os.getenv(f"CURATION_TOP_K_{doc_type.upper()}", str(self.max_docs)))
+            for _, doc_type in self.DATA_TYPES.values()
+        }
+        self.scorer = RelevanceScorer.from_env()
+        self.deduplicator = MinHasher(threshold=float(os.getenv("CURATION_DUPLICATE_THRESHOLD", "0.7")))
+        logger.info(f"Curator initialized with relevance thresholds {self.thresholds} and top-k {self.top_k}")
 
-    async def evaluate_documents(self, state: ResearchState, docs: list, context: Dict[str, str]) -> list:
-        """Evaluate documents based on Tavily's scoring."""
-        if websocket_manager := state.get('websocket_manager'):
-            if job_id := state.get('job_id'):
-                logger.info(f"Sending initial curation status update for job {job_id}")
-                await websocket_manager.send_status_update(
-                    job_id=job_id,
-                    status="processing",
-                    message=f"Evaluating documents",
-                    result={
-                        "step": "Curation",
-                    }
-                )
-        
-        if not docs:
-            return []
+    def select_documents(self, entries: List[Tuple[str, str, Dict[str, Any]]], scores: array,
+                         signals: Dict[str, array] = None) -> Dict[str, List[Dict[str, Any]]]:
+        """Apply each category's threshold in one pass and return the evaluated documents per field, best first."""
+        thresholds = {data_field: self.thresholds[doc_type] for data_field, (_, doc_type) in self.DATA_TYPES.items()}
+        passed: Dict[str, List[int]] = {data_field: [] for data_field in self.DATA_TYPES}
+        for i, (data_field, _, _) in enumerate(entries):
+            if scores[i] >= thresholds[data_field]:
+                passed[data_field].append(i)
 
-        logger.info(f"Evaluating {len(docs)} documents")
-        
-        evaluated_docs = []
-        try:
-            # Evaluate each document using Tavily's score
-            for doc in docs:
-                try:
-                    # Ensure score is a valid float
-                    tavily_score = float(doc.get('score', 0))  # Default to 0 if no score
-                    
-                    # Keep documents with good Tavily score
-                    if tavily_score >= self.relevance_threshold:
-                        logger.info(f"Document passed threshold with score {tavily_score:.4f} for '{doc.get('title', 'No title')}'")
-                        
-                        evaluated_doc = {
-                            **doc,
-                            "evaluation": {
-                                "overall_score": tavily_score,  # Store as float
-                                "query": doc.get('query', '')
-                            }
+        evaluated = {}
+        for data_field, indices in passed.items():
+            # Ties keep search order so selection is deterministic
+            indices.sort(key=lambda i: (-scores[i], i))
+            evaluated[data_field] = [
+                {
+                    **entries[i][2],
+                    "url": entries[i][1],
+                    "evaluation": {
+                        "overall_score": scores[i],  # Store as float
+                        "query": entries[i][2].get('query', ''),
+                        "signals": {
+                            name: round(values[i], 3) for name, values in (signals or {}).items()
+                            if self.scorer.applies(name, entries[i][2].get('doc_type'))
                         }
-                        evaluated_docs.append(evaluated_doc)
-                        
-                        # Send incremental update for kept document
-                        if websocket_manager := state.get('websocket_manager'):
-                            if job_id := state.get('job_id'):
-                                await websocket_manager.send_status_update(
-                                    job_id=job_id,
-                                    status="document_kept",
-                                    message=f"Kept document: {doc.get('title', 'No title')}",
-                                    result={
-                                        "step": "Curation",
-                                        "doc_type": doc.get('doc_type', 'unknown'),
-                                        "title": doc.get('title', 'No title'),
-                                        "score": tavily_score
-                                    }
-                                )
-                    else:
-                        logger.info(f"Document below threshold with score {tavily_score:.4f} for '{doc.get('title', 'No title')}'")
-                except (ValueError, TypeError) as e:
-                    logger.warning(f"Error processing score for document: {e}")
-                    continue
-                    
-        except Exception as e:
-            logger.error(f"Error during document evaluation: {e}")
-            return []
-
-        # Sort evaluated docs by score before returning
-        evaluated_docs.sort(key=lambda x: float(x['evaluation']['overall_score']), reverse=True)
-        logger.info(f"Returning {len(evaluated_docs)} evaluated documents")
-        
-        return evaluated_docs
+                    }
+                }
+                for i in indices
+            ]
+        logger.info(f"{sum(len(docs) for docs in evaluated.values())}/{len(entries)} documents passed relevance thresholds")
+        return evaluated
+
+    def collapse_duplicates(self, evaluated: Dict[str, list]) -> List[List[Tuple[str, Dict[str, Any]]]]:
+        """Find near-duplicate documents across all categories and drop them within each.
+
+        Within a category only the best-scored copy of a story is kept, with
+        the URLs of the others recorded in its `aliases`. Copies in other
+        categories are left in place (each category writes its own briefing)
+        and linked up by `mark_cross_category_duplicates` once curation has
+        settled which documents survive. `evaluated` is changed in place.
+        Returns each cluster's kept copies as (data_field, doc), best first.
+        """
+        texts = {
+            (data_field, i): doc.get('raw_content') or doc.get('content') or doc.get('title', '')
+            for data_field, docs in evaluated.items()
+            for i, doc in enumerate(docs)
+        }
+        clusters = []
+        dropped = set()
+        for members in self.deduplicator.clusters(texts):
+            docs = sorted(
+                ((key, evaluated[key[0]][key[1]]) for key in members),
+                key=lambda item: (-float(item[1]['evaluation']['overall_score']), len(item[1].get('url', '')))
+            )
+            kept_by_category = {}
+            for key, doc in docs:
+                if key[0] in kept_by_category:
+                    kept = kept_by_category[key[0]]
+                    kept.setdefault('aliases', [])
+                    if doc.get('url') and doc['url'] != kept.get('url') and doc['url'] not in kept['aliases']:
+                        kept['aliases'].append(doc['url'])
+                    dropped.add(key)
+                else:
+                    kept_by_category[key[0]] = doc
+            clusters.append(list(kept_by_category.items()))
+
+        for data_field, docs in evaluated.items():
+            evaluated[data_field] = [doc for i, doc in enumerate(docs) if (data_field, i) not in dropped]
+
+        if clusters:
+            logger.info(f"Found {len(clusters)} near-duplicate clusters; dropped {len(dropped)} same-category copies")
+        return clusters
+
+    def mark_cross_category_duplicates(self, state: ResearchState, clusters: List[List[Tuple[str, Dict[str, Any]]]],
+                                       data_fields: List[str]) -> List[Dict[str, Any]]:
+        """Point every surviving copy of a story at its best-scored surviving copy via `duplicate_of`.
+
+        Returns the clusters as they stand after the top-k cut: the URL kept
+        for each story, the other URLs folded into it and the categories it
+        is in. Stories with nothing left to report are omitted.
+        """
+        curated_keys = {
+            id(doc): url
+            for data_field in data_fields
+            for url, doc in (state.get(f'curated_{data_field}') or {}).items()
+        }
+        report = []
+        for cluster in clusters:
+            surviving = [(data_field, doc) for data_field, doc in cluster if id(doc) in curated_keys]
+            if not surviving:
+                continue
+            canonical = surviving[0][1]
+            kept_url = curated_keys[id(canonical)]
+            aliases = set()
+            for _, doc in surviving:
+                aliases.update(doc.get('aliases') or [])
+                if doc is not canonical:
+                    doc['duplicate_of'] = kept_url
+                    aliases.add(curated_keys[id(doc)])
+            aliases.discard(kept_url)
+            if aliases:
+                report.append({
+                    "kept": kept_url,
+                    "aliases": sorted(aliases),
+                    "categories": sorted({data_field for data_field, _ in surviving})
+                })
+        return report
 
     async def curate_data(self, state: ResearchState) -> ResearchState:
-        """Curate all collected data based on Tavily scores."""
+        """Curate all collected data based on combined relevance signals."""
         company = state.get('company', 'Unknown Company')
         logger.info(f"Starting curation for company: {company}")
         
@@ -106,84 +168,66 @@ class Curator:
                     }
                 )
 
-        industry = state.get('industry', 'Unknown')
-        context = {
-            "company": company,
-            "industry": industry,
-            "hq_location": state.get('hq_location', 'Unknown')
-        }
-
         msg = [f"🔍 Curating research data for {company}"]
-        
-        data_types = {
-            'financial_data': ('💰 Financial', 'financial'),
-            'news_data': ('📰 News', 'news'),
-            'industry_data': ('🏭 Industry', 'industry'),
-            'company_data': ('🏢 Company', 'company')
-        }
+        websocket_manager = state.get('websocket_manager')
+        job_id = state.get('job_id')
 
-        # Create all evaluation tasks upfront
-        curation_tasks = []
-        for data_field, (emoji, doc_type) in data_types.items():
+        # Normalize URLs and flatten every category into one list of entries
+        entries = []
+        initial_counts = {}
+        for data_field, (emoji, doc_type) in self.DATA_TYPES.items():
             data = state.get(data_field, {})
             if not data:
                 continue
 
-            # Filter and normalize URLs
-            unique_docs = {}
+            unique_urls = set()
             for url, doc in data.items():
                 try:
-                    parsed = urlparse(url)
-                    if not parsed.scheme:
-                        url = urljoin('https://', url)
+                    parsed = urlparse(url if urlparse(url).scheme else f"https://{url}")
                     clean_url = parsed._replace(query='', fragment='').geturl()
-                    if clean_url not in unique_docs:
-                        doc['url'] = clean_url
-                        doc['doc_type'] = doc_type
-                        unique_docs[clean_url] = doc
                 except Exception as e:
                     continue
+                if clean_url not in unique_urls:
+                    unique_urls.add(clean_url)
+                    doc['url'] = clean_url
+                    doc['doc_type'] = doc_type
+                    entries.append((data_field, clean_url, doc))
 
-            docs = list(unique_docs.values())
-            curation_tasks.append((data_field, emoji, doc_type, unique_docs.keys(), docs))
-
-        # Track document counts for each type
-        doc_counts = {}
-
-        for data_field, emoji, doc_type, urls, docs in curation_tasks:
-            msg.append(f"\n{emoji}: Found {len(docs)} documents")
-
-            if websocket_manager := state.get('websocket_manager'):
-                if job_id := state.get('job_id'):
-                    await websocket_manager.send_status_update(
-                        job_id=job_id,
-                        status="category_start",
-                        message=f"Processing {doc_type} documents",
-                        result={
-                            "step": "Curation",
-                            "doc_type": doc_type,
-                            "initial_count": len(docs)
-                        }
-                    )
+            initial_counts[data_field] = len(unique_urls)
+            msg.append(f"\n{emoji}: Found {len(unique_urls)} documents")
 
-            evaluated_docs = await self.evaluate_documents(state, docs, context)
+        if websocket_manager and job_id:
+            await asyncio.gather(*[
+                websocket_manager.send_status_update(
+                    job_id=job_id,
+                    status="category_start",
+                    message=f"Processing {self.DATA_TYPES[data_field][1]} documents",
+                    result={
+                        "step": "Curation",
+                        "doc_type": self.DATA_TYPES[data_field][1],
+                        "initial_count": count
+                    }
+                )
+                for data_field, count in initial_counts.items()
+            ])
 
-            if not evaluated_docs:
-                msg.append(f"  ⚠️ No relevant documents found")
-                doc_counts[data_field] = {"initial": len(docs), "kept": 0}
-                continue
+        # Score, threshold and de-duplicate all categories in one pass
+        logger.info(f"Evaluating {len(entries)} documents")
+        scores, signals = self.scorer.score(entries, {
+            "company": company,
+            "company_url": state.get('company_url')
+        })
+        evaluated = self.select_documents(entries, scores, signals)
+        duplicate_clusters = await asyncio.to_thread(self.collapse_duplicates, evaluated)
 
-            # Filter and sort by Tavily score
-            relevant_docs = {url: doc for url, doc in zip(urls, evaluated_docs)}
-            sorted_items = sorted(relevant_docs.items(), key=lambda item: item[1]['evaluation']['overall_score'], reverse=True)
-            
-            # Limit to top 30 documents per category
-            if len(sorted_items) > 30:
-                sorted_items = sorted_items[:30]
-            relevant_docs = dict(sorted_items)
+        # Track document counts for each type
+        doc_counts = {}
+        for data_field, initial in initial_counts.items():
+            emoji, doc_type = self.DATA_TYPES[data_field]
+            relevant_docs = {doc['url']: doc for doc in evaluated[data_field][:self.top_k[doc_type]]}
 
             doc_counts[data_field] = {
-                "initial": len(docs),
+                "initial": initial,
                 "kept": len(relevant_docs)
             }
 
@@ -196,7 +240,29 @@ class Curator:
 
             # Store curated documents in state
             state[f'curated_{data_field}'] = relevant_docs
-            
+
+        duplicate_clusters = self.mark_cross_category_duplicates(state, duplicate_clusters, list(initial_counts))
+        if duplicate_clusters:
+            msg.append(f"\n🔁 Found {len(duplicate_clusters)} near-duplicate document clusters")
+
+        # Send kept documents for all categories concurrently
+        if websocket_manager and job_id:
+            await asyncio.gather(*[
+                websocket_manager.send_status_update(
+                    job_id=job_id,
+                    status="document_kept",
+                    message=f"Kept document: {doc.get('title', 'No title')}",
+                    result={
+                        "step": "Curation",
+                        "doc_type": doc.get('doc_type', 'unknown'),
+                        "title": doc.get('title', 'No title'),
+                        "score": doc['evaluation']['overall_score']
+                    }
+                )
+                for data_field in initial_counts
+                for doc in state[f'curated_{data_field}'].values()
+            ])
+
         # Process references using the references module
         top_reference_urls, reference_titles, reference_info = process_references_from_search_results(state)
         logger.info(f"Selected top {len(top_reference_urls)} references for the report")
@@ -223,7 +289,8 @@ class Curator:
                             "industry": doc_counts.get('industry_data', {"initial": 0, "kept": 0}),
                             "financial": doc_counts.get('financial_data', {"initial": 0, "kept": 0}),
                             "news": doc_counts.get('news_data', {"initial": 0, "kept": 0})
-                        }
+                        },
+                        "duplicate_clusters": duplicate_clusters
                     }
                 )
 
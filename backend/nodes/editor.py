@@ -4,15 +4,22 @@ from typing import Dict, Any
 import os
 import logging
 from ibm_watsonx_ai import APIClient, Credentials
-from ibm_watsonx_ai.foundation_models import ModelInference
 
 logger = logging.getLogger(__name__)
 
 from ..classes import ResearchState
 from ..utils.references import format_references_section
+from ..utils.report_format import assemble_report, normalize_report, validate_report
+from ..utils.rate_limiter import watsonx_rate_limiter
+from ..utils.event_trace import event_tracer
+from ..services.client_pool import client_pool
+from ..services.llm_cache import llm_cache
 
 class Editor:
     """Compiles individual section briefings into a cohesive final report."""
+
+    # Bump when the compile or sweep prompts change so cached reports are not reused
+    PROMPT_VERSION = "1"
     
     def __init__(self, watsonx_client: APIClient, watsonx_project_id: str) -> None:
         # self.openai_key = os.getenv("OPENAI_API_KEY")
@@ -34,13 +41,24 @@ class Editor:
             "temperature": 0
         }
         
-        self.watsonx_model = ModelInference(
-            model_id="ibm/granite-3-2-8b-instruct",  # Choose appropriate model
+        self.model_id = "ibm/granite-3-2-8b-instruct"  # Choose appropriate model
+        self.watsonx_params = watsonx_params
+        self.watsonx_model = client_pool.get_model(
+            model_id=self.model_id,
             api_client=self.watsonx_client,
             project_id=watsonx_project_id,
-            params = watsonx_params
+            params=watsonx_params
         )
         
+        # "llm" compiles briefings with the LLM, "fast" assembles them deterministically
+        self.compile_mode = os.getenv("EDITOR_COMPILE_MODE", "llm").lower()
+
+        # How content_sweep formats the compiled report:
+        #   "llm"       - one streamed LLM pass
+        #   "auto"      - deterministic normalizer when the compiled report already validates, else LLM
+        #   "normalize" - always use the deterministic normalizer
+        self.sweep_mode = os.getenv("EDITOR_SWEEP_MODE", "llm").lower()
+
         # Initialize context dictionary for use across methods
         self.context = {
             "company": "Unknown Company",
@@ -182,8 +200,7 @@ class Editor:
                 logger.error("Final report is empty!")
                 return ""
             
-            logger.info("Final report preview:")
-            logger.info(final_report[:500])
+            event_tracer.trace("report_preview", logger, job_id=state.get('job_id'), preview=final_report)
             
             # Update state with the final report in two locations
             state['report'] = final_report
@@ -226,8 +243,8 @@ class Editor:
             reference_info = state.get('reference_info', {})
             reference_titles = state.get('reference_titles', {})
             
-            logger.info(f"Reference info from state: {reference_info}")
-            logger.info(f"Reference titles from state: {reference_titles}")
+            event_tracer.trace("references_loaded", logger, job_id=state.get('job_id'),
+                               reference_info=reference_info, reference_titles=reference_titles)
             
             # Use the references module to format the references section
             reference_text = format_references_section(references, reference_info, reference_titles)
@@ -237,6 +254,10 @@ class Editor:
         company = self.context["company"]
         industry = self.context["industry"]
         hq_location = self.context["hq_location"]
+
+        if self.compile_mode == "fast":
+            logger.info("Assembling report deterministically from briefings")
+            return assemble_report(company, briefings, reference_text)
         
         prompt = f"""You are compiling a comprehensive research report about {company}.
 
@@ -268,8 +289,14 @@ Strictly enforce this EXACT document structure:
 
 Return the report in clean markdown format. No explanations or commentary."""
         
+        cache_key = llm_cache.make_key("editor_compile", self.model_id, self.watsonx_params, self.PROMPT_VERSION, prompt)
+        if cached := await llm_cache.get("editor_compile", cache_key):
+            logger.info("Using cached compiled report")
+            return f"{cached}\n\n{reference_text}" if reference_text else cached
+
         try:
             # Replace OpenAI with WatsonX call
+            await watsonx_rate_limiter.acquire()
             response = await self.watsonx_model.achat(
                 messages=[
                     {
@@ -283,6 +310,7 @@ Return the report in clean markdown format. No explanations or commentary."""
                 ]
             )
             initial_report = response['choices'][0]['message']['content'].strip()
+            await llm_cache.set(cache_key, initial_report)
             
             # Append the references section after LLM processing
             if reference_text:
@@ -299,6 +327,25 @@ Return the report in clean markdown format. No explanations or commentary."""
         company = self.context["company"]
         industry = self.context["industry"]
         hq_location = self.context["hq_location"]
+
+        if self.sweep_mode in ("auto", "normalize"):
+            problems = validate_report(content, company)
+            if self.sweep_mode == "normalize" or not problems:
+                logger.info("Formatting report with the deterministic normalizer")
+                final_report = normalize_report(content, company)
+                if websocket_manager := state.get('websocket_manager'):
+                    if job_id := state.get('job_id'):
+                        await websocket_manager.send_status_update(
+                            job_id=job_id,
+                            status="report_chunk",
+                            message="Formatting final report",
+                            result={
+                                "chunk": final_report,
+                                "step": "Editor"
+                            }
+                        )
+                return final_report.strip()
+            logger.info(f"Compiled report needs LLM formatting: {'; '.join(problems)}")
         
         prompt = f"""You are an expert briefing editor. You are given a report on {company}.
 
@@ -347,70 +394,31 @@ Critical rules:
 Return the polished report in flawless markdown format. No explanation.
 
 Return the cleaned report in flawless markdown format. No explanations or commentary."""
-        
+
+        cache_key = llm_cache.make_key("editor_sweep", self.model_id, self.watsonx_params, self.PROMPT_VERSION, prompt)
+        if cached := await llm_cache.get("editor_sweep", cache_key):
+            logger.info("Using cached final report")
+            if websocket_manager := state.get('websocket_manager'):
+                if job_id := state.get('job_id'):
+                    await websocket_manager.send_status_update(
+                        job_id=job_id,
+                        status="report_chunk",
+                        message="Formatting final report",
+                        result={
+                            "chunk": cached,
+                            "step": "Editor"
+                        }
+                    )
+            return cached
+
         try:
-            # First call - focusing on removing redundancy
+            # Single streamed pass that both removes redundancy and enforces formatting
+            await watsonx_rate_limiter.acquire()
             response = await self.watsonx_model.achat_stream(
                 messages=[
                     {
                         "role": "system",
-                        "content": "You are an expert report editor that removes redundancy and improves clarity."
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ]
-            )
-            
-            # accumulated_text = ""
-            # buffer = ""
-            
-            # async for chunk in response:
-            #     # Check for completion
-            #     if chunk.get('choices', [{}])[0].get('finish_reason') == "stop":
-            #         websocket_manager = state.get('websocket_manager')
-            #         if websocket_manager and buffer:
-            #             job_id = state.get('job_id')
-            #             if job_id:
-            #                 await websocket_manager.send_status_update(
-            #                     job_id=job_id,
-            #                     status="report_chunk",
-            #                     message="Cleaning up report content",
-            #                     result={
-            #                         "chunk": buffer,
-            #                         "step": "Editor"
-            #                     }
-            #                 )
-            #         break
-                
-            #     # Extract content from the chunk
-            #     chunk_text = chunk.get('choices', [{}])[0].get('delta', {}).get('content', '')
-                
-            #     if chunk_text:
-            #         accumulated_text += chunk_text
-            #         buffer += chunk_text
-                    
-            #         if any(char in buffer for char in ['.', '!', '?', '\n']) and len(buffer) > 10:
-            #             if websocket_manager := state.get('websocket_manager'):
-            #                 if job_id := state.get('job_id'):
-            #                     await websocket_manager.send_status_update(
-            #                         job_id=job_id,
-            #                         status="report_chunk",
-            #                         message="Cleaning up report content",
-            #                         result={
-            #                             "chunk": buffer,
-            #                             "step": "Editor"
-            #                         }
-            #                     )
-            #             buffer = ""
-            
-            # Second call - ensuring consistent formatting
-            response = await self.watsonx_model.achat_stream(
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are an expert markdown formatter that ensures consistent document structure."
+                        "content": "You are an expert report editor that removes redundancy and ensures consistent markdown document structure."
                     },
                     {
                         "role": "user",
@@ -461,7 +469,9 @@ Return the cleaned report in flawless markdown format. No explanations or commen
                                 )
                         buffer = ""
             
-            return (accumulated_text or "").strip()
+            final_report = (accumulated_text or "").strip()
+            await llm_cache.set(cache_key, final_report)
+            return final_report
         except Exception as e:
             logger.error(f"Error in formatting: {e}")
             return (content or "").strip()
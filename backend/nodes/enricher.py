@@ -2,7 +2,12 @@ from langchain_core.messages import AIMessage
 from typing import Dict, List
 from tavily import AsyncTavilyClient
 import asyncio
+import logging
 from ..classes import ResearchState
+from ..services.page_store import page_store
+from ..utils.references import normalize_url
+
+logger = logging.getLogger(__name__)
 
 class Enricher:
     """Enriches curated documents with raw content."""
@@ -10,6 +15,7 @@ class Enricher:
     def __init__(self, tavily_client: AsyncTavilyClient) -> None:
         self.tavily_client = tavily_client
         self.batch_size = 20
+        self.page_store = page_store
 
     async def fetch_single_content(self, url: str, websocket_manager=None, job_id=None, category=None) -> Dict[str, str]:
         """Fetch raw content for a single URL."""
@@ -42,7 +48,7 @@ class Enricher:
                     )
                 return {url: result['results'][0].get('raw_content', '')}
         except Exception as e:
-            print(f"Error fetching raw content for {url}: {e}")
+            logger.error(f"Error fetching raw content for {url}: {e}")
             error_msg = str(e)
             if websocket_manager and job_id:
                 await websocket_manager.send_status_update(
@@ -57,11 +63,11 @@ class Enricher:
                         "error": error_msg
                     }
                 )
-            return {url: '', "error": error_msg}
+            return {url: {"error": error_msg}}
         return {url: ''}
 
     async def fetch_raw_content(self, urls: List[str], websocket_manager=None, job_id=None, category=None) -> Dict[str, str]:
-        """Fetch raw content for multiple URLs in parallel."""
+        """Fetch raw content for multiple URLs using batched extract requests."""
         raw_contents = {}
         total_batches = (len(urls) + self.batch_size - 1) // self.batch_size
 
@@ -86,15 +92,51 @@ class Enricher:
                         }
                     )
 
-                # Process URLs in batch concurrently
-                tasks = [self.fetch_single_content(url, websocket_manager, job_id, category) for url in batch_urls]
-                results = await asyncio.gather(*tasks)
-                
-                # Combine results from batch
+                # One extract request for the whole batch
                 batch_contents = {}
-                for result in results:
-                    batch_contents.update(result)
-                
+                try:
+                    result = await self.tavily_client.extract(batch_urls)
+                    batch_contents = self._match_extract_results(batch_urls, result)
+                except Exception as e:
+                    logger.error(f"Batch extract failed for {len(batch_urls)} URLs: {e}")
+
+                # Retry URLs the batch could not extract one at a time
+                failed_urls = [url for url in batch_urls if not batch_contents.get(url)]
+                if failed_urls:
+                    retries = await asyncio.gather(*[self.fetch_single_content(url) for url in failed_urls])
+                    for url, retry in zip(failed_urls, retries):
+                        batch_contents[url] = retry.get(url, '')
+
+                succeeded = [url for url in batch_urls if isinstance(batch_contents.get(url), str) and batch_contents[url]]
+                failed_count = len(batch_urls) - len(succeeded)
+
+                if websocket_manager and job_id and succeeded:
+                    await websocket_manager.send_status_update(
+                        job_id=job_id,
+                        status="extracted",
+                        message=f"Extracted content from {len(succeeded)}/{len(batch_urls)} URLs in batch {batch_num + 1}",
+                        result={
+                            "step": "Enriching",
+                            "batch": batch_num + 1,
+                            "category": category,
+                            "count": len(succeeded),
+                            "success": True
+                        }
+                    )
+                if websocket_manager and job_id and failed_count:
+                    await websocket_manager.send_status_update(
+                        job_id=job_id,
+                        status="extraction_error",
+                        message=f"Failed to extract content from {failed_count} URLs in batch {batch_num + 1}",
+                        result={
+                            "step": "Enriching",
+                            "batch": batch_num + 1,
+                            "category": category,
+                            "count": failed_count,
+                            "success": False
+                        }
+                    )
+
                 return batch_contents
 
         # Process all batches
@@ -109,6 +151,18 @@ class Enricher:
 
         return raw_contents
 
+    @staticmethod
+    def _match_extract_results(urls: List[str], response: Dict) -> Dict[str, str]:
+        """Map a batched extract response back onto the requested URLs."""
+        by_normalized = {normalize_url(url): url for url in urls}
+        contents = {}
+        for item in (response or {}).get('results', []):
+            returned_url = item.get('url', '')
+            url = returned_url if returned_url in urls else by_normalized.get(normalize_url(returned_url))
+            if url and item.get('raw_content'):
+                contents[url] = item['raw_content']
+        return contents
+
     async def enrich_data(self, state: ResearchState) -> ResearchState:
         """Enrich curated documents with raw content."""
         company = state.get('company', 'Unknown Company')
@@ -136,8 +190,20 @@ class Enricher:
             'company_data': ('🏢 Company', 'company')
         }
 
+        # Near-duplicates of a document in another category take its content
+        # instead of being extracted again
+        canonical_docs = {
+            url: doc
+            for data_field in data_types
+            for url, doc in (state.get(f'curated_{data_field}') or {}).items()
+            if not doc.get('duplicate_of')
+        }
+
         # Create tasks for parallel processing
         enrichment_tasks = []
+        duplicate_docs = []
+        store_hits = 0
+        bytes_saved = 0
         for data_field, (label, category) in data_types.items():
             curated_field = f'curated_{data_field}'
             curated_docs = state.get(curated_field, {})
@@ -147,12 +213,32 @@ class Enricher:
                 continue
 
             # Find documents needing enrichment
-            docs_needing_content = {url: doc for url, doc in curated_docs.items() 
-                                  if not doc.get('raw_content')}
+            docs_needing_content = {}
+            for url, doc in curated_docs.items():
+                if doc.get('raw_content'):
+                    continue
+                if doc.get('duplicate_of') in canonical_docs:
+                    duplicate_docs.append(doc)
+                else:
+                    docs_needing_content[url] = doc
             
             if not docs_needing_content:
                 msg.append(f"\n• All {label} documents already have raw content")
                 continue
+
+            # Reuse fresh content extracted by earlier jobs
+            stored_contents = await self.page_store.get_many(list(docs_needing_content.keys()))
+            for url, content in stored_contents.items():
+                curated_docs[url]['raw_content'] = content
+                docs_needing_content.pop(url)
+                store_hits += 1
+                bytes_saved += len(content.encode('utf-8'))
+            if stored_contents:
+                msg.append(f"\n• Reused stored content for {len(stored_contents)} {label} documents")
+                state[curated_field] = curated_docs
+
+            if not docs_needing_content:
+                continue
             
             msg.append(f"\n• Enriching {len(docs_needing_content)} {label} documents...")
 
@@ -178,7 +264,7 @@ class Enricher:
             })
 
         # Process all categories in parallel
-        if enrichment_tasks:
+        if enrichment_tasks or store_hits or duplicate_docs:
             async def process_category(task):
                 try:
                     raw_contents = await self.fetch_raw_content(
@@ -191,17 +277,24 @@ class Enricher:
                     enriched_count = 0
                     error_count = 0
                     
+                    fetched_contents = {}
                     for url, content_or_error in raw_contents.items():
+                        if url not in task['docs']:
+                            continue
                         if isinstance(content_or_error, dict) and content_or_error.get('error'):
                             # This is an error result - just skip it
                             error_count += 1
                         elif content_or_error:
                             # This is a successful content
                             task['curated_docs'][url]['raw_content'] = content_or_error
+                            fetched_contents[url] = content_or_error
                             enriched_count += 1
 
+                    await self.page_store.put_many(fetched_contents)
+
                     # Update state with enriched documents
-                    state[task['field']] = task['curated_docs']
+                    if task['field']:
+                        state[task['field']] = task['curated_docs']
                     
                     if websocket_manager and job_id:
                         await websocket_manager.send_status_update(
@@ -234,18 +327,47 @@ class Enricher:
 
             # Process all categories in parallel
             results = await asyncio.gather(*[process_category(task) for task in enrichment_tasks])
-            
+
+            duplicates_copied = 0
+            uncopied = {}
+            for doc in duplicate_docs:
+                if content := canonical_docs[doc['duplicate_of']].get('raw_content'):
+                    doc['raw_content'] = content
+                    duplicates_copied += 1
+                else:
+                    uncopied.setdefault(doc.get('doc_type'), {})[doc['url']] = doc
+            if duplicate_docs:
+                logger.info(f"Copied content to {duplicates_copied}/{len(duplicate_docs)} near-duplicate documents for job {job_id}")
+                msg.append(f"\n• Reused content for {duplicates_copied} near-duplicate documents")
+
+            # A duplicate whose canonical copy could not be extracted falls back to its own URL
+            if uncopied:
+                results += await asyncio.gather(*[
+                    process_category({
+                        'field': None,
+                        'category': category,
+                        'label': f"near-duplicate {category}",
+                        'docs': docs,
+                        'curated_docs': docs
+                    })
+                    for category, docs in uncopied.items()
+                ])
+
             # Calculate totals
-            total_enriched = sum(r['enriched'] for r in results)
-            total_documents = sum(r['total'] for r in results)
+            total_enriched = sum(r['enriched'] for r in results) + store_hits + duplicates_copied
+            total_documents = sum(r['total'] for r in results) + store_hits + duplicates_copied
             total_errors = sum(r.get('errors', 0) for r in results)
 
+            if store_hits:
+                logger.info(f"Page store avoided {store_hits} extractions ({bytes_saved} bytes) for job {job_id}")
+                msg.append(f"\n• Avoided {store_hits} extractions using stored content ({bytes_saved} bytes)")
+
             # Send final status update
             if websocket_manager and job_id:
                 status_message = f"Content enrichment complete. Successfully enriched {total_enriched}/{total_documents} documents"
                 if total_errors > 0:
                     status_message += f". Skipped {total_errors} documents."
-                
+
                 await websocket_manager.send_status_update(
                     job_id=job_id,
                     status="enrichment_complete",
@@ -254,7 +376,9 @@ class Enricher:
                         "step": "Enriching",
                         "total_enriched": total_enriched,
                         "total_documents": total_documents,
-                        "total_errors": total_errors
+                        "total_errors": total_errors,
+                        "extractions_avoided": store_hits + duplicates_copied,
+                        "bytes_saved": bytes_saved
                     }
                 )
 
@@ -129,10 +129,7 @@ class GroundingNode:
             "industry": state.get('industry'),
             # Initialize research fields
             "messages": [AIMessage(content=msg)],
-            "site_scrape": site_scrape,
-            # Pass through websocket info
-            "websocket_manager": state.get('websocket_manager'),
-            "job_id": state.get('job_id')
+            "site_scrape": site_scrape
         }
 
         # If there was an error in the initial extraction, store it in the state
@@ -3,15 +3,22 @@ from datetime import datetime
 #from openai import AsyncOpenAI
 from tavily import AsyncTavilyClient
 from ibm_watsonx_ai import APIClient, Credentials
-from ibm_watsonx_ai.foundation_models import ModelInference
 from ...classes import ResearchState
-from typing import Dict, Any, List
+from typing import Dict, Any, List, AsyncIterator, Optional, Tuple
 import logging
 from ...utils.references import clean_title
+from ...utils.rate_limiter import watsonx_rate_limiter
+from ...services.search_cache import search_cache
+from ...services.client_pool import client_pool
 import asyncio
+import time
+from contextlib import aclosing
 
 logger = logging.getLogger(__name__)
 
+# Upper bound on in-flight Tavily searches across all researchers in the process
+_search_semaphore = asyncio.Semaphore(int(os.getenv("TAVILY_MAX_CONCURRENT_SEARCHES", "8")))
+
 class BaseResearcher:
     def __init__(self, tavily_client: AsyncTavilyClient, watsonx_client: APIClient, watsonx_project_id: str):        
         self.watsonx_client = watsonx_client
@@ -24,11 +31,11 @@ class BaseResearcher:
             "temperature": 0.7
         }
         
-        self.watsonx_model = ModelInference(
+        self.watsonx_model = client_pool.get_model(
             model_id="ibm/granite-3-2-8b-instruct",
             api_client=self.watsonx_client,
             project_id=watsonx_project_id,
-            params = watsonx_params
+            params=watsonx_params
         )
 
 
@@ -40,6 +47,9 @@ class BaseResearcher:
         self.analyst_type = "base_researcher"  # Default type
 
         self._semaphore = asyncio.Semaphore(1)
+        self.max_queries = 4
+        self.search_cache = search_cache
+        self.query_metrics: Dict[str, Any] = {}
 
     @property
     def analyst_type(self) -> str:
@@ -79,7 +89,9 @@ class BaseResearcher:
 #                 max_tokens=4096,
 #                 stream=True
 #             )
+            started = time.monotonic()
             async with self._semaphore:
+                await watsonx_rate_limiter.acquire()
                 response = await self.watsonx_model.achat_stream(
                     messages=[
                     {
@@ -92,90 +104,74 @@ class BaseResearcher:
 {self._format_query_prompt(prompt, company, hq, current_year)}"""
                     }
                     ],
-                )   
+                )
 
-            
             queries = []
-            current_query = ""
-            current_query_number = 1
-
-            async for chunk in response:
-                await asyncio.sleep(1)
-                # Check for completion
-                if chunk.get('choices', [{}])[0].get('finish_reason') == "stop":
-                    break
-                
-                # Extract content from the chunk
-                content = chunk.get('choices', [{}])[0].get('delta', {}).get('content', '')
-                
-                if content:
-                    current_query += content
-                    
-                    # Stream the current state to the UI.
-                    if websocket_manager and job_id:
-                        await websocket_manager.send_status_update(
-                            job_id=job_id,
-                            status="query_generating",
-                            message="Generating research query",
-                            result={
-                                "query": current_query,
-                                "query_number": current_query_number,
-                                "category": self.analyst_type,
-                                "is_complete": False
-                            }
-                        )
-                    
-                    # If a newline is detected, treat it as a complete query.
-                    if '\n' in current_query:
-                        parts = current_query.split('\n')
-                        current_query = parts[-1]  # The last part is the start of the next query.
-                        
-                        for query in parts[:-1]:
-                            query = query.strip()
-                            query = query.replace('"', '')
-                            if query:
-                                queries.append(query)
-                                if websocket_manager and job_id:
-                                    await websocket_manager.send_status_update(
-                                        job_id=job_id,
-                                        status="query_generated",
-                                        message="Generated new research query",
-                                        result={
-                                            "query": query,
-                                            "query_number": len(queries),
-                                            "category": self.analyst_type,
-                                            "is_complete": True
-                                        }
-                                    )
-                                current_query_number += 1
-
-            # Add any remaining query (even if not newline terminated)
-            if current_query.strip():
-                query = current_query.strip()
-                query = query.replace('"', '')
-
-                queries.append(query)
-                if websocket_manager and job_id:
-                    await websocket_manager.send_status_update(
-                        job_id=job_id,
-                        status="query_generated",
-                        message="Generated final research query",
-                        result={
-                            "query": query,
-                            "query_number": len(queries),
-                            "category": self.analyst_type,
-                            "is_complete": True
-                        }
-                    )
-                current_query_number += 1
-            
+            self.query_metrics = {
+                "analyst": self.analyst_type,
+                "time_to_first_query": None,
+                "time_to_last_query": None
+            }
+
+            # Stopping early must still close the stream, or the HTTP response stays
+            # open until the generator is garbage-collected
+            try:
+                async with aclosing(self._stream_query_lines(response)) as lines:
+                    async for query, partial in lines:
+                        if partial is not None:
+                            # Stream the query being generated to the UI.
+                            if websocket_manager and job_id:
+                                await websocket_manager.send_status_update(
+                                    job_id=job_id,
+                                    status="query_generating",
+                                    message="Generating research query",
+                                    result={
+                                        "query": partial,
+                                        "query_number": len(queries) + 1,
+                                        "category": self.analyst_type,
+                                        "is_complete": False
+                                    }
+                                )
+                            continue
+
+                        queries.append(query)
+                        elapsed = round(time.monotonic() - started, 3)
+                        if self.query_metrics["time_to_first_query"] is None:
+                            self.query_metrics["time_to_first_query"] = elapsed
+                        self.query_metrics["time_to_last_query"] = elapsed
+
+                        if websocket_manager and job_id:
+                            await websocket_manager.send_status_update(
+                                job_id=job_id,
+                                status="query_generated",
+                                message="Generated new research query",
+                                result={
+                                    "query": query,
+                                    "query_number": len(queries),
+                                    "category": self.analyst_type,
+                                    "is_complete": True
+                                }
+                            )
+
+                        # Only the first queries are used, so stop reading the stream early.
+                        if len(queries) >= self.max_queries:
+                            break
+            finally:
+                if aclose := getattr(response, "aclose", None):
+                    await aclose()
+
             logger.info(f"Generated {len(queries)} queries for {self.analyst_type}: {queries}")
+            logger.info(
+                f"Query timings for {self.analyst_type}: "
+                f"first={self.query_metrics['time_to_first_query']}s, "
+                f"last={self.query_metrics['time_to_last_query']}s"
+            )
 
             if not queries:
                 raise ValueError(f"No queries generated for {company}")
 
             # Limit to at most 4 queries.
-            queries = queries[:4]
+            queries = queries[:self.max_queries]
             logger.info(f"Final queries for {self.analyst_type}: {queries}")
             
             return queries
@@ -191,10 +187,41 @@ class BaseResearcher:
                 )
             return []
 
-    # Add a delay between API calls
+    async def _stream_query_lines(self, response) -> AsyncIterator[Tuple[Optional[str], Optional[str]]]:
+        """Consume a chat stream, yielding (query, None) for each completed line
+        and (None, partial_text) whenever the line in progress grows."""
+        current_query = ""
+
+        async for chunk in response:
+            choice = (chunk.get('choices') or [{}])[0]
+            content = choice.get('delta', {}).get('content', '')
+
+            if content:
+                current_query += content
+
+                # Every newline terminates a query; the remainder starts the next one.
+                *complete, current_query = current_query.split('\n')
+                for line in complete:
+                    if query := self._clean_query(line):
+                        yield query, None
+                if current_query.strip():
+                    yield None, current_query
+
+            if choice.get('finish_reason') == "stop":
+                break
+
+        # Add any remaining query (even if not newline terminated)
+        if query := self._clean_query(current_query):
+            yield query, None
+
+    @staticmethod
+    def _clean_query(line: str) -> str:
+        return line.strip().replace('"', '')
+
+    # Throttle against the shared provider budget instead of sleeping
     async def make_request_with_throttle(self, messages):
-        await self.watsonx_model.achat_stream(messages=messages)
-        await asyncio.sleep(1)
+        await watsonx_rate_limiter.acquire()
+        return await self.watsonx_model.achat_stream(messages=messages)
 
     def _format_query_prompt(self, prompt, company, hq, year):
         return f"""{prompt}
@@ -230,48 +257,8 @@ class BaseResearcher:
                     }
                 )
 
-            # Add news topic for news analysts
-            search_params = {
-                "search_depth": "basic",
-                "include_raw_content": False,
-                "max_results": 5
-            }
-            
-            if self.analyst_type == "news_analyst":
-                search_params["topic"] = "news"
-            elif self.analyst_type == "financial_analyst":
-                search_params["topic"] = "finance"
-
-            results = await self.tavily_client.search(
-                query,
-                **search_params
-            )
-            
-            docs = {}
-            for result in results.get("results", []):
-                if not result.get("content") or not result.get("url"):
-                    continue
-                    
-                url = result.get("url")
-                title = result.get("title", "")
-                
-                # Clean up and validate the title using the references module
-                if title:
-                    title = clean_title(title)
-                    # If title is the same as URL or empty, set to empty to trigger extraction later
-                    if title.lower() == url.lower() or not title.strip():
-                        title = ""
-                
-                logger.info(f"Tavily search result for '{query}': URL={url}, Title='{title}'")
-                
-                docs[url] = {
-                    "title": title,
-                    "content": result.get("content", ""),
-                    "query": query,
-                    "url": url,
-                    "source": "web_search",
-                    "score": result.get("score", 0.0)
-                }
+            results, _ = await self._cached_search(query, self._search_params())
+            docs = self._process_search_results(query, results)
 
             if websocket_manager and job_id:
                 await websocket_manager.send_status_update(
@@ -304,7 +291,7 @@ class BaseResearcher:
 
     async def search_documents(self, state: ResearchState, queries: List[str]) -> Dict[str, Any]:
         """
-        Execute all Tavily searches in parallel at maximum speed
+        Execute all Tavily searches for a query set in one bounded fan-out
         """
         websocket_manager = state.get('websocket_manager')
         job_id = state.get('job_id')
@@ -323,21 +310,12 @@ class BaseResearcher:
                     "step": "Searching",
                     "analyst": self.analyst_type,
                     "queries": queries,
-                    "total_queries": len(queries)
+                    "total_queries": len(queries),
+                    "query_metrics": self.query_metrics
                 }
             )
 
-        # Prepare all search parameters upfront
-        search_params = {
-            "search_depth": "basic",
-            "include_raw_content": False,
-            "max_results": 5
-        }
-        
-        if self.analyst_type == "news_analyst":
-            search_params["topic"] = "news"
-        elif self.analyst_type == "financial_analyst":
-            search_params["topic"] = "finance"
+        search_params = self._search_params()
 
         if websocket_manager and job_id:
             await websocket_manager.send_status_update(
@@ -349,43 +327,57 @@ class BaseResearcher:
                     "total_queries": len(queries)
                 }
             )
-        # Create all API calls upfront - direct Tavily client calls without the extra wrapper
-        search_tasks = [
-            self.tavily_client.search(query, **search_params)
-            for query in queries
-        ]
 
-        # Execute all API calls in parallel
-        try:
-            results = await asyncio.gather(*search_tasks)
-        except Exception as e:
-            logger.error(f"Error during parallel search execution: {e}")
-            return {}
-
-        # Process results
+        # Search concurrently, then merge in query order so results don't depend on
+        # which search finished first; a failed query only loses its own results
+        results = await asyncio.gather(
+            *[self._cached_search(query, search_params) for query in queries],
+            return_exceptions=True
+        )
         merged_docs = {}
-        for query, result in zip(queries, results):
-            for item in result.get("results", []):
-                if not item.get("content") or not item.get("url"):
-                    continue
-                    
-                url = item.get("url")
-                title = item.get("title", "")
-                
-                if title:
-                    title = clean_title(title)
-                    if title.lower() == url.lower() or not title.strip():
-                        title = ""
-
-                merged_docs[url] = {
-                    "title": title,
-                    "content": item.get("content", ""),
-                    "query": query,
-                    "url": url,
-                    "source": "web_search",
-                    "score": item.get("score", 0.0)
-                }
-
+        failed_queries = []
+        cache_hits = 0
+        for query, outcome in zip(queries, results):
+            if isinstance(outcome, BaseException):
+                if not isinstance(outcome, Exception):
+                    raise outcome
+                logger.error(f"Error searching query '{query}': {outcome}")
+                failed_queries.append(query)
+                if websocket_manager and job_id:
+                    await websocket_manager.send_status_update(
+                        job_id=job_id,
+                        status="query_error",
+                        message=f"Search failed for: {query}",
+                        result={
+                            "step": "Searching",
+                            "query": query,
+                            "error": str(outcome)
+                        }
+                    )
+                continue
+
+            result, cached = outcome
+            cache_hits += cached
+            docs = self._process_search_results(query, result)
+            for url, doc in docs.items():
+                # A URL returned by several queries keeps its best result and every query that found it
+                if previous := merged_docs.get(url):
+                    found_by = previous["queries"] + doc["queries"]
+                    if doc["score"] <= previous["score"]:
+                        doc = previous
+                    doc["queries"] = found_by
+                merged_docs[url] = doc
+            if websocket_manager and job_id:
+                await websocket_manager.send_status_update(
+                    job_id=job_id,
+                    status="query_searched",
+                    message=f"Found {len(docs)} results for: {query}",
+                    result={
+                        "step": "Searching",
+                        "query": query,
+                        "results_count": len(docs)
+                    }
+                )
 
         # Send completion status
         if websocket_manager and job_id:
@@ -396,8 +388,70 @@ class BaseResearcher:
                 result={
                     "step": "Searching",
                     "total_documents": len(merged_docs),
-                    "queries_processed": len(queries)
+                    "queries_processed": len(queries),
+                    "queries_failed": len(failed_queries),
+                    "cache_hits": cache_hits
                 }
             )
 
+        logger.info(f"Search cache for {self.analyst_type}: {cache_hits}/{len(queries)} hits, totals {self.search_cache.stats()}")
         return merged_docs
+
+    async def _cached_search(self, query: str, search_params: Dict[str, Any]) -> Tuple[Dict[str, Any], bool]:
+        """Search Tavily through the shared cache. Returns the response and whether it was cached."""
+        if cached := await self.search_cache.get(query, search_params):
+            return cached, True
+
+        # The semaphore is shared by every researcher so a job's whole fan-out stays bounded.
+        async with _search_semaphore:
+            result = await self.tavily_client.search(query, **search_params)
+        await self.search_cache.set(query, search_params, result)
+        return result, False
+
+    def _search_params(self) -> Dict[str, Any]:
+        """Tavily search parameters for this analyst."""
+        search_params = {
+            "search_depth": "basic",
+            "include_raw_content": False,
+            "max_results": 5
+        }
+
+        # Add news topic for news analysts
+        if self.analyst_type == "news_analyzer":
+            search_params["topic"] = "news"
+        elif self.analyst_type == "financial_analyzer":
+            search_params["topic"] = "finance"
+
+        return search_params
+
+    def _process_search_results(self, query: str, results: Dict[str, Any]) -> Dict[str, Any]:
+        """Convert a Tavily search response into documents keyed by URL."""
+        docs = {}
+        for result in results.get("results", []):
+            if not result.get("content") or not result.get("url"):
+                continue
+
+            url = result.get("url")
+            title = result.get("title", "")
+
+            # Clean up and validate the title using the references module
+            if title:
+                title = clean_title(title)
+                # If title is the same as URL or empty, set to empty to trigger extraction later
+                if title.lower() == url.lower() or not title.strip():
+                    title = ""
+
+            logger.info(f"Tavily search result for '{query}': URL={url}, Title='{title}'")
+
+            docs[url] = {
+                "title": title,
+                "content": result.get("content", ""),
+                "query": query,
+                "url": url,
+                "queries": [query],
+                "source": "web_search",
+                "score": result.get("score", 0.0)
+            }
+            if published_date := result.get("published_date"):
+                docs[url]["published_date"] = published_date
+        return docs
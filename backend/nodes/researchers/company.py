@@ -57,13 +57,9 @@ class CompanyAnalyzer(BaseResearcher):
         
         # Perform additional research with comprehensive search
         try:
-            # Store documents with their respective queries
-            for query in queries:
-                documents = await self.search_documents(state, [query])
-                if documents:  # Only process if we got results
-                    for url, doc in documents.items():
-                        doc['query'] = query  # Associate each document with its query
-                        company_data[url] = doc
+            # Search all queries in one fan-out; documents keep their originating query
+            documents = await self.search_documents(state, queries)
+            company_data.update(documents)
             
             msg.append(f"\n✓ Found {len(company_data)} documents")
             if websocket_manager := state.get('websocket_manager'):
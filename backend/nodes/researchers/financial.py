@@ -59,11 +59,9 @@ class FinancialAnalyst(BaseResearcher):
                     'query': f'Financial information on {company}'
                 }
 
-            for query in queries:
-                documents = await self.search_documents(state, [query])
-                for url, doc in documents.items():
-                    doc['query'] = query
-                    financial_data[url] = doc
+            # Search all queries in one fan-out; documents keep their originating query
+            documents = await self.search_documents(state, queries)
+            financial_data.update(documents)
 
             # Final status update
             completion_msg = f"Completed analysis with {len(financial_data)} documents"
@@ -41,13 +41,9 @@ class NewsScanner(BaseResearcher):
         
         # Perform additional research with recent time filter
         try:
-            # Store documents with their respective queries
-            for query in queries:
-                documents = await self.search_documents(state, [query])
-                if documents:  # Only process if we got results
-                    for url, doc in documents.items():
-                        doc['query'] = query  # Associate each document with its query
-                        news_data[url] = doc
+            # Search all queries in one fan-out; documents keep their originating query
+            documents = await self.search_documents(state, queries)
+            news_data.update(documents)
             
             msg.append(f"\n✓ Found {len(news_data)} documents")
             if websocket_manager := state.get('websocket_manager'):
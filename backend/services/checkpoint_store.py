@@ -0,0 +1,240 @@
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import zlib
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional, Tuple
+
+from langchain_core.messages import BaseMessage, messages_from_dict, messages_to_dict
+
+from .kv_store import SQLiteKeyValueStore
+from .page_store import PageStore, page_store as default_page_store
+
+logger = logging.getLogger(__name__)
+
+# State keys that belong to the running process and are never checkpointed
+TRANSIENT_KEYS = {"websocket_manager"}
+# Marks a curated document whose page text was left to the page store
+PAGE_CONTENT_MARKER = "__page_content__"
+
+class CheckpointStore:
+    """Per-node output checkpoints for research jobs.
+
+    Once a node finishes, each top-level key of its output is stored as a
+    compressed JSON blob addressed by its hash, with a small manifest per
+    node, so state carried unchanged from node to node is stored once. The
+    request that started the job is kept alongside, letting a job be re-run
+    with completed nodes replayed from their checkpoints. A bounded
+    in-process tier sits in front of the optional SQLite tier. Named
+    pointers (such as the latest job per company) have their own, larger
+    tier so job traffic does not evict them. Enriched page text in curated
+    documents is not checkpointed: the page store already keeps it by URL,
+    and it is put back from there when a node is loaded.
+    """
+
+    def __init__(self, db_path: str = None, max_jobs: int = 20, max_age: float = 86400,
+                 max_pointers: int = 1000, page_store: PageStore = None) -> None:
+        self.page_store = page_store or default_page_store
+        self.max_jobs = max_jobs
+        self.max_age = max_age
+        self.max_pointers = max_pointers
+        self._jobs: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._pointers: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self.manifests = None
+        self.blobs = None
+        self.pointers = None
+        if db_path:
+            self.manifests = SQLiteKeyValueStore(db_path, "checkpoints")
+            self.blobs = SQLiteKeyValueStore(db_path, "checkpoint_blobs")
+            self.pointers = SQLiteKeyValueStore(db_path, "checkpoint_pointers")
+
+    @classmethod
+    def from_env(cls) -> "CheckpointStore":
+        db_path = os.getenv("CHECKPOINT_DB")
+        try:
+            store = cls(
+                db_path=db_path,
+                max_jobs=int(os.getenv("CHECKPOINT_MAX_JOBS", "20")),
+                max_age=float(os.getenv("CHECKPOINT_MAX_AGE", "86400")),
+                max_pointers=int(os.getenv("CHECKPOINT_MAX_POINTERS", "1000"))
+            )
+            if db_path:
+                logger.info(f"Persistent checkpoints enabled at {db_path}")
+                store.manifests.purge_older_than(store.max_age)
+                store.blobs.purge_older_than(store.max_age)
+                store.pointers.purge_older_than(store.max_age)
+            return store
+        except Exception as e:
+            logger.warning(f"Failed to open checkpoint store at {db_path}: {e}. Using memory only.")
+            return cls()
+
+    @staticmethod
+    def serialize(output: Dict[str, Any]) -> Dict[str, Tuple[str, bytes]]:
+        """Split a node output into {key: (digest, compressed JSON)}."""
+        parts = {}
+        for key, value in output.items():
+            if key in TRANSIENT_KEYS:
+                continue
+            if key.startswith("curated_") and isinstance(value, dict):
+                value = {url: CheckpointStore._without_page_content(doc) for url, doc in value.items()}
+            if key == "messages" and isinstance(value, list) and all(isinstance(m, BaseMessage) for m in value):
+                value = {"__messages__": messages_to_dict(value)}
+            encoded = json.dumps(value, default=str, sort_keys=True).encode("utf-8")
+            parts[key] = (hashlib.sha256(encoded).hexdigest(), zlib.compress(encoded))
+        return parts
+
+    @staticmethod
+    def _without_page_content(doc: Any) -> Any:
+        if not isinstance(doc, dict) or not doc.get("raw_content"):
+            return doc
+        doc = {field: value for field, value in doc.items() if field != "raw_content"}
+        doc[PAGE_CONTENT_MARKER] = True
+        return doc
+
+    @staticmethod
+    def deserialize(key: str, blob: bytes) -> Any:
+        value = json.loads(zlib.decompress(blob).decode("utf-8"))
+        if key == "messages" and isinstance(value, dict) and "__messages__" in value:
+            value = messages_from_dict(value["__messages__"])
+        return value
+
+    async def save_job(self, job_id: str, request: Dict[str, Any]) -> None:
+        """Record the request a job was started with."""
+        await self._put_manifest(job_id, "request", request)
+
+    async def load_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        return await self._get_manifest(job_id, "request")
+
+    async def save_pointer(self, name: str, value: Dict[str, Any]) -> None:
+        """Store a small named record, such as the latest job for a company."""
+        self._remember_pointer(name, value)
+        if self.pointers:
+            try:
+                await asyncio.to_thread(self.pointers.set, name, json.dumps(value, default=str).encode("utf-8"))
+            except Exception as e:
+                logger.warning(f"Checkpoint pointer write failed for {name}: {e}")
+
+    async def load_pointer(self, name: str) -> Optional[Dict[str, Any]]:
+        if name in self._pointers:
+            self._pointers.move_to_end(name)
+            return self._pointers[name]
+        if self.pointers:
+            try:
+                row = await asyncio.to_thread(self.pointers.get, name)
+            except Exception as e:
+                logger.warning(f"Checkpoint pointer read failed for {name}: {e}")
+                return None
+            if row:
+                value = json.loads(row[0])
+                self._remember_pointer(name, value)
+                return value
+        return None
+
+    def _remember_pointer(self, name: str, value: Dict[str, Any]) -> None:
+        self._pointers[name] = value
+        self._pointers.move_to_end(name)
+        while len(self._pointers) > self.max_pointers:
+            self._pointers.popitem(last=False)
+
+    async def save_node(self, job_id: str, node: str, output: Dict[str, Any]) -> None:
+        try:
+            parts = await asyncio.to_thread(self.serialize, output)
+        except Exception as e:
+            logger.warning(f"Could not checkpoint {node} for job {job_id}: {e}")
+            return
+
+        entry = self._entry(job_id)
+        new_blobs = {digest: blob for digest, blob in parts.values() if digest not in entry["blobs"]}
+        entry["blobs"].update(new_blobs)
+        if self.blobs and new_blobs:
+            try:
+                await asyncio.to_thread(self._write_blobs, new_blobs)
+            except Exception as e:
+                logger.warning(f"Checkpoint write failed for job {job_id}: {e}")
+                return
+        await self._put_manifest(job_id, node, {key: digest for key, (digest, _) in parts.items()})
+        logger.info(f"Checkpointed {node} for job {job_id} "
+                    f"({sum(len(blob) for blob in new_blobs.values())} new bytes)")
+
+    async def load_node(self, job_id: str, node: str) -> Optional[Dict[str, Any]]:
+        manifest = await self._get_manifest(job_id, node)
+        if manifest is None:
+            return None
+        entry = self._entry(job_id)
+        output = {}
+        for key, digest in manifest.items():
+            blob = entry["blobs"].get(digest)
+            if blob is None and self.blobs:
+                if row := await asyncio.to_thread(self.blobs.get, digest):
+                    blob = entry["blobs"][digest] = row[0]
+            if blob is None:
+                logger.warning(f"Checkpoint for {node} of job {job_id} is incomplete")
+                return None
+            output[key] = await asyncio.to_thread(self.deserialize, key, blob)
+        await self._restore_page_content(output)
+        return output
+
+    async def _restore_page_content(self, output: Dict[str, Any]) -> None:
+        """Put back the page text left out of curated documents, from the page store."""
+        docs = [
+            (url, doc)
+            for key, value in output.items() if key.startswith("curated_") and isinstance(value, dict)
+            for url, doc in value.items() if isinstance(doc, dict) and doc.pop(PAGE_CONTENT_MARKER, False)
+        ]
+        if not docs:
+            return
+        urls = {url for url, _ in docs} | {doc["duplicate_of"] for _, doc in docs if doc.get("duplicate_of")}
+        contents = await self.page_store.get_many(list(urls))
+        missing = 0
+        for url, doc in docs:
+            # Near-duplicates were given their canonical copy's text rather than extracted
+            if content := contents.get(url) or contents.get(doc.get("duplicate_of")):
+                doc["raw_content"] = content
+            else:
+                missing += 1
+        if missing:
+            logger.warning(f"Page store no longer holds the content of {missing}/{len(docs)} checkpointed documents")
+
+    async def completed_nodes(self, job_id: str, nodes: List[str]) -> List[str]:
+        return [node for node in nodes if await self._get_manifest(job_id, node) is not None]
+
+    def _entry(self, job_id: str) -> Dict[str, Any]:
+        if job_id not in self._jobs:
+            self._jobs[job_id] = {"manifests": {}, "blobs": {}}
+        self._jobs.move_to_end(job_id)
+        while len(self._jobs) > self.max_jobs:
+            self._jobs.popitem(last=False)
+        return self._jobs[job_id]
+
+    def _write_blobs(self, blobs: Dict[str, bytes]) -> None:
+        # Rewriting shared blobs refreshes their age for the current job
+        for digest, blob in blobs.items():
+            self.blobs.set(digest, blob)
+
+    async def _put_manifest(self, job_id: str, name: str, manifest: Dict[str, Any]) -> None:
+        self._entry(job_id)["manifests"][name] = manifest
+        if self.manifests:
+            try:
+                await asyncio.to_thread(self.manifests.set, f"{job_id}/{name}",
+                                        json.dumps(manifest, default=str).encode("utf-8"))
+            except Exception as e:
+                logger.warning(f"Checkpoint write failed for job {job_id}: {e}")
+
+    async def _get_manifest(self, job_id: str, name: str) -> Optional[Dict[str, Any]]:
+        if (entry := self._jobs.get(job_id)) and name in entry["manifests"]:
+            return entry["manifests"][name]
+        if self.manifests:
+            try:
+                row = await asyncio.to_thread(self.manifests.get, f"{job_id}/{name}")
+            except Exception as e:
+                logger.warning(f"Checkpoint read failed for job {job_id}: {e}")
+                return None
+            if row:
+                manifest = json.loads(row[0])
+                self._entry(job_id)["manifests"][name] = manifest
+                return manifest
+        return None
+
+checkpoint_store = CheckpointStore.from_env()
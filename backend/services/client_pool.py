@@ -0,0 +1,206 @@
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import time
+import weakref
+from collections import OrderedDict
+from typing import Dict, Any, Optional
+
+import httpx
+from ibm_watsonx_ai import APIClient, Credentials
+from ibm_watsonx_ai.foundation_models import ModelInference
+from tavily import AsyncTavilyClient
+
+logger = logging.getLogger(__name__)
+
+class _HTTPClientLease:
+    """Async context manager that lends a pooled client's httpx client for one request."""
+
+    def __init__(self, owner: "PooledTavilyClient") -> None:
+        self._owner = owner
+
+    async def __aenter__(self) -> httpx.AsyncClient:
+        return self._owner._acquire()
+
+    async def __aexit__(self, *exc_info) -> bool:
+        await self._owner._release()
+        return False
+
+class PooledTavilyClient(AsyncTavilyClient):
+    """AsyncTavilyClient that keeps one HTTP connection pool for all of its requests.
+
+    The stock client opens (and tears down) a new httpx client for every
+    search and extract call. Requests lease the shared httpx client, and
+    `aclose` only closes it once no request is using it; a retired client
+    that is used again reopens its pool and closes it when idle.
+    """
+
+    def __init__(self, api_key: str, max_connections: int = 20,
+                 transport: httpx.AsyncBaseTransport = None) -> None:
+        super().__init__(api_key=api_key)
+        self._api_key = api_key
+        self._max_connections = max_connections
+        self._transport = transport
+        self._http_client = self._new_http_client()
+        self._in_flight = 0
+        self._retired = False
+        self._client_creator = lambda: _HTTPClientLease(self)
+
+    def _new_http_client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(
+            headers={
+                "Content-Type": "application/json",
+                "Authorization": f"Bearer {self._api_key}"
+            },
+            base_url="https://api.tavily.com",
+            timeout=180,
+            limits=httpx.Limits(max_connections=self._max_connections,
+                                max_keepalive_connections=self._max_connections),
+            transport=self._transport
+        )
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def _acquire(self) -> httpx.AsyncClient:
+        if self._http_client.is_closed:
+            self._http_client = self._new_http_client()
+        self._in_flight += 1
+        return self._http_client
+
+    async def _release(self) -> None:
+        self._in_flight -= 1
+        if self._retired and self._in_flight == 0:
+            await self._http_client.aclose()
+
+    async def aclose(self) -> None:
+        """Retire the client, closing its connections as soon as no request is using them."""
+        self._retired = True
+        if self._in_flight == 0:
+            await self._http_client.aclose()
+
+class ClientPool:
+    """Process-wide pool of authenticated API clients.
+
+    Tavily and watsonx clients are keyed on a hash of the credentials that
+    created them, so jobs presenting the same keys share HTTP connection
+    pools and IAM tokens. watsonx tokens are checked off the event loop
+    whenever a pooled client is handed out more than `token_check_interval`
+    seconds after the last check, which lets the SDK refresh them before
+    they expire rather than in the middle of a model call. One
+    ModelInference is kept per client, model and parameter set.
+    """
+
+    def __init__(self, max_clients: int = 16, token_check_interval: float = 300,
+                 tavily_max_connections: int = 20) -> None:
+        self.max_clients = max_clients
+        self.token_check_interval = token_check_interval
+        self.tavily_max_connections = tavily_max_connections
+        self._tavily: "OrderedDict[str, PooledTavilyClient]" = OrderedDict()
+        self._watsonx: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._models: "weakref.WeakKeyDictionary[APIClient, Dict[str, ModelInference]]" = weakref.WeakKeyDictionary()
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def from_env(cls) -> "ClientPool":
+        return cls(
+            max_clients=int(os.getenv("CLIENT_POOL_MAX_CLIENTS", "16")),
+            token_check_interval=float(os.getenv("WATSONX_TOKEN_CHECK_INTERVAL", "300")),
+            tavily_max_connections=int(os.getenv("TAVILY_MAX_CONNECTIONS", "20"))
+        )
+
+    @staticmethod
+    def _key(*parts: Optional[str]) -> str:
+        return hashlib.sha256("\x00".join(part or "" for part in parts).encode()).hexdigest()
+
+    def get_tavily_client(self, api_key: str) -> AsyncTavilyClient:
+        key = self._key(api_key)
+        if client := self._tavily.get(key):
+            self._tavily.move_to_end(key)
+            self.hits += 1
+            return client
+
+        self.misses += 1
+        client = PooledTavilyClient(api_key=api_key, max_connections=self.tavily_max_connections)
+        self._tavily[key] = client
+        while len(self._tavily) > self.max_clients:
+            _, evicted = self._tavily.popitem(last=False)
+            self._close_later(evicted)
+        return client
+
+    async def get_watsonx_client(self, api_key: str, url: str, project_id: str) -> APIClient:
+        """Return an authenticated APIClient, creating it (and its IAM token) at most once per key.
+
+        The project is part of the key because ModelInference sets it as the
+        client's default project.
+        """
+        key = self._key(url, api_key, project_id)
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            if entry := self._watsonx.get(key):
+                self._watsonx.move_to_end(key)
+                self.hits += 1
+                if time.monotonic() - entry["token_checked_at"] > self.token_check_interval:
+                    try:
+                        # Reading the token lets the SDK refresh it if it is close to expiry
+                        await asyncio.to_thread(lambda: entry["client"].token)
+                        entry["token_checked_at"] = time.monotonic()
+                    except Exception as e:
+                        logger.warning(f"watsonx token refresh failed, recreating client: {e}")
+                        del self._watsonx[key]
+                        entry = None
+                if entry:
+                    return entry["client"]
+
+            self.misses += 1
+            start = time.monotonic()
+            client = await asyncio.to_thread(APIClient, Credentials(url=url, api_key=api_key))
+            logger.info(f"Created watsonx client in {time.monotonic() - start:.2f}s")
+            self._watsonx[key] = {"client": client, "token_checked_at": time.monotonic()}
+            while len(self._watsonx) > self.max_clients:
+                evicted_key, _ = self._watsonx.popitem(last=False)
+                self._locks.pop(evicted_key, None)
+            return client
+
+    def get_model(self, model_id: str, api_client: APIClient, project_id: str,
+                  params: Dict[str, Any] = None) -> ModelInference:
+        """Return the shared ModelInference for this client, model and parameters."""
+        if api_client is None:
+            # Nothing to share; let ModelInference report the missing client
+            return ModelInference(model_id=model_id, api_client=api_client, project_id=project_id, params=params)
+
+        models = self._models.setdefault(api_client, {})
+        key = json.dumps([model_id, project_id, params or {}], sort_keys=True, default=str)
+        if model := models.get(key):
+            self.hits += 1
+            return model
+
+        self.misses += 1
+        model = ModelInference(model_id=model_id, api_client=api_client, project_id=project_id, params=params)
+        models[key] = model
+        return model
+
+    def _close_later(self, client: PooledTavilyClient) -> None:
+        # Requests still running on an evicted client keep its connections open until they finish
+        try:
+            asyncio.get_running_loop().create_task(client.aclose())
+        except RuntimeError:
+            pass
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "tavily_clients": len(self._tavily),
+            "watsonx_clients": len(self._watsonx),
+            "models": sum(len(models) for models in self._models.values()),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 3) if lookups else 0.0
+        }
+
+client_pool = ClientPool.from_env()
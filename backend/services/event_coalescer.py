@@ -0,0 +1,102 @@
+import asyncio
+import logging
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+class EventCoalescer:
+    """Merges high-frequency progress updates per job before they are broadcast.
+
+    Updates with a rule in RULES are held for at most `window` seconds:
+      "supersede" - only the latest update per key is sent (partial queries)
+      "concat"    - text chunks per key are joined into one update
+      "batch"     - per-document updates become one update with a count
+    Any other status is sent immediately, after flushing the job's pending
+    updates, so terminal events are never merged or reordered.
+    """
+
+    RULES: Dict[str, Tuple[str, Tuple[str, ...]]] = {
+        "query_generating": ("supersede", ("category", "query_number")),
+        "briefing_chunk": ("concat", ("category",)),
+        "report_chunk": ("concat", ()),
+        "document_kept": ("batch", ("doc_type",))
+    }
+
+    def __init__(self, emit: Callable[[str, dict], Awaitable[None]], window: float = 0.25, max_batch: int = 50):
+        self.emit = emit
+        self.window = window
+        self.max_batch = max_batch
+        self._pending: Dict[str, "OrderedDict[tuple, dict]"] = {}
+        self._timers: Dict[str, asyncio.TimerHandle] = {}
+        self._flush_tasks: Set[asyncio.Task] = set()
+        self.received = 0
+        self.emitted = 0
+
+    async def submit(self, job_id: str, update: dict) -> None:
+        self.received += 1
+        data = update.get("data") or {}
+        rule = self.RULES.get(data.get("status"))
+        if rule is None or self.window <= 0:
+            await self.flush(job_id)
+            await self._emit(job_id, update)
+            return
+
+        mode, key_fields = rule
+        result = data.get("result") or {}
+        key = (data["status"],) + tuple(result.get(field) for field in key_fields)
+        pending = self._pending.setdefault(job_id, OrderedDict())
+
+        if (existing := pending.get(key)) is None:
+            if mode == "batch":
+                update["data"]["result"] = {**result, "count": 1}
+            pending[key] = update
+        elif mode == "supersede":
+            pending[key] = update
+        elif mode == "concat":
+            existing_result = existing["data"]["result"]
+            existing_result["chunk"] = existing_result.get("chunk", "") + result.get("chunk", "")
+        elif mode == "batch":
+            existing_result = existing["data"]["result"]
+            existing_result["count"] += 1
+            existing["data"]["message"] = f"Kept {existing_result['count']} documents"
+            if existing_result["count"] >= self.max_batch:
+                await self.flush(job_id)
+                return
+
+        if job_id not in self._timers:
+            loop = asyncio.get_running_loop()
+            self._timers[job_id] = loop.call_later(self.window, self._start_flush, job_id)
+
+    def _start_flush(self, job_id: str) -> None:
+        # Hold the task until it finishes so it isn't garbage-collected and its failure is seen
+        task = asyncio.create_task(self.flush(job_id))
+        self._flush_tasks.add(task)
+        task.add_done_callback(lambda done: self._flush_done(job_id, done))
+
+    def _flush_done(self, job_id: str, task: asyncio.Task) -> None:
+        self._flush_tasks.discard(task)
+        if not task.cancelled() and (error := task.exception()):
+            logger.error(f"Failed to flush coalesced updates for job {job_id}: {error}")
+
+    async def flush(self, job_id: str) -> None:
+        """Send every pending update for a job, in the order they were first queued."""
+        if timer := self._timers.pop(job_id, None):
+            timer.cancel()
+        pending = self._pending.pop(job_id, None)
+        if not pending:
+            return
+        for update in pending.values():
+            await self._emit(job_id, update)
+
+    async def _emit(self, job_id: str, update: dict) -> None:
+        self.emitted += 1
+        await self.emit(job_id, update)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "received": self.received,
+            "emitted": self.emitted,
+            "pending_jobs": len(self._pending),
+            "reduction": round(1 - self.emitted / self.received, 3) if self.received else 0.0
+        }
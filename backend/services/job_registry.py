@@ -0,0 +1,234 @@
+import logging
+import sys
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, Any, Optional
+
+logger = logging.getLogger(__name__)
+
+class InvalidTransitionError(ValueError):
+    """Raised when a job is moved to a status it cannot reach from its current one."""
+
+class JobRegistry:
+    """Bounded in-memory table of research jobs.
+
+    Jobs move through pending -> processing -> completed/failed, or are
+    cancelled while pending, with a timestamp recorded for every transition.
+    Finished jobs are evicted, least recently updated first, once they
+    exceed `max_age` seconds or the table grows past `max_jobs`, and only
+    the `max_reports` most recently used reports are kept in memory; older
+    ones are spilled to the job store when one is configured, and released
+    only once the store confirms the write. Finished jobs and in-memory
+    reports are tracked in their own ordered tables, so eviction only looks
+    at the entries it removes.
+    """
+
+    PENDING = "pending"
+    PROCESSING = "processing"
+    COMPLETED = "completed"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+    TRANSITIONS = {
+        PENDING: {PROCESSING, FAILED, CANCELLED},
+        PROCESSING: {COMPLETED, FAILED},
+        COMPLETED: set(),
+        FAILED: set(),
+        CANCELLED: set()
+    }
+
+    def __init__(self, max_jobs: int = 1000, max_age: float = 86400, max_reports: int = 100, job_store=None) -> None:
+        self.max_jobs = max_jobs
+        self.max_age = max_age
+        self.max_reports = max_reports
+        self.job_store = job_store
+        self._jobs: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        # Finished jobs by last update and in-memory reports by last use, oldest first.
+        # Entries waiting on the job store are taken out until it answers.
+        self._finished: "OrderedDict[str, None]" = OrderedDict()
+        self._reports: "OrderedDict[str, None]" = OrderedDict()
+        self.evicted_jobs = 0
+        self.spilled_reports = 0
+
+    def create(self, job_id: str, company: str = None) -> Dict[str, Any]:
+        now = datetime.now().isoformat()
+        self._finished.pop(job_id, None)
+        self._reports.pop(job_id, None)
+        self._jobs[job_id] = {
+            "status": self.PENDING,
+            "result": None,
+            "error": None,
+            "debug_info": [],
+            "company": company,
+            "report": None,
+            "report_persisted": False,
+            "report_spill_pending": False,
+            "created_at": now,
+            "timestamps": {self.PENDING: now},
+            "last_update": now
+        }
+        self._evict()
+        return self._jobs[job_id]
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Look up a job without creating it."""
+        job = self._jobs.get(job_id)
+        if job is not None:
+            self._jobs.move_to_end(job_id)
+            if job_id in self._reports:
+                self._reports.move_to_end(job_id)
+        return job
+
+    def __contains__(self, job_id: str) -> bool:
+        return job_id in self._jobs
+
+    def __getitem__(self, job_id: str) -> Dict[str, Any]:
+        if (job := self.get(job_id)) is None:
+            raise KeyError(job_id)
+        return job
+
+    def transition(self, job_id: str, status: str, **fields) -> Dict[str, Any]:
+        """Move a job to `status` and update any other fields given."""
+        job = self._jobs.get(job_id)
+        if job is None:
+            raise KeyError(job_id)
+        if status != job["status"] and status not in self.TRANSITIONS.get(job["status"], set()):
+            raise InvalidTransitionError(f"Job {job_id} cannot move from {job['status']} to {status}")
+
+        now = datetime.now().isoformat()
+        job.update(fields)
+        job["status"] = status
+        job["timestamps"][status] = now
+        job["last_update"] = now
+        self._jobs.move_to_end(job_id)
+        if self._is_finished(job):
+            self._finished[job_id] = None
+            self._finished.move_to_end(job_id)
+        if job.get("report"):
+            self._reports[job_id] = None
+            self._reports.move_to_end(job_id)
+        self._evict()
+        return job
+
+    async def get_report(self, job_id: str) -> Optional[str]:
+        """Return a report from memory, falling back to the job store for spilled reports."""
+        if (job := self.get(job_id)) and job.get("report"):
+            return job["report"]
+        if self.job_store:
+            try:
+                if report := await self.job_store.get_report(job_id):
+                    return report.get("report_content")
+            except Exception as e:
+                logger.warning(f"Failed to load report for job {job_id} from the job store: {e}")
+        return None
+
+    def _is_finished(self, job: Dict[str, Any]) -> bool:
+        return job["status"] in (self.COMPLETED, self.FAILED, self.CANCELLED)
+
+    def _evict(self) -> None:
+        now = datetime.now()
+
+        # Drop finished jobs that are too old, or the oldest ones when over capacity.
+        # A report the job store has not confirmed yet keeps its job in memory until it has.
+        while self._finished:
+            job_id = next(iter(self._finished))
+            job = self._jobs[job_id]
+            too_old = (now - datetime.fromisoformat(job["last_update"])).total_seconds() > self.max_age
+            if not (too_old or len(self._jobs) > self.max_jobs):
+                break
+            if not self._report_safe_to_drop(job_id, job):
+                if not self._park(job_id, job):
+                    break
+                continue
+            del self._finished[job_id]
+            self._reports.pop(job_id, None)
+            del self._jobs[job_id]
+            self.evicted_jobs += 1
+
+        # Keep only the most recently used reports in memory
+        while len(self._reports) > self.max_reports:
+            job_id = next(iter(self._reports))
+            job = self._jobs[job_id]
+            if not self._report_safe_to_drop(job_id, job):
+                if not self._park(job_id, job):
+                    break
+                continue
+            del self._reports[job_id]
+            self._drop_report(job)
+
+    def _park(self, job_id: str, job: Dict[str, Any]) -> bool:
+        """Set a job aside while its report is being written; `_unpark` brings it back.
+
+        Returns False when no write is in flight, in which case the job stays
+        where it is and a later pass retries the write.
+        """
+        if not job.get("report_spill_pending"):
+            return False
+        self._finished.pop(job_id, None)
+        self._reports.pop(job_id, None)
+        return True
+
+    def _unpark(self, job_id: str, job: Dict[str, Any]) -> None:
+        # Put the job back at the front, where eviction looks next
+        if self._jobs.get(job_id) is not job:
+            return
+        if self._is_finished(job) and job_id not in self._finished:
+            self._finished[job_id] = None
+            self._finished.move_to_end(job_id, last=False)
+        if job.get("report") and job_id not in self._reports:
+            self._reports[job_id] = None
+            self._reports.move_to_end(job_id, last=False)
+
+    def persist_report(self, job_id: str) -> None:
+        """Write a job's report to the job store; `report_persisted` is set once the store confirms it."""
+        if job := self._jobs.get(job_id):
+            self._spill_report(job_id, job)
+
+    def _report_safe_to_drop(self, job_id: str, job: Dict[str, Any]) -> bool:
+        """Whether the in-memory report can go, starting a write to the job store if it still needs one."""
+        if not job.get("report") or job.get("report_persisted") or not self.job_store:
+            return True
+        self._spill_report(job_id, job)
+        return job.get("report_persisted", False)
+
+    def _drop_report(self, job: Dict[str, Any]) -> None:
+        job["report"] = None
+        if isinstance(job.get("result"), dict):
+            job["result"].pop("report", None)
+        self.spilled_reports += 1
+
+    def _spill_report(self, job_id: str, job: Dict[str, Any]) -> None:
+        if not job.get("report") or job.get("report_persisted") or job.get("report_spill_pending") or not self.job_store:
+            return
+
+        def on_done(written: bool) -> None:
+            job["report_spill_pending"] = False
+            if written:
+                # The in-memory copy is released on the next eviction pass
+                job["report_persisted"] = True
+            else:
+                logger.warning(f"Job store did not persist the report for job {job_id}; keeping it in memory")
+            self._unpark(job_id, job)
+
+        job["report_spill_pending"] = True
+        try:
+            self.job_store.enqueue_report(job_id, {"report": job["report"]}, on_done=on_done)
+        except Exception as e:
+            job["report_spill_pending"] = False
+            logger.warning(f"Failed to spill report for job {job_id} to the job store: {e}")
+
+    def memory_usage(self) -> Dict[str, Any]:
+        """Approximate memory held by the registry."""
+        report_bytes = sum(len(job["report"]) for job in self._jobs.values() if job.get("report"))
+        status_counts: Dict[str, int] = {}
+        for job in self._jobs.values():
+            status_counts[job["status"]] = status_counts.get(job["status"], 0) + 1
+        return {
+            "jobs": len(self._jobs),
+            "status_counts": status_counts,
+            "reports_in_memory": sum(1 for job in self._jobs.values() if job.get("report")),
+            "report_bytes": report_bytes,
+            "approx_bytes": report_bytes + sum(sys.getsizeof(job) for job in self._jobs.values()),
+            "evicted_jobs": self.evicted_jobs,
+            "spilled_reports": self.spilled_reports
+        }
@@ -0,0 +1,115 @@
+import asyncio
+import heapq
+import itertools
+import logging
+from typing import Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+class QueueFullError(Exception):
+    """Raised when a job is submitted while the queue is at capacity."""
+
+class JobScheduler:
+    """Admission control for research jobs.
+
+    At most `max_concurrent` jobs run at once. Further jobs wait in a
+    priority queue (higher priority first, FIFO within a priority) of at
+    most `max_queue` entries, and queued jobs are told their position over
+    their job WebSocket whenever it changes.
+    """
+
+    def __init__(self, max_concurrent: int = 4, max_queue: int = 50, websocket_manager=None) -> None:
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.websocket_manager = websocket_manager
+        self._queue: List[Tuple[int, int, str]] = []
+        self._factories: Dict[str, Callable[[], Awaitable]] = {}
+        self._running: Dict[str, asyncio.Task] = {}
+        self._cancelled: Set[str] = set()
+        self._counter = itertools.count()
+        self._notifications: Set[asyncio.Task] = set()
+
+    def submit(self, job_id: str, job_factory: Callable[[], Awaitable], priority: int = 0) -> int:
+        """Start or queue a job. Returns its queue position, 0 if it started immediately."""
+        if len(self._running) < self.max_concurrent and not self._factories:
+            self._start(job_id, job_factory)
+            return 0
+
+        if len(self._factories) >= self.max_queue:
+            raise QueueFullError(f"Job queue is full ({self.max_queue} jobs waiting)")
+
+        heapq.heappush(self._queue, (-priority, next(self._counter), job_id))
+        self._factories[job_id] = job_factory
+        logger.info(f"Queued job {job_id} with priority {priority}")
+        self._notify_positions()
+        return self.position(job_id)
+
+    def cancel(self, job_id: str) -> bool:
+        """Remove a queued job. Returns False if the job is not waiting in the queue."""
+        if job_id not in self._factories:
+            return False
+        del self._factories[job_id]
+        self._cancelled.add(job_id)
+        logger.info(f"Cancelled queued job {job_id}")
+        self._notify_positions()
+        return True
+
+    def position(self, job_id: str) -> Optional[int]:
+        """1-based position of a queued job, or None if it is not queued."""
+        if job_id not in self._factories:
+            return None
+        return self._waiting().index(job_id) + 1
+
+    def _waiting(self) -> List[str]:
+        """Queued job ids in the order they will start."""
+        return [job_id for _, _, job_id in sorted(self._queue) if job_id in self._factories]
+
+    def is_running(self, job_id: str) -> bool:
+        return job_id in self._running
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "running": len(self._running),
+            "queued": len(self._factories),
+            "max_concurrent": self.max_concurrent,
+            "max_queue": self.max_queue
+        }
+
+    def _start(self, job_id: str, job_factory: Callable[[], Awaitable]) -> None:
+        task = asyncio.create_task(job_factory())
+        self._running[job_id] = task
+        task.add_done_callback(lambda _: self._on_done(job_id))
+
+    def _on_done(self, job_id: str) -> None:
+        self._running.pop(job_id, None)
+        started = False
+        while self._queue and len(self._running) < self.max_concurrent:
+            _, _, next_id = heapq.heappop(self._queue)
+            if next_id in self._cancelled:
+                self._cancelled.discard(next_id)
+                continue
+            if job_factory := self._factories.pop(next_id, None):
+                logger.info(f"Starting queued job {next_id}")
+                self._start(next_id, job_factory)
+                started = True
+        if started:
+            self._notify_positions()
+
+    def _notify_positions(self) -> None:
+        if not self.websocket_manager:
+            return
+        for position, job_id in enumerate(self._waiting(), start=1):
+            task = asyncio.create_task(self.websocket_manager.send_status_update(
+                job_id=job_id,
+                status="queued",
+                message=f"Waiting for a free research slot (position {position} in queue)",
+                result={"queue_position": position}
+            ))
+            # Hold a reference until the update is sent so the task isn't garbage-collected
+            self._notifications.add(task)
+            task.add_done_callback(self._notification_done)
+
+    def _notification_done(self, task: asyncio.Task) -> None:
+        self._notifications.discard(task)
+        if not task.cancelled() and (error := task.exception()):
+            logger.warning(f"Failed to send queue position update: {error}")
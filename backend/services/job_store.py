@@ -0,0 +1,228 @@
+import asyncio
+import copy
+import logging
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Callable, Dict, Any, List, Optional
+
+from .mongodb import MongoDBService
+
+logger = logging.getLogger(__name__)
+
+# Statuses written through immediately instead of being debounced
+TERMINAL_STATUSES = {"completed", "failed", "cancelled"}
+
+class JobStore(ABC):
+    """Async persistence for research jobs and reports.
+
+    `update_job` may be debounced and `enqueue_report` is write-behind, so
+    callers that need everything on disk (e.g. at shutdown) await `flush`.
+    """
+
+    async def ensure_indexes(self) -> None:
+        pass
+
+    @abstractmethod
+    async def create_job(self, job_id: str, inputs: Dict[str, Any]) -> None:
+        ...
+
+    @abstractmethod
+    async def update_job(self, job_id: str, status: str = None,
+                         result: Dict[str, Any] = None, error: str = None) -> None:
+        ...
+
+    @abstractmethod
+    async def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        ...
+
+    @abstractmethod
+    def enqueue_report(self, job_id: str, report_data: Dict[str, Any],
+                       on_done: Callable[[bool], None] = None) -> None:
+        """Queue a report to be written in the background.
+
+        `on_done` is called with True once the report is written, or with
+        False if the store gave up on it.
+        """
+
+    async def store_report(self, job_id: str, report_data: Dict[str, Any]) -> None:
+        self.enqueue_report(job_id, report_data)
+
+    @abstractmethod
+    async def get_report(self, job_id: str) -> Optional[Dict[str, Any]]:
+        ...
+
+    async def flush(self) -> None:
+        pass
+
+    async def close(self) -> None:
+        await self.flush()
+
+    @staticmethod
+    def _update_fields(status: str = None, result: Dict[str, Any] = None, error: str = None) -> Dict[str, Any]:
+        fields = {"updated_at": datetime.utcnow()}
+        if status:
+            fields["status"] = status
+        if result:
+            fields["result"] = result
+        if error:
+            fields["error"] = error
+        return fields
+
+    @staticmethod
+    def _report_document(job_id: str, report_data: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "job_id": job_id,
+            "report_content": report_data.get("report", ""),
+            "references": report_data.get("references", []),
+            "sections": report_data.get("sections_completed", []),
+            "analyst_queries": report_data.get("analyst_queries", {}),
+            "created_at": datetime.utcnow()
+        }
+
+class MongoJobStore(JobStore):
+    """JobStore on top of the synchronous MongoDBService.
+
+    Driver calls run on a small thread pool so they never block the event
+    loop. Status updates are merged per job and written in one bulk
+    request every `debounce` seconds (terminal statuses go out at once),
+    and reports are written behind the caller with a few retries.
+    """
+
+    def __init__(self, service: MongoDBService, debounce: float = 0.5,
+                 max_workers: int = 4, report_retries: int = 3) -> None:
+        self.service = service
+        self.debounce = debounce
+        self.report_retries = report_retries
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="mongodb")
+        self._pending_updates: Dict[str, Dict[str, Any]] = {}
+        self._pending_reports: Dict[str, Dict[str, Any]] = {}
+        self._report_callbacks: Dict[str, List[Callable[[bool], None]]] = {}
+        self._update_task: Optional[asyncio.Task] = None
+        self._report_task: Optional[asyncio.Task] = None
+
+    async def _run(self, func, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, lambda: func(*args, **kwargs))
+
+    async def ensure_indexes(self) -> None:
+        try:
+            await self._run(self.service.ensure_indexes)
+        except Exception as e:
+            logger.warning(f"Failed to create MongoDB indexes: {e}")
+
+    async def create_job(self, job_id: str, inputs: Dict[str, Any]) -> None:
+        await self._run(self.service.create_job, job_id, inputs)
+
+    async def update_job(self, job_id: str, status: str = None,
+                         result: Dict[str, Any] = None, error: str = None) -> None:
+        self._pending_updates.setdefault(job_id, {}).update(self._update_fields(status, result, error))
+        if status in TERMINAL_STATUSES or self.debounce <= 0:
+            await self._flush_updates()
+        elif self._update_task is None or self._update_task.done():
+            self._update_task = asyncio.create_task(self._delayed_flush())
+
+    async def _delayed_flush(self) -> None:
+        await asyncio.sleep(self.debounce)
+        await self._flush_updates()
+
+    async def _flush_updates(self) -> None:
+        updates, self._pending_updates = self._pending_updates, {}
+        if not updates:
+            return
+        try:
+            await self._run(self.service.bulk_update_jobs, updates)
+        except Exception as e:
+            logger.error(f"Failed to write {len(updates)} job updates to MongoDB: {e}")
+
+    async def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        job = await self._run(self.service.get_job, job_id)
+        if job and (pending := self._pending_updates.get(job_id)):
+            job = {**job, **pending}
+        return job
+
+    def enqueue_report(self, job_id: str, report_data: Dict[str, Any],
+                       on_done: Callable[[bool], None] = None) -> None:
+        self._pending_reports[job_id] = report_data
+        if on_done:
+            self._report_callbacks.setdefault(job_id, []).append(on_done)
+        if self._report_task is None or self._report_task.done():
+            self._report_task = asyncio.create_task(self._write_reports())
+
+    async def _write_reports(self) -> None:
+        attempts: Dict[str, int] = {}
+        while self._pending_reports:
+            job_id, report_data = next(iter(self._pending_reports.items()))
+            try:
+                await self._run(self.service.store_report, job_id, report_data)
+                written = True
+            except Exception as e:
+                attempts[job_id] = attempts.get(job_id, 0) + 1
+                if attempts[job_id] < self.report_retries:
+                    logger.warning(f"Retrying report write for job {job_id}: {e}")
+                    await asyncio.sleep(attempts[job_id])
+                    continue
+                logger.error(f"Giving up on writing report for job {job_id}: {e}")
+                written = False
+            # Only drop the entry if it wasn't replaced while we were writing it
+            if self._pending_reports.get(job_id) is report_data:
+                del self._pending_reports[job_id]
+                for on_done in self._report_callbacks.pop(job_id, []):
+                    self._notify(on_done, job_id, written)
+
+    @staticmethod
+    def _notify(on_done: Callable[[bool], None], job_id: str, written: bool) -> None:
+        try:
+            on_done(written)
+        except Exception as e:
+            logger.warning(f"Report write callback failed for job {job_id}: {e}")
+
+    async def get_report(self, job_id: str) -> Optional[Dict[str, Any]]:
+        if report_data := self._pending_reports.get(job_id):
+            return self._report_document(job_id, report_data)
+        return await self._run(self.service.get_report, job_id)
+
+    async def flush(self) -> None:
+        await self._flush_updates()
+        if self._report_task and not self._report_task.done():
+            await self._report_task
+
+    async def close(self) -> None:
+        await self.flush()
+        self._executor.shutdown(wait=False)
+
+class InMemoryJobStore(JobStore):
+    """Process-local JobStore for tests and single-process runs without MongoDB."""
+
+    def __init__(self) -> None:
+        self.jobs: Dict[str, Dict[str, Any]] = {}
+        self.reports: Dict[str, Dict[str, Any]] = {}
+
+    async def create_job(self, job_id: str, inputs: Dict[str, Any]) -> None:
+        now = datetime.utcnow()
+        self.jobs[job_id] = {
+            "job_id": job_id,
+            "inputs": inputs,
+            "status": "pending",
+            "created_at": now,
+            "updated_at": now
+        }
+
+    async def update_job(self, job_id: str, status: str = None,
+                         result: Dict[str, Any] = None, error: str = None) -> None:
+        if job := self.jobs.get(job_id):
+            job.update(self._update_fields(status, result, error))
+
+    async def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        job = self.jobs.get(job_id)
+        return copy.deepcopy(job) if job else None
+
+    def enqueue_report(self, job_id: str, report_data: Dict[str, Any],
+                       on_done: Callable[[bool], None] = None) -> None:
+        self.reports[job_id] = self._report_document(job_id, report_data)
+        if on_done:
+            on_done(True)
+
+    async def get_report(self, job_id: str) -> Optional[Dict[str, Any]]:
+        report = self.reports.get(job_id)
+        return dict(report) if report else None
@@ -0,0 +1,85 @@
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+class SQLiteKeyValueStore:
+    """Small persistent key/value table used as the durable tier of the in-process caches.
+
+    Calls are blocking; async callers should run them with `asyncio.to_thread`.
+    """
+
+    def __init__(self, path: str, table: str) -> None:
+        if not table.isidentifier():
+            raise ValueError(f"Invalid table name: {table}")
+        if directory := os.path.dirname(path):
+            os.makedirs(directory, exist_ok=True)
+
+        self.path = path
+        self.table = table
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {table} ("
+                "key TEXT PRIMARY KEY, value BLOB NOT NULL, stored_at REAL NOT NULL)"
+            )
+            self._conn.commit()
+
+    def get(self, key: str) -> Optional[Tuple[bytes, float]]:
+        """Return (value, stored_at) for a key, or None if it is missing."""
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT value, stored_at FROM {self.table} WHERE key = ?", (key,)
+            ).fetchone()
+        return (bytes(row[0]), row[1]) if row else None
+
+    def set(self, key: str, value: bytes, stored_at: float = None) -> None:
+        with self._lock:
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO {self.table} (key, value, stored_at) VALUES (?, ?, ?)",
+                (key, value, stored_at if stored_at is not None else time.time())
+            )
+            self._conn.commit()
+
+    def touch(self, key: str, stored_at: float = None) -> None:
+        """Reset an entry's age without rewriting its value."""
+        with self._lock:
+            self._conn.execute(
+                f"UPDATE {self.table} SET stored_at = ? WHERE key = ?",
+                (stored_at if stored_at is not None else time.time(), key)
+            )
+            self._conn.commit()
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+            self._conn.commit()
+
+    def purge_older_than(self, max_age: float) -> int:
+        """Delete entries older than `max_age` seconds and return how many were removed."""
+        with self._lock:
+            cursor = self._conn.execute(
+                f"DELETE FROM {self.table} WHERE stored_at < ?", (time.time() - max_age,)
+            )
+            self._conn.commit()
+        return cursor.rowcount
+
+    def trim(self, max_entries: int) -> int:
+        """Delete all but the `max_entries` most recently stored entries and return how many were removed."""
+        with self._lock:
+            cursor = self._conn.execute(
+                f"DELETE FROM {self.table} WHERE key NOT IN "
+                f"(SELECT key FROM {self.table} ORDER BY stored_at DESC LIMIT ?)", (max_entries,)
+            )
+            self._conn.commit()
+        return cursor.rowcount
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
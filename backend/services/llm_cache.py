@@ -0,0 +1,112 @@
+import asyncio
+import logging
+import os
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Optional
+
+from .kv_store import SQLiteKeyValueStore
+from ..utils.fingerprint import fingerprint
+
+logger = logging.getLogger(__name__)
+
+class LLMOutputCache:
+    """Memo of LLM outputs keyed on a fingerprint of everything that shapes them.
+
+    Keys cover the model id, decoding parameters, a prompt template version
+    and the rendered prompt (and with it the ordered documents), so identical
+    inputs skip the model. Entries expire after `ttl` seconds and the
+    in-process tier is bounded by entry count and total characters, with an
+    optional persistent backend. Hits and misses are counted per node.
+    """
+
+    def __init__(self, max_entries: int = 512, max_chars: int = 20_000_000, ttl: float = 86400,
+                 backend: SQLiteKeyValueStore = None) -> None:
+        self.max_entries = max_entries
+        self.max_chars = max_chars
+        self.ttl = ttl
+        self.backend = backend
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._chars = 0
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+    @classmethod
+    def from_env(cls) -> "LLMOutputCache":
+        backend = None
+        if db_path := os.getenv("LLM_CACHE_DB"):
+            try:
+                backend = SQLiteKeyValueStore(db_path, "llm_outputs")
+                logger.info(f"Persistent LLM output cache enabled at {db_path}")
+            except Exception as e:
+                logger.warning(f"Failed to open LLM output cache at {db_path}: {e}. Using memory only.")
+
+        return cls(
+            max_entries=int(os.getenv("LLM_CACHE_MAX_ENTRIES", "512")),
+            max_chars=int(os.getenv("LLM_CACHE_MAX_CHARS", "20000000")),
+            ttl=float(os.getenv("LLM_CACHE_TTL", "86400")),
+            backend=backend
+        )
+
+    @staticmethod
+    def make_key(node: str, model_id: str, params: Dict[str, Any], prompt_version: str, *inputs: Any) -> str:
+        return fingerprint(node, model_id, params, prompt_version, *inputs)
+
+    async def get(self, node: str, key: str) -> Optional[str]:
+        stats = self._stats.setdefault(node, {"hits": 0, "misses": 0})
+        now = time.time()
+
+        if entry := self._entries.get(key):
+            value, stored_at = entry
+            if now - stored_at <= self.ttl:
+                self._entries.move_to_end(key)
+                stats["hits"] += 1
+                return value
+            self._forget(key)
+
+        if self.backend:
+            try:
+                row = await asyncio.to_thread(self.backend.get, key)
+            except Exception as e:
+                logger.warning(f"LLM output cache backend read failed: {e}")
+                row = None
+            if row and now - row[1] <= self.ttl:
+                value = row[0].decode("utf-8")
+                self._remember(key, value, row[1])
+                stats["hits"] += 1
+                return value
+
+        stats["misses"] += 1
+        return None
+
+    async def set(self, key: str, value: str) -> None:
+        if not value:
+            return
+        stored_at = time.time()
+        self._remember(key, value, stored_at)
+
+        if self.backend:
+            try:
+                await asyncio.to_thread(self.backend.set, key, value.encode("utf-8"), stored_at)
+            except Exception as e:
+                logger.warning(f"LLM output cache backend write failed: {e}")
+
+    def _remember(self, key: str, value: str, stored_at: float) -> None:
+        self._forget(key)
+        self._entries[key] = (value, stored_at)
+        self._chars += len(value)
+        while self._entries and (len(self._entries) > self.max_entries or self._chars > self.max_chars):
+            _, (evicted, _) = self._entries.popitem(last=False)
+            self._chars -= len(evicted)
+
+    def _forget(self, key: str) -> None:
+        if entry := self._entries.pop(key, None):
+            self._chars -= len(entry[0])
+
+    def stats(self) -> Dict[str, Any]:
+        nodes = {}
+        for node, counts in self._stats.items():
+            lookups = counts["hits"] + counts["misses"]
+            nodes[node] = {**counts, "hit_ratio": round(counts["hits"] / lookups, 3) if lookups else 0.0}
+        return {"entries": len(self._entries), "chars": self._chars, "nodes": nodes}
+
+llm_cache = LLMOutputCache.from_env()
@@ -1,4 +1,4 @@
-from pymongo import MongoClient
+from pymongo import MongoClient, UpdateOne
 from datetime import datetime
 from typing import Dict, Any, Optional
 import certifi
@@ -16,6 +16,11 @@ class MongoDBService:
         self.jobs = self.db.jobs
         self.reports = self.db.reports
 
+    def ensure_indexes(self) -> None:
+        """Index job_id so lookups and updates don't scan the collections."""
+        self.jobs.create_index("job_id", unique=True)
+        self.reports.create_index("job_id", unique=True)
+
     def create_job(self, job_id: str, inputs: Dict[str, Any]) -> None:
         """Create a new research job record."""
         self.jobs.insert_one({
@@ -44,21 +49,30 @@ class MongoDBService:
             {"$set": update_data}
         )
 
+    def bulk_update_jobs(self, updates: Dict[str, Dict[str, Any]]) -> None:
+        """Apply field updates to several jobs in one round trip."""
+        if not updates:
+            return
+        self.jobs.bulk_write(
+            [UpdateOne({"job_id": job_id}, {"$set": fields}) for job_id, fields in updates.items()],
+            ordered=False
+        )
+
     def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
         """Retrieve a job by ID."""
-        return self.jobs.find_one({"job_id": job_id})
+        return self.jobs.find_one({"job_id": job_id}, {"_id": 0})
 
     def store_report(self, job_id: str, report_data: Dict[str, Any]) -> None:
-        """Store the finalized research report."""
-        self.reports.insert_one({
+        """Store the finalized research report, replacing any earlier copy."""
+        self.reports.replace_one({"job_id": job_id}, {
             "job_id": job_id,
             "report_content": report_data.get("report", ""),
             "references": report_data.get("references", []),
             "sections": report_data.get("sections_completed", []),
             "analyst_queries": report_data.get("analyst_queries", {}),
             "created_at": datetime.utcnow()
-        })
+        }, upsert=True)
 
     def get_report(self, job_id: str) -> Optional[Dict[str, Any]]:
         """Retrieve a report by job ID."""
-        return self.reports.find_one({"job_id": job_id}) 
\ No newline at end of file
+        return self.reports.find_one({"job_id": job_id}, {"_id": 0}) 
\ No newline at end of file
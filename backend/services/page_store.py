@@ -0,0 +1,146 @@
+import asyncio
+import hashlib
+import logging
+import os
+import time
+import zlib
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from .kv_store import SQLiteKeyValueStore
+from ..utils.references import normalize_url
+
+logger = logging.getLogger(__name__)
+
+class PageStore:
+    """Content-addressed store for extracted page content.
+
+    URLs are keyed on their normalized form and point at a hash of the page
+    content, so identical pages reached through different URLs share one
+    compressed blob. A bounded in-process hot tier sits in front of the
+    optional SQLite tier, which is garbage-collected the same way: entries
+    past `max_age` are dropped and the oldest go first once there are more
+    than `max_entries`. A blob's age is that of the newest URL pointing at
+    it, so shared blobs live as long as any of their URLs.
+    """
+
+    def __init__(self, max_age: float = 86400, hot_entries: int = 256, db_path: str = None,
+                 max_entries: int = 10000, gc_interval: float = 600) -> None:
+        self.max_age = max_age
+        self.hot_entries = hot_entries
+        self.max_entries = max_entries
+        self.gc_interval = gc_interval
+        self._last_gc = 0.0
+        self._hot: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self.urls = None
+        self.blobs = None
+        if db_path:
+            self.urls = SQLiteKeyValueStore(db_path, "page_urls")
+            self.blobs = SQLiteKeyValueStore(db_path, "page_blobs")
+
+    @classmethod
+    def from_env(cls) -> "PageStore":
+        db_path = os.getenv("PAGE_STORE_DB")
+        try:
+            store = cls(
+                max_age=float(os.getenv("PAGE_STORE_MAX_AGE", "86400")),
+                hot_entries=int(os.getenv("PAGE_STORE_HOT_ENTRIES", "256")),
+                db_path=db_path,
+                max_entries=int(os.getenv("PAGE_STORE_MAX_ENTRIES", "10000"))
+            )
+            if db_path:
+                logger.info(f"Persistent page store enabled at {db_path}")
+                store.collect_garbage()
+            return store
+        except Exception as e:
+            logger.warning(f"Failed to open page store at {db_path}: {e}. Using memory only.")
+            return cls()
+
+    @staticmethod
+    def url_key(url: str) -> str:
+        return normalize_url(url)
+
+    @staticmethod
+    def content_hash(content: str) -> str:
+        return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+    async def get_many(self, urls: List[str]) -> Dict[str, str]:
+        """Return fresh stored content for whichever of `urls` are available."""
+        now = time.time()
+        found = {}
+        missing = []
+        for url in urls:
+            key = self.url_key(url)
+            if (entry := self._hot.get(key)) and now - entry[1] <= self.max_age:
+                self._hot.move_to_end(key)
+                found[url] = entry[0]
+            else:
+                missing.append(url)
+
+        if missing and self.urls:
+            try:
+                stored = await asyncio.to_thread(self._read_persistent, missing, now)
+            except Exception as e:
+                logger.warning(f"Page store read failed: {e}")
+                stored = {}
+            for url, (content, fetched_at) in stored.items():
+                self._remember(self.url_key(url), content, fetched_at)
+                found[url] = content
+
+        return found
+
+    async def put_many(self, contents: Dict[str, str]) -> None:
+        """Store freshly extracted content for each URL."""
+        now = time.time()
+        contents = {url: content for url, content in contents.items() if content}
+        for url, content in contents.items():
+            self._remember(self.url_key(url), content, now)
+
+        if contents and self.urls:
+            try:
+                await asyncio.to_thread(self._write_persistent, contents, now)
+            except Exception as e:
+                logger.warning(f"Page store write failed: {e}")
+
+        if self.urls and now - self._last_gc >= self.gc_interval:
+            try:
+                await asyncio.to_thread(self.collect_garbage)
+            except Exception as e:
+                logger.warning(f"Page store garbage collection failed: {e}")
+
+    def collect_garbage(self) -> None:
+        """Drop expired and excess URLs and blobs from the SQLite tier."""
+        self._last_gc = time.time()
+        removed = 0
+        for table in (self.urls, self.blobs):
+            removed += table.purge_older_than(self.max_age)
+            removed += table.trim(self.max_entries)
+        if removed:
+            logger.info(f"Page store garbage collection removed {removed} entries")
+
+    def _read_persistent(self, urls: List[str], now: float) -> Dict[str, Tuple[str, float]]:
+        stored = {}
+        for url in urls:
+            row = self.urls.get(self.url_key(url))
+            if not row or now - row[1] > self.max_age:
+                continue
+            if blob := self.blobs.get(row[0].decode()):
+                stored[url] = (zlib.decompress(blob[0]).decode("utf-8"), row[1])
+        return stored
+
+    def _write_persistent(self, contents: Dict[str, str], now: float) -> None:
+        for url, content in contents.items():
+            digest = self.content_hash(content)
+            if self.blobs.get(digest):
+                self.blobs.touch(digest, now)
+            else:
+                self.blobs.set(digest, zlib.compress(content.encode("utf-8")), now)
+            self.urls.set(self.url_key(url), digest.encode(), now)
+
+    def _remember(self, key: str, content: str, fetched_at: float) -> None:
+        self._hot[key] = (content, fetched_at)
+        self._hot.move_to_end(key)
+        while len(self._hot) > self.hot_entries:
+            self._hot.popitem(last=False)
+
+page_store = PageStore.from_env()
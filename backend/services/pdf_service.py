@@ -65,7 +65,7 @@ class PDFService:
             logger.error(error_msg)
             return False, error_msg
 
-    def generate_pdf_from_job(self, job_id: str, job_status: dict, mongodb=None) -> dict:
+    async def generate_pdf_from_job(self, job_id: str, job_status: dict, job_store=None) -> dict:
         """Generate a PDF from a job's report content."""
         try:
             # First try to get report from memory
@@ -75,29 +75,29 @@ class PDFService:
                 if isinstance(result, dict):
                     report_content = result.get('report')
 
-            # If not in memory and MongoDB is available, try to get from MongoDB
-            if not report_content and mongodb:
+            # If not in memory and a job store is available, try to get it from there
+            if not report_content and job_store:
                 try:
-                    report = mongodb.get_report(job_id)
+                    report = await job_store.get_report(job_id)
                     if report and isinstance(report, dict):
-                        report_content = report.get('report')
+                        report_content = report.get('report') or report.get('report_content')
                 except Exception as e:
-                    logger.warning(f"Failed to get report from MongoDB: {e}")
+                    logger.warning(f"Failed to get report from the job store: {e}")
 
             if not report_content:
                 raise HTTPException(status_code=404, detail="No report content available")
 
-            # Get company name from memory or MongoDB
+            # Get company name from memory or the job store
             company_name = None
             if job_id in job_status:
                 company_name = job_status[job_id].get('company')
-            if not company_name and mongodb:
+            if not company_name and job_store:
                 try:
-                    job = mongodb.get_job(job_id)
+                    job = await job_store.get_job(job_id)
                     if job and isinstance(job, dict):
-                        company_name = job.get('company')
+                        company_name = job.get('company') or (job.get('inputs') or {}).get('company')
                 except Exception as e:
-                    logger.warning(f"Failed to get company name from MongoDB: {e}")
+                    logger.warning(f"Failed to get company name from the job store: {e}")
 
             success, result = self.generate_pdf_stream(report_content, company_name)
             if success:
@@ -0,0 +1,70 @@
+import logging
+import re
+import time
+from typing import Dict, Any, Optional
+from urllib.parse import urlparse
+
+from .checkpoint_store import CheckpointStore
+from .search_cache import search_cache
+
+logger = logging.getLogger(__name__)
+
+# Nodes whose output can be carried over from an earlier job, with the
+# Tavily topic they search. The search cache's TTL for that topic
+# (SEARCH_CACHE_TTL, or SEARCH_CACHE_FINANCE_TTL for finance) decides how long the output
+# stays fresh. The news scanner is absent on purpose: news is always re-run.
+REUSABLE_NODES = {
+    "grounding": "general",
+    "financial_analyst": "finance",
+    "industry_analyst": "general",
+    "company_analyst": "general"
+}
+
+def company_key(company: str, company_url: str = None) -> str:
+    """Normalized company name plus bare domain, e.g. 'acme corp|acme.com'."""
+    name = re.sub(r"\s+", " ", (company or "").lower()).strip()
+    domain = ""
+    if company_url:
+        url = company_url if company_url.startswith(("http://", "https://")) else f"https://{company_url}"
+        domain = urlparse(url).netloc.lower().removeprefix("www.")
+    return f"{name}|{domain}"
+
+async def record_completed_job(store: CheckpointStore, company: str, company_url: str, job_id: str) -> None:
+    """Remember `job_id` as the latest completed research for this company."""
+    await store.save_pointer(f"company:{company_key(company, company_url)}",
+                             {"job_id": job_id, "completed_at": time.time()})
+
+async def plan_refresh(store: CheckpointStore, company: str, company_url: str = None) -> Optional[Dict[str, Any]]:
+    """Work out what a refresh run can take from the latest completed job for a company.
+
+    Returns None when there is no usable earlier job. Otherwise returns the
+    earlier job id, its age, the nodes whose checkpointed output is still
+    fresh, and the earlier briefings with their input fingerprints.
+    """
+    latest = await store.load_pointer(f"company:{company_key(company, company_url)}")
+    if not latest:
+        return None
+
+    previous_job_id = latest["job_id"]
+    age = time.time() - latest["completed_at"]
+    completed = await store.completed_nodes(previous_job_id, list(REUSABLE_NODES) + ["briefing"])
+    reuse_nodes = [
+        node for node, topic in REUSABLE_NODES.items()
+        if node in completed and age <= search_cache.ttl_for(topic)
+    ]
+
+    previous_briefings = {}
+    if "briefing" in completed and (briefing := await store.load_node(previous_job_id, "briefing")):
+        fingerprints = briefing.get("briefing_fingerprints") or {}
+        for category, content in (briefing.get("briefings") or {}).items():
+            if content and category in fingerprints:
+                previous_briefings[category] = {"content": content, "fingerprint": fingerprints[category]}
+
+    logger.info(f"Refreshing {company} from job {previous_job_id} ({age:.0f}s old): "
+                f"reusing {reuse_nodes or 'no nodes'}, {len(previous_briefings)} earlier briefings")
+    return {
+        "job_id": previous_job_id,
+        "age": age,
+        "reuse_nodes": reuse_nodes,
+        "previous_briefings": previous_briefings
+    }
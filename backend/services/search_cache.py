@@ -0,0 +1,130 @@
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import re
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Optional
+
+from .kv_store import SQLiteKeyValueStore
+
+logger = logging.getLogger(__name__)
+
+class SearchCache:
+    """Process-wide cache of Tavily search responses.
+
+    Entries are keyed on the normalized query plus the parameters that change
+    the result set, expire per topic, and are bounded with LRU eviction. An
+    optional persistent backend lets warm processes reuse earlier results.
+    """
+
+    def __init__(self, max_entries: int = 1024, ttls: Dict[str, float] = None,
+                 default_ttl: float = 86400, backend: SQLiteKeyValueStore = None) -> None:
+        self.max_entries = max_entries
+        self.ttls = ttls or {"news": 900}
+        self.default_ttl = default_ttl
+        self.backend = backend
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @classmethod
+    def from_env(cls) -> "SearchCache":
+        backend = None
+        if db_path := os.getenv("SEARCH_CACHE_DB"):
+            try:
+                backend = SQLiteKeyValueStore(db_path, "search_cache")
+                logger.info(f"Persistent search cache enabled at {db_path}")
+            except Exception as e:
+                logger.warning(f"Failed to open search cache at {db_path}: {e}. Using memory only.")
+
+        ttls = {"news": float(os.getenv("SEARCH_CACHE_NEWS_TTL", "900"))}
+        if finance_ttl := os.getenv("SEARCH_CACHE_FINANCE_TTL"):
+            ttls["finance"] = float(finance_ttl)
+
+        return cls(
+            max_entries=int(os.getenv("SEARCH_CACHE_MAX_ENTRIES", "1024")),
+            ttls=ttls,
+            default_ttl=float(os.getenv("SEARCH_CACHE_TTL", "86400")),
+            backend=backend
+        )
+
+    @staticmethod
+    def normalize_query(query: str) -> str:
+        query = query.lower().replace('"', '').replace("'", "")
+        return re.sub(r"\s+", " ", query).strip()
+
+    def make_key(self, query: str, search_params: Dict[str, Any]) -> str:
+        key_data = {
+            "query": self.normalize_query(query),
+            "topic": search_params.get("topic", "general"),
+            "search_depth": search_params.get("search_depth", "basic"),
+            "max_results": search_params.get("max_results", 5),
+            "include_raw_content": bool(search_params.get("include_raw_content", False))
+        }
+        return hashlib.sha256(json.dumps(key_data, sort_keys=True).encode()).hexdigest()
+
+    def ttl_for(self, topic: str) -> float:
+        return self.ttls.get(topic or "general", self.default_ttl)
+
+    async def get(self, query: str, search_params: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Return a cached response, or None if it is missing or expired."""
+        key = self.make_key(query, search_params)
+        ttl = self.ttl_for(search_params.get("topic"))
+        now = time.time()
+
+        if entry := self._entries.get(key):
+            result, stored_at = entry
+            if now - stored_at <= ttl:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return result
+            del self._entries[key]
+
+        if self.backend:
+            try:
+                row = await asyncio.to_thread(self.backend.get, key)
+            except Exception as e:
+                logger.warning(f"Search cache backend read failed: {e}")
+                row = None
+            if row and now - row[1] <= ttl:
+                result = json.loads(row[0])
+                self._remember(key, result, row[1])
+                self.hits += 1
+                return result
+
+        self.misses += 1
+        return None
+
+    async def set(self, query: str, search_params: Dict[str, Any], result: Dict[str, Any]) -> None:
+        key = self.make_key(query, search_params)
+        stored_at = time.time()
+        self._remember(key, result, stored_at)
+
+        if self.backend:
+            try:
+                await asyncio.to_thread(self.backend.set, key, json.dumps(result).encode(), stored_at)
+            except Exception as e:
+                logger.warning(f"Search cache backend write failed: {e}")
+
+    def _remember(self, key: str, result: Dict[str, Any], stored_at: float) -> None:
+        self._entries[key] = (result, stored_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": round(self.hits / lookups, 3) if lookups else 0.0
+        }
+
+search_cache = SearchCache.from_env()
@@ -1,64 +1,206 @@
 from fastapi import WebSocket
-from typing import Dict, Set
+from typing import Any, Callable, Deque, Dict, Set, Tuple
+from collections import OrderedDict, deque
 from datetime import datetime
+import asyncio
 import json
 import logging
 
+from .event_coalescer import EventCoalescer
+from ..utils.event_trace import event_tracer
+
 # Set up logging
 logger = logging.getLogger(__name__)
 
+# Latest-wins progress events: each one carries the full value so far, so an
+# older one may be dropped for a slow client. Content chunks such as
+# briefing_chunk are increments and are never dropped.
+COALESCIBLE_STATUSES = {"query_generating"}
+
+def is_coalescible(message: dict) -> bool:
+    if message.get("type") == "state_update":
+        return True
+    return (message.get("data") or {}).get("status") in COALESCIBLE_STATUSES
+
+class ConnectionWriter:
+    """Bounded outbound queue for one WebSocket, drained by its own writer task.
+
+    When the queue is full the oldest coalescible event is dropped; if every
+    queued event must be delivered the client is too slow and is disconnected.
+    """
+
+    def __init__(self, websocket: WebSocket, job_id: str, max_queue: int,
+                 metrics: Dict[str, Any], on_close: Callable[[WebSocket, str], None]):
+        self.websocket = websocket
+        self.job_id = job_id
+        self.max_queue = max_queue
+        self.metrics = metrics
+        self.on_close = on_close
+        self.queue: Deque[Tuple[str, bool]] = deque()
+        self.closed = False
+        self._ready = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+
+    def enqueue(self, message_str: str, coalescible: bool, force: bool = False) -> bool:
+        """Queue a message. Returns False if the client had to be disconnected."""
+        if self.closed:
+            return False
+        if not force and len(self.queue) >= self.max_queue:
+            for index, (_, droppable) in enumerate(self.queue):
+                if droppable:
+                    del self.queue[index]
+                    self.metrics["dropped"] += 1
+                    break
+            else:
+                logger.warning(f"Disconnecting slow WebSocket client for job {self.job_id} "
+                               f"({len(self.queue)} messages queued)")
+                self.metrics["slow_disconnects"] += 1
+                self.close(code=1013)
+                return False
+
+        self.queue.append((message_str, coalescible))
+        self.metrics["max_queue_depth"] = max(self.metrics["max_queue_depth"], len(self.queue))
+        self._ready.set()
+        return True
+
+    async def _run(self):
+        try:
+            while True:
+                await self._ready.wait()
+                self._ready.clear()
+                while self.queue:
+                    message_str, _ = self.queue.popleft()
+                    await self.websocket.send_text(message_str)
+                    self.metrics["sent"] += 1
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            logger.error(f"Error sending message to client: {str(e)}")
+            self.closed = True
+            self.on_close(self.websocket, self.job_id)
+
+    def close(self, code: int = None):
+        if self.closed:
+            return
+        self.closed = True
+        self._task.cancel()
+        self.on_close(self.websocket, self.job_id)
+        if code is not None:
+            asyncio.create_task(self._close_socket(code))
+
+    async def _close_socket(self, code: int):
+        try:
+            await self.websocket.close(code=code)
+        except Exception:
+            pass
+
 class WebSocketManager:
-    def __init__(self):
+    def __init__(self, max_buffered_events: int = 500, max_buffered_jobs: int = 200, max_send_queue: int = 256,
+                 coalesce_window: float = 0.25):
         # Store active connections for each job
         self.active_connections: Dict[str, Set[WebSocket]] = {}
+        self.writers: Dict[WebSocket, ConnectionWriter] = {}
+        self.max_send_queue = max_send_queue
+        self.job_metrics: "OrderedDict[str, Dict[str, int]]" = OrderedDict()
+
+        # Recent events per job, replayed to clients that connect after the job started
+        self.max_buffered_events = max_buffered_events
+        self.max_buffered_jobs = max_buffered_jobs
+        self.event_buffers: "OrderedDict[str, Deque[Tuple[str, bool]]]" = OrderedDict()
+
+        # Merges partial queries, text chunks and per-document updates before they are sent
+        self.coalescer = EventCoalescer(self.broadcast_to_job, window=coalesce_window)
         
     async def connect(self, websocket: WebSocket, job_id: str):
-        """Connect a new client to a specific job."""
+        """Connect a new client to a specific job, replaying the events it missed."""
+        writer = ConnectionWriter(websocket, job_id, self.max_send_queue, self._metrics_for(job_id), self.disconnect)
+        self.writers[websocket] = writer
+
+        # The backlog is queued and the socket registered without yielding, so no event can slip in between
+        backlog = self.event_buffers.get(job_id, ())
+        for message_str, coalescible in backlog:
+            writer.enqueue(message_str, coalescible, force=True)
         if job_id not in self.active_connections:
             self.active_connections[job_id] = set()
         self.active_connections[job_id].add(websocket)
-        logger.info(f"New WebSocket connection for job {job_id}")
-        logger.info(f"Total connections for job: {len(self.active_connections[job_id])}")
-        logger.info(f"All active jobs: {list(self.active_connections.keys())}")
+        event_tracer.trace("ws_connect", logger, job_id=job_id, replayed=len(backlog),
+                           connections=len(self.active_connections[job_id]),
+                           active_jobs=len(self.active_connections))
         
     def disconnect(self, websocket: WebSocket, job_id: str):
         """Disconnect a client from a specific job."""
+        if writer := self.writers.pop(websocket, None):
+            writer.close()
         if job_id in self.active_connections:
             self.active_connections[job_id].discard(websocket)
             if not self.active_connections[job_id]:
                 del self.active_connections[job_id]
-            logger.info(f"WebSocket disconnected for job {job_id}")
-            logger.info(f"Remaining connections for job: {len(self.active_connections.get(job_id, set()))}")
-            logger.info(f"Remaining active jobs: {list(self.active_connections.keys())}")
+            event_tracer.trace("ws_disconnect", logger, job_id=job_id,
+                               connections=len(self.active_connections.get(job_id, set())),
+                               active_jobs=len(self.active_connections))
                 
     async def broadcast_to_job(self, job_id: str, message: dict):
         """Send a message to all clients connected to a specific job."""
-        if job_id not in self.active_connections:
-            logger.warning(f"No active connections for job {job_id}")
-            return
-            
         # Add timestamp to message
         message["timestamp"] = datetime.now().isoformat()
         
         # Convert message to JSON string
         message_str = json.dumps(message)
-        logger.info(f"Message content: {message_str}")
-        
-        # Send to all connected clients for this job
-        success_count = 0
-        disconnected = set()
-        for connection in self.active_connections[job_id]:
-            try:
-                await connection.send_text(message_str)
-                success_count += 1
-            except Exception as e:
-                logger.error(f"Error sending message to client: {str(e)}", exc_info=True)
-                disconnected.add(connection)
-        
-        # Clean up disconnected clients
-        for connection in disconnected:
-            self.disconnect(connection, job_id)
-            
+        data = message.get("data") or {}
+        event_tracer.trace(data.get("status") or message.get("type", "message"), logger,
+                           job_id=job_id, message=data.get("message"), error=data.get("error"),
+                           result=data.get("result"), size=len(message_str))
+
+        coalescible = is_coalescible(message)
+        self._buffer_event(job_id, message_str, coalescible)
+        if job_id not in self.active_connections:
+            logger.debug(f"No active connections for job {job_id}, event buffered")
+            return
+
+        # Hand the message to each connection's writer; nodes never wait on client I/O
+        for connection in list(self.active_connections.get(job_id, ())):
+            if writer := self.writers.get(connection):
+                writer.enqueue(message_str, coalescible)
+
+    def _buffer_event(self, job_id: str, message_str: str, coalescible: bool):
+        if job_id not in self.event_buffers:
+            self.event_buffers[job_id] = deque(maxlen=self.max_buffered_events)
+        self.event_buffers.move_to_end(job_id)
+        self.event_buffers[job_id].append((message_str, coalescible))
+        while len(self.event_buffers) > self.max_buffered_jobs:
+            evicted_job, _ = self.event_buffers.popitem(last=False)
+            if evicted_job not in self.active_connections:
+                self.job_metrics.pop(evicted_job, None)
+
+    def clear_events(self, job_id: str):
+        """Forget the buffered events of a job, e.g. before it is restarted."""
+        self.event_buffers.pop(job_id, None)
+
+    def _metrics_for(self, job_id: str) -> Dict[str, int]:
+        if job_id not in self.job_metrics:
+            self.job_metrics[job_id] = {"sent": 0, "dropped": 0, "slow_disconnects": 0, "max_queue_depth": 0}
+        self.job_metrics.move_to_end(job_id)
+        while len(self.job_metrics) > self.max_buffered_jobs:
+            self.job_metrics.popitem(last=False)
+        return self.job_metrics[job_id]
+
+    def stats(self) -> Dict[str, Any]:
+        """Connection counts plus send-queue depth and drop metrics per job."""
+        jobs = {}
+        for job_id, metrics in self.job_metrics.items():
+            writers = [self.writers[ws] for ws in self.active_connections.get(job_id, ()) if ws in self.writers]
+            jobs[job_id] = {
+                **metrics,
+                "connections": len(writers),
+                "queue_depth": sum(len(writer.queue) for writer in writers)
+            }
+        return {
+            "connections": len(self.writers),
+            "buffered_jobs": len(self.event_buffers),
+            "coalescing": self.coalescer.stats(),
+            "jobs": jobs
+        }
+
     async def send_status_update(self, job_id: str, status: str, message: str = None, error: str = None, result: dict = None):
         """Helper method to send formatted status updates."""
         update = {
@@ -71,4 +213,4 @@ class WebSocketManager:
             }
         }
         #logger.info(f"Status: {status}, Message: {message}")
-        await self.broadcast_to_job(job_id, update)
\ No newline at end of file
+        await self.coalescer.submit(job_id, update)
\ No newline at end of file
@@ -0,0 +1,84 @@
+import json
+import logging
+import os
+import random
+from typing import Any, Dict
+
+logger = logging.getLogger(__name__)
+
+class EventTracer:
+    """Structured, sampled logging of pipeline events.
+
+    Each event type has a verbosity:
+      "off"     - not logged
+      "summary" - scalars (truncated) plus the size of any list or dict
+      "full"    - every field serialized as JSON, truncated to `max_payload` characters
+    Events below WARNING are additionally sampled at `sample_rate`.
+    """
+
+    VERBOSITY_LEVELS = ("off", "summary", "full")
+
+    # High-frequency streaming events stay quiet unless asked for
+    DEFAULT_VERBOSITY = {
+        "query_generating": "off",
+        "briefing_chunk": "off",
+        "report_chunk": "off"
+    }
+
+    def __init__(self, default_verbosity: str = "summary", verbosity: Dict[str, str] = None,
+                 sample_rate: float = 1.0, max_payload: int = 200) -> None:
+        self.default_verbosity = default_verbosity
+        self.verbosity = {**self.DEFAULT_VERBOSITY, **(verbosity or {})}
+        self.sample_rate = sample_rate
+        self.max_payload = max_payload
+
+    @classmethod
+    def from_env(cls) -> "EventTracer":
+        # EVENT_TRACE_TYPES="report_chunk=full,document_kept=off"
+        verbosity = {}
+        for item in os.getenv("EVENT_TRACE_TYPES", "").split(","):
+            event_type, _, level = item.partition("=")
+            if event_type.strip() and level.strip() in cls.VERBOSITY_LEVELS:
+                verbosity[event_type.strip()] = level.strip()
+        return cls(
+            default_verbosity=os.getenv("EVENT_TRACE_VERBOSITY", "summary"),
+            verbosity=verbosity,
+            sample_rate=float(os.getenv("EVENT_TRACE_SAMPLE_RATE", "1.0")),
+            max_payload=int(os.getenv("EVENT_TRACE_MAX_PAYLOAD", "200"))
+        )
+
+    def verbosity_for(self, event_type: str) -> str:
+        return self.verbosity.get(event_type, self.default_verbosity)
+
+    def enabled(self, event_type: str, log: logging.Logger = logger, level: int = logging.INFO) -> bool:
+        if not log.isEnabledFor(level) or self.verbosity_for(event_type) == "off":
+            return False
+        return level >= logging.WARNING or self.sample_rate >= 1 or random.random() < self.sample_rate
+
+    def trace(self, event_type: str, log: logging.Logger = logger, level: int = logging.INFO, **fields: Any) -> None:
+        """Log one event as `event=<type> key=value ...`."""
+        if not self.enabled(event_type, log, level):
+            return
+        full = self.verbosity_for(event_type) == "full"
+        parts = [f"event={event_type}"]
+        for key, value in fields.items():
+            if value is None:
+                continue
+            parts.append(f"{key}={self._format(value, full)}")
+        log.log(level, " ".join(parts))
+
+    def _format(self, value: Any, full: bool) -> str:
+        if not full and isinstance(value, (list, tuple, set, dict)):
+            return f"<{len(value)} items>"
+        if isinstance(value, str):
+            text = value
+        else:
+            try:
+                text = json.dumps(value, default=str)
+            except (TypeError, ValueError):
+                text = repr(value)
+        if self.max_payload and len(text) > self.max_payload:
+            text = f"{text[:self.max_payload]}...(+{len(text) - self.max_payload} chars)"
+        return json.dumps(text) if " " in text and isinstance(value, str) else text
+
+event_tracer = EventTracer.from_env()
@@ -0,0 +1,18 @@
+import hashlib
+import json
+from typing import Any, Dict
+
+from .references import normalize_url
+
+def fingerprint(*parts: Any) -> str:
+    """Stable hash of JSON-serializable parts."""
+    encoded = json.dumps(parts, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+def documents_fingerprint(docs: Dict[str, Dict[str, Any]]) -> str:
+    """Hash of a set of documents: their normalized URLs and the text a briefing would read."""
+    entries = []
+    for url, doc in docs.items():
+        text = doc.get('raw_content') or doc.get('content') or ''
+        entries.append((normalize_url(doc.get('url') or url), hashlib.sha256(text.encode("utf-8")).hexdigest()))
+    return fingerprint(sorted(entries))
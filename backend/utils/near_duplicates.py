@@ -0,0 +1,81 @@
+import hashlib
+import random
+import re
+from typing import Dict, Hashable, List, Set, Tuple
+
+MERSENNE_PRIME = (1 << 61) - 1
+
+class MinHasher:
+    """MinHash signatures over word shingles, with LSH banding for candidate pairs.
+
+    Two texts whose shingle sets have Jaccard similarity J share a band with
+    probability 1 - (1 - J^rows)^bands, so with the defaults (16 bands of 4
+    rows) pairs above ~0.5 similarity are almost always compared and pairs
+    well below it rarely are. Candidates are then confirmed against
+    `threshold` using the signature estimate.
+    """
+
+    def __init__(self, num_perm: int = 64, bands: int = 16, shingle_size: int = 4,
+                 threshold: float = 0.7, seed: int = 1) -> None:
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        self.threshold = threshold
+        rng = random.Random(seed)
+        self._perms = [(rng.randrange(1, MERSENNE_PRIME), rng.randrange(0, MERSENNE_PRIME))
+                       for _ in range(num_perm)]
+
+    def shingles(self, text: str) -> Set[int]:
+        words = re.findall(r"\w+", (text or "").lower())
+        if len(words) < self.shingle_size:
+            grams = [" ".join(words)] if words else []
+        else:
+            grams = (" ".join(words[i:i + self.shingle_size]) for i in range(len(words) - self.shingle_size + 1))
+        return {int.from_bytes(hashlib.blake2b(g.encode("utf-8"), digest_size=8).digest(), "big") for g in grams}
+
+    def signature(self, text: str) -> Tuple[int, ...]:
+        shingles = self.shingles(text)
+        if not shingles:
+            return ()
+        return tuple(min((a * s + b) % MERSENNE_PRIME for s in shingles) for a, b in self._perms)
+
+    def similarity(self, a: Tuple[int, ...], b: Tuple[int, ...]) -> float:
+        if not a or not b:
+            return 0.0
+        return sum(x == y for x, y in zip(a, b)) / self.num_perm
+
+    def clusters(self, texts: Dict[Hashable, str]) -> List[List[Hashable]]:
+        """Group keys whose texts are near-duplicates. Only groups of two or more are returned."""
+        signatures = {key: self.signature(text) for key, text in texts.items()}
+        buckets: Dict[Tuple[int, Tuple[int, ...]], List[Hashable]] = {}
+        for key, sig in signatures.items():
+            if not sig:
+                continue
+            for band in range(self.bands):
+                buckets.setdefault((band, sig[band * self.rows:(band + 1) * self.rows]), []).append(key)
+
+        parent = {key: key for key in signatures}
+
+        def find(key):
+            while parent[key] != key:
+                parent[key] = parent[parent[key]]
+                key = parent[key]
+            return key
+
+        checked = set()
+        for members in buckets.values():
+            for i, a in enumerate(members):
+                for b in members[i + 1:]:
+                    if (a, b) in checked:
+                        continue
+                    checked.add((a, b))
+                    if find(a) != find(b) and self.similarity(signatures[a], signatures[b]) >= self.threshold:
+                        parent[find(b)] = find(a)
+
+        groups: Dict[Hashable, List[Hashable]] = {}
+        for key in signatures:
+            groups.setdefault(find(key), []).append(key)
+        return [members for members in groups.values() if len(members) > 1]
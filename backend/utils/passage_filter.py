@@ -0,0 +1,125 @@
+import math
+import re
+from collections import Counter
+from typing import Callable, Dict, Iterable, List, Tuple
+
+from .prompt_packing import split_passages
+
+# Lines that are site chrome rather than content
+BOILERPLATE_PATTERNS = re.compile(
+    r"(cookie|privacy policy|terms of (use|service)|all rights reserved|subscribe|newsletter|sign (in|up)|"
+    r"log ?in|skip to (main )?content|share (on|this)|follow us|advertisement|accept all|"
+    r"javascript|enable cookies|back to top|related (articles|posts|stories)|read more)",
+    re.IGNORECASE
+)
+MARKDOWN_LINK = re.compile(r"!?\[([^\]]*)\]\([^)]*\)")
+
+# Terms describing what each briefing category is about, added to the company name
+CATEGORY_QUERIES = {
+    "company": "company products services platform business model customers founders leadership "
+               "headquarters employees technology mission offering",
+    "industry": "industry market competitors competition market share trends position landscape "
+                "segment growth leader",
+    "financial": "revenue funding raised series valuation investors profit earnings financial "
+                 "million billion acquisition ipo round",
+    "news": "announced launch partnership acquisition recently today new deal expands appoints "
+            "agreement"
+}
+
+STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or that the this to was were "
+    "will with which who their they our we you your".split()
+)
+
+def tokenize(text: str) -> List[str]:
+    return [t for t in re.findall(r"[a-z0-9]+", text.lower()) if t not in STOPWORDS and len(t) > 1]
+
+def is_boilerplate(line: str) -> bool:
+    text = MARKDOWN_LINK.sub(r"\1", line).strip(" \t|*#>-•")
+    if not text:
+        return True
+    words = text.split()
+    # Short lines matching chrome phrases, and lines made mostly of links (menus, footers)
+    if len(words) <= 12 and BOILERPLATE_PATTERNS.search(text):
+        return True
+    links = MARKDOWN_LINK.findall(line)
+    return bool(links) and len(" ".join(links)) >= 0.6 * len(text)
+
+def clean_content(text: str) -> str:
+    """Drop navigation, cookie banners and link lists from scraped page text."""
+    lines = [line for line in (text or "").splitlines() if not line.strip() or not is_boilerplate(line)]
+    cleaned = MARKDOWN_LINK.sub(r"\1", "\n".join(lines))
+    return re.sub(r"\n{3,}", "\n\n", cleaned).strip()
+
+class PassageIndex:
+    """BM25 index over the passages of a set of documents, such as one briefing category.
+
+    Documents are cleaned of boilerplate and split into passages once;
+    `scorer` then ranks passages against a query using corpus statistics
+    from the indexed documents, so terms common to all of them count for little.
+    """
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75) -> None:
+        self.k1 = k1
+        self.b = b
+        self.passages: List[str] = []
+        self.lengths: List[int] = []
+        self.postings: Dict[str, List[Tuple[int, int]]] = {}
+        self.documents: Dict[str, List[int]] = {}
+        self._ids: Dict[str, int] = {}
+
+    @classmethod
+    def from_documents(cls, documents: Iterable[Tuple[str, str]]) -> "PassageIndex":
+        """Build an index from (key, text) pairs."""
+        index = cls()
+        for key, text in documents:
+            index.add_document(key, text)
+        return index
+
+    def add_document(self, key: str, text: str) -> None:
+        if key in self.documents:
+            return
+        ids = []
+        for passage in split_passages(clean_content(text)):
+            if passage in self._ids:
+                ids.append(self._ids[passage])
+                continue
+            passage_id = self._ids[passage] = len(self.passages)
+            terms = tokenize(passage)
+            self.passages.append(passage)
+            self.lengths.append(len(terms))
+            for term, tf in Counter(terms).items():
+                self.postings.setdefault(term, []).append((passage_id, tf))
+            ids.append(passage_id)
+        self.documents[key] = ids
+
+    def passages_for(self, key: str) -> List[str]:
+        return [self.passages[i] for i in self.documents.get(key, [])]
+
+    def scores(self, query: str) -> Dict[int, float]:
+        """BM25 score of every passage containing at least one query term."""
+        n = len(self.passages)
+        if not n:
+            return {}
+        avg_length = sum(self.lengths) / n or 1
+        scores: Dict[int, float] = {}
+        for term in set(tokenize(query)):
+            postings = self.postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (n - len(postings) + 0.5) / (len(postings) + 0.5))
+            for passage_id, tf in postings:
+                norm = self.k1 * (1 - self.b + self.b * self.lengths[passage_id] / avg_length)
+                scores[passage_id] = scores.get(passage_id, 0.0) + idf * tf * (self.k1 + 1) / (tf + norm)
+        return scores
+
+    def scorer(self, query: str) -> Callable[[str], float]:
+        """Passage scorer for `pack_documents`, normalized to [0, 1] by the best match."""
+        scores = self.scores(query)
+        best = max(scores.values(), default=0.0) or 1.0
+        by_text = {self.passages[i]: score / best for i, score in scores.items()}
+        return lambda passage: by_text.get(passage, 0.0)
+
+def category_query(category: str, company: str, industry: str = "") -> str:
+    query = f"{company} {CATEGORY_QUERIES.get(category, '')}"
+    return f"{query} {industry}" if category == "industry" else query
@@ -0,0 +1,145 @@
+import hashlib
+import os
+import re
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+# Rough characters-per-token ratio for English text with Granite-style tokenizers
+CHARS_PER_TOKEN = 4
+
+# Prompt token budget for the documents in each briefing category
+DEFAULT_TOKEN_BUDGETS = {
+    "company": 10000,
+    "industry": 8000,
+    "financial": 8000,
+    "news": 8000
+}
+DEFAULT_TOKEN_BUDGET = 8000
+# Most passages kept for one briefing, whatever the budget
+DEFAULT_MAX_PASSAGES = 60
+
+def estimate_tokens(text: str) -> int:
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+def token_budget(category: str) -> int:
+    """Budget for `category`, overridable with BRIEFING_TOKEN_BUDGET_<CATEGORY> or BRIEFING_TOKEN_BUDGET."""
+    if value := os.getenv(f"BRIEFING_TOKEN_BUDGET_{category.upper()}"):
+        return int(value)
+    if value := os.getenv("BRIEFING_TOKEN_BUDGET"):
+        return int(value)
+    return DEFAULT_TOKEN_BUDGETS.get(category, DEFAULT_TOKEN_BUDGET)
+
+def passage_limit() -> int:
+    return int(os.getenv("BRIEFING_MAX_PASSAGES", str(DEFAULT_MAX_PASSAGES)))
+
+def split_passages(text: str, target_chars: int = 800) -> List[str]:
+    """Split text into paragraphs, breaking paragraphs longer than `target_chars` on sentence boundaries."""
+    passages = []
+    for block in re.split(r"\n\s*\n", text or ""):
+        block = block.strip()
+        if not block:
+            continue
+        if len(block) <= target_chars:
+            passages.append(block)
+            continue
+        current = ""
+        for sentence in re.split(r"(?<=[.!?])\s+", block):
+            if current and len(current) + len(sentence) + 1 > target_chars:
+                passages.append(current)
+                current = ""
+            current = f"{current} {sentence}" if current else sentence
+            # Text without sentence breaks is cut rather than kept whole
+            while len(current) > target_chars * 2:
+                passages.append(current[:target_chars])
+                current = current[target_chars:]
+        if current:
+            passages.append(current)
+    return passages
+
+def passage_key(passage: str) -> str:
+    """Hash of the passage with case, punctuation and whitespace removed."""
+    normalized = re.sub(r"[\W_]+", " ", passage.lower()).strip()
+    return hashlib.sha1(normalized.encode("utf-8")).hexdigest()
+
+def term_scorer(terms: List[str]) -> Callable[[str], float]:
+    """Score a passage by how often the given terms occur in it, normalized by length."""
+    patterns = [re.compile(rf"\b{re.escape(term.lower())}\b") for term in terms if term and term.strip()]
+
+    def score(passage: str) -> float:
+        if not patterns:
+            return 0.0
+        text = passage.lower()
+        hits = sum(len(pattern.findall(text)) for pattern in patterns)
+        return min(1.0, hits * 200 / max(len(text), 200))
+
+    return score
+
+def pack_documents(
+    docs: List[Tuple[str, Union[str, List[str]], float]],
+    budget_tokens: int,
+    max_doc_tokens: int = None,
+    scorer: Optional[Callable[[str], float]] = None,
+    max_passages: int = None
+) -> Tuple[List[str], Dict[str, Any]]:
+    """Fit the most valuable passages of `docs` into `budget_tokens`.
+
+    `docs` is a list of (title, content, score) with score in [0, 1], where
+    content is either text or a list of passages already split from it. Each
+    document is split into passages whose token counts are estimated once;
+    a passage is worth its document's score plus its own `scorer` score,
+    slightly discounted by its position in the document. Passages are taken
+    greedily by value, skipping any already taken from another document,
+    capping each document at `max_doc_tokens` and the total at `max_passages`.
+    Returns one "Title: ...\\n\\nContent: ..." entry per document that made it
+    in, in the order given, with its passages in their original order, plus
+    stats.
+    """
+    scorer = scorer or (lambda passage: 0.0)
+    candidates = []
+    doc_headers = []
+    for doc_index, (title, content, doc_score) in enumerate(docs):
+        header = f"Title: {title}\n\nContent: "
+        doc_headers.append((header, estimate_tokens(header)))
+        passages = content if isinstance(content, list) else split_passages(content)
+        for position, passage in enumerate(passages):
+            value = (doc_score + scorer(passage)) / (1 + 0.05 * position)
+            candidates.append((value, doc_index, position, passage, estimate_tokens(passage)))
+
+    candidates.sort(key=lambda c: (-c[0], c[1], c[2]))
+
+    selected: Dict[int, List[Tuple[int, str]]] = {}
+    doc_tokens: Dict[int, int] = {}
+    seen = set()
+    used = 0
+    duplicates = 0
+    for _, doc_index, position, passage, tokens in candidates:
+        if max_passages and len(seen) >= max_passages:
+            break
+        key = passage_key(passage)
+        if key in seen:
+            duplicates += 1
+            continue
+        cost = tokens + (0 if doc_index in selected else doc_headers[doc_index][1])
+        if used + cost > budget_tokens:
+            continue
+        if max_doc_tokens and doc_tokens.get(doc_index, 0) + tokens > max_doc_tokens:
+            continue
+        seen.add(key)
+        selected.setdefault(doc_index, []).append((position, passage))
+        doc_tokens[doc_index] = doc_tokens.get(doc_index, 0) + tokens
+        used += cost
+
+    entries = []
+    for doc_index in sorted(selected):
+        passages = [passage for _, passage in sorted(selected[doc_index])]
+        entries.append(doc_headers[doc_index][0] + "\n\n".join(passages))
+
+    stats = {
+        "documents": len(entries),
+        "documents_dropped": len(docs) - len(entries),
+        "passages": sum(len(p) for p in selected.values()),
+        "passages_total": len(candidates),
+        "duplicates": duplicates,
+        "tokens": used,
+        "budget": budget_tokens
+    }
+    return entries, stats
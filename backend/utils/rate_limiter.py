@@ -0,0 +1,48 @@
+import asyncio
+import logging
+import os
+import time
+
+logger = logging.getLogger(__name__)
+
+class RateLimiter:
+    """Async token bucket that limits how often callers may hit a provider.
+
+    The bucket counts requests, not model tokens: each `acquire` pays for
+    starting one call, however much text it generates. Streaming callers
+    acquire before opening a stream and do not hold anything while reading it.
+    """
+
+    def __init__(self, rate: float, burst: int = None) -> None:
+        self.rate = rate  # Requests per second, <= 0 disables throttling
+        self.capacity = float(burst or max(1, int(rate)))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, cost: float = 1.0) -> float:
+        """Wait until `cost` tokens are available and return the time spent waiting."""
+        if self.rate <= 0:
+            return 0.0
+
+        started = time.monotonic()
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= cost:
+                    self._tokens -= cost
+                    break
+                await asyncio.sleep((cost - self._tokens) / self.rate)
+
+        waited = time.monotonic() - started
+        if waited > 0.01:
+            logger.debug(f"Rate limiter delayed request by {waited:.2f}s")
+        return waited
+
+# Shared request-rate budget for all watsonx.ai inference calls made by this process
+watsonx_rate_limiter = RateLimiter(
+    rate=float(os.getenv("WATSONX_REQUESTS_PER_SECOND", "2")),
+    burst=int(os.getenv("WATSONX_REQUEST_BURST", "2"))
+)
@@ -3,6 +3,8 @@ import re
 from urllib.parse import urlparse
 from typing import Dict, Any, List, Tuple, Optional
 
+from .event_trace import event_tracer
+
 logger = logging.getLogger(__name__)
 
 def extract_domain_name(url: str) -> str:
@@ -84,7 +86,7 @@ def clean_title(title: str) -> str:
     
     # Log if we made changes to the title
     if title != original_title:
-        logger.info(f"Cleaned title from '{original_title}' to '{title}'")
+        logger.debug(f"Cleaned title from '{original_title}' to '{title}'")
     
     return title
 
@@ -144,7 +146,7 @@ def process_references_from_search_results(state: Dict[str, Any]) -> Tuple[List[
                         # Fallback to raw score if available
                         score = float(doc.get('score', 0))
                     
-                    logger.info(f"Found reference in {data_type}: URL={url}, Score={score:.4f}")
+                    logger.debug(f"Found reference in {data_type}: URL={url}, Score={score:.4f}")
                     all_top_references.append((url, score))
                 except (KeyError, ValueError, TypeError) as e:
                     logger.warning(f"Error processing score for {url} in {data_type}: {e}")
@@ -155,10 +157,9 @@ def process_references_from_search_results(state: Dict[str, Any]) -> Tuple[List[
     # Sort references by score in descending order
     all_top_references.sort(key=lambda x: float(x[1]), reverse=True)
     
-    # Log top 20 references before deduplication to verify sorting
-    logger.info("Top 20 references by score before deduplication:")
-    for i, (url, score) in enumerate(all_top_references[:20]):
-        logger.info(f"{i+1}. Score: {score:.4f} - URL: {url}")
+    # Trace top 20 references before deduplication to verify sorting
+    event_tracer.trace("references_ranked", logger, stage="before_dedup",
+                       top=[f"{score:.4f} {url}" for url, score in all_top_references[:20]])
     
     # Use a set to store unique URLs, keeping only the highest scored version of each URL
     seen_urls = set()
@@ -169,7 +170,7 @@ def process_references_from_search_results(state: Dict[str, Any]) -> Tuple[List[
     for url, score in all_top_references:
         # Skip if URL is not valid
         if not url or not url.startswith(('http://', 'https://')):
-            logger.info(f"Skipping invalid URL: {url}")
+            logger.debug(f"Skipping invalid URL: {url}")
             continue
 
         # Normalize URL
@@ -198,12 +199,12 @@ def process_references_from_search_results(state: Dict[str, Any]) -> Tuple[List[
                                 title = clean_title(title)
                                 if title and title.strip() and title != url:
                                     reference_titles[normalized_url] = title
-                                    logger.info(f"Found title for URL {url}: '{title}'")
+                                    logger.debug(f"Found title for URL {url}: '{title}'")
                                     break
             
             # If no title was found, log it
             if not title:
-                logger.info(f"No valid title found for URL {url}")
+                logger.debug(f"No valid title found for URL {url}")
             
             # Extract a better website name from the domain
             website_name = extract_website_name_from_domain(domain)
@@ -216,26 +217,22 @@ def process_references_from_search_results(state: Dict[str, Any]) -> Tuple[List[
                 'url': normalized_url,
                 'score': score
             }
-            logger.info(f"Stored reference info for {normalized_url} with score {score:.4f}")
+            logger.debug(f"Stored reference info for {normalized_url} with score {score:.4f}")
     
     # Sort unique references by score again to ensure proper ordering
     unique_references.sort(key=lambda x: float(x[1]), reverse=True)
     
     # Log unique references by score to verify sorting
     logger.info(f"Found {len(unique_references)} unique references after deduplication")
-    logger.info("Unique references by score (sorted):")
-    for i, (url, score) in enumerate(unique_references):
-        logger.info(f"{i+1}. Score: {score:.4f} - URL: {url}")
+    event_tracer.trace("references_ranked", logger, stage="after_dedup",
+                       top=[f"{score:.4f} {url}" for url, score in unique_references])
     
     # Take exactly 10 unique references (or all if less than 10)
     top_references = unique_references[:10]
     top_reference_urls = [url for url, _ in top_references]
     
-    # Log final top 10 references
-    logger.info(f"Final top {len(top_reference_urls)} references selected:")
-    for i, url in enumerate(top_reference_urls):
-        score = next((s for u, s in unique_references if u == url), 0)
-        logger.info(f"{i+1}. Score: {score:.4f} - URL: {url}")
+    # Trace final top 10 references
+    event_tracer.trace("references_selected", logger, count=len(top_reference_urls), urls=top_reference_urls)
     
     return top_reference_urls, reference_titles, reference_info
 
@@ -317,19 +314,19 @@ def format_references_section(references: List[str], reference_info: Dict[str, D
         # If title is not in reference_info, try to get it from reference_titles
         if not title or title.strip() == "":
             title = reference_titles.get(ref, '')
-            logger.info(f"Using title from reference_titles for {ref}: '{title}'")
+            logger.debug(f"Using title from reference_titles for {ref}: '{title}'")
         
         domain = info.get('domain', '')
         
         # If we don't have a title, use the URL
         if not title or title.strip() == "" or title == ref:
             title = ref
-            logger.info(f"No title found for {ref}, using URL as title")
+            logger.debug(f"No title found for {ref}, using URL as title")
         
         # If we don't have a website name, extract it from the URL
         if not website or website.strip() == "":
             website = extract_domain_name(ref)
-            logger.info(f"No website name found for {ref}, extracted: {website}")
+            logger.debug(f"No website name found for {ref}, extracted: {website}")
         
         # Create a reference entry with all information
         entry = {
@@ -339,7 +336,7 @@ def format_references_section(references: List[str], reference_info: Dict[str, D
             'domain': domain,
             'score': score
         }
-        logger.info(f"Created reference entry: {entry}")
+        logger.debug(f"Created reference entry: {entry}")
         reference_entries.append(entry)
     
     # Keep references in the same order they were provided (which should be by score)
@@ -351,7 +348,7 @@ def format_references_section(references: List[str], reference_info: Dict[str, D
     for entry in reference_entries:
         reference_line = format_reference_for_markdown(entry)
         reference_lines.append(reference_line)
-        logger.info(f"Added reference: {reference_line}")
+        logger.debug(f"Added reference: {reference_line}")
     
     reference_text = "\n".join(reference_lines)
     logger.info(f"Completed references section with {len(reference_entries)} entries")
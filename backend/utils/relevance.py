@@ -0,0 +1,240 @@
+import logging
+import os
+import re
+import time
+from array import array
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+# (data_field, url, doc) as flattened by the curator
+Entry = Tuple[str, str, Dict[str, Any]]
+
+# Source reputation in [0, 1]; unlisted domains score DEFAULT_REPUTATION
+DOMAIN_REPUTATION = {
+    "reuters.com": 1.0,
+    "bloomberg.com": 1.0,
+    "wsj.com": 1.0,
+    "ft.com": 1.0,
+    "sec.gov": 1.0,
+    "apnews.com": 0.95,
+    "cnbc.com": 0.9,
+    "economist.com": 0.9,
+    "nytimes.com": 0.9,
+    "forbes.com": 0.8,
+    "techcrunch.com": 0.8,
+    "businessinsider.com": 0.75,
+    "crunchbase.com": 0.75,
+    "businesswire.com": 0.7,
+    "prnewswire.com": 0.7,
+    "globenewswire.com": 0.7,
+    "wikipedia.org": 0.7,
+    "linkedin.com": 0.5,
+    "medium.com": 0.35,
+    "reddit.com": 0.3,
+    "quora.com": 0.2,
+    "pinterest.com": 0.1
+}
+DEFAULT_REPUTATION = 0.5
+TLD_REPUTATION = {"gov": 0.9, "edu": 0.8}
+
+LEGAL_SUFFIXES = re.compile(r"\b(inc|incorporated|corp|corporation|co|company|ltd|limited|llc|plc|gmbh|ag|sa)\b\.?", re.IGNORECASE)
+
+def host_of(url: str) -> str:
+    try:
+        return urlparse(url if "://" in url else f"https://{url}").netloc.lower().split(":")[0].removeprefix("www.")
+    except Exception:
+        return ""
+
+def _on_domain(host: str, domain: str) -> bool:
+    return bool(domain) and (host == domain or host.endswith(f".{domain}"))
+
+class Signal:
+    """One relevance signal, scored for a whole batch of documents at once.
+
+    `scores` returns a value in [0, 1] per entry. `neutral` is the value at
+    which the signal leaves a document's score unchanged. Signals limited to
+    some document types set `doc_types`; entries of other types ignore them.
+    """
+
+    name = ""
+    neutral = 0.0
+    doc_types: Optional[set] = None
+
+    def applies_to(self, doc_type: str) -> bool:
+        return self.doc_types is None or doc_type in self.doc_types
+
+    def scores(self, entries: List[Entry], context: Dict[str, Any]) -> array:
+        raise NotImplementedError
+
+class TavilyScoreSignal(Signal):
+    name = "tavily"
+
+    def scores(self, entries, context):
+        values = array('d', bytes(8 * len(entries)))
+        for i, (_, _, doc) in enumerate(entries):
+            try:
+                values[i] = min(1.0, max(0.0, float(doc.get('score', 0))))
+            except (ValueError, TypeError) as e:
+                logger.warning(f"Error processing score for document: {e}")
+        return values
+
+class CompanyMatchSignal(Signal):
+    """Whether a document is from the company's own site or mentions the company."""
+
+    name = "company_match"
+
+    def scores(self, entries, context):
+        name = re.sub(r"\s+", " ", LEGAL_SUFFIXES.sub("", context.get('company') or "")).strip(" ,.").lower()
+        domain = host_of(context['company_url']) if context.get('company_url') else ""
+        domain_label = domain.split(".")[0] if domain else ""
+        name_pattern = re.compile(rf"\b{re.escape(name)}\b") if name else None
+        label_pattern = re.compile(rf"\b{re.escape(domain_label)}\b") if len(domain_label) > 2 else None
+
+        values = array('d', bytes(8 * len(entries)))
+        for i, (_, url, doc) in enumerate(entries):
+            if _on_domain(host_of(url), domain):
+                values[i] = 1.0
+                continue
+            title = (doc.get('title') or "").lower()
+            content = (doc.get('content') or "").lower()
+            if name_pattern and name_pattern.search(title):
+                values[i] = 1.0
+            elif name_pattern and name_pattern.search(content):
+                values[i] = 0.8
+            elif label_pattern and (label_pattern.search(title) or label_pattern.search(content)):
+                values[i] = 0.6
+        return values
+
+class RecencySignal(Signal):
+    """Exponential decay on the age of news articles; undated articles score 0.5."""
+
+    name = "recency"
+    neutral = 0.5
+    doc_types = {"news"}
+
+    def __init__(self, half_life_days: float = 30) -> None:
+        self.half_life_days = half_life_days
+
+    @staticmethod
+    def parse_date(value: str) -> Optional[datetime]:
+        try:
+            parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            try:
+                parsed = parsedate_to_datetime(value)
+            except (TypeError, ValueError):
+                return None
+        return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+    def scores(self, entries, context):
+        now = context.get('now') or time.time()
+        values = array('d', [0.5]) * len(entries)
+        for i, (_, _, doc) in enumerate(entries):
+            if published := doc.get('published_date'):
+                if parsed := self.parse_date(str(published)):
+                    age_days = max(0.0, (now - parsed.timestamp()) / 86400)
+                    values[i] = 0.5 ** (age_days / self.half_life_days)
+        return values
+
+class DomainReputationSignal(Signal):
+    name = "domain_reputation"
+    neutral = DEFAULT_REPUTATION
+
+    def __init__(self, reputation: Dict[str, float] = None) -> None:
+        self.reputation = reputation or DOMAIN_REPUTATION
+
+    def reputation_for(self, host: str) -> float:
+        parts = host.split(".")
+        for i in range(len(parts) - 1):
+            if (score := self.reputation.get(".".join(parts[i:]))) is not None:
+                return score
+        return TLD_REPUTATION.get(parts[-1], DEFAULT_REPUTATION)
+
+    def scores(self, entries, context):
+        by_host: Dict[str, float] = {}
+        values = array('d', bytes(8 * len(entries)))
+        for i, (_, url, _) in enumerate(entries):
+            host = host_of(url)
+            if host not in by_host:
+                by_host[host] = self.reputation_for(host)
+            values[i] = by_host[host]
+        return values
+
+class QueryAgreementSignal(Signal):
+    """How many distinct queries, across all analysts, returned the same URL."""
+
+    name = "query_agreement"
+
+    def scores(self, entries, context):
+        queries: Dict[str, set] = {}
+        for _, url, doc in entries:
+            found_by = queries.setdefault(url, set())
+            found_by.update(doc.get('queries') or [doc.get('query', '')])
+        values = array('d', bytes(8 * len(entries)))
+        for i, (_, url, _) in enumerate(entries):
+            values[i] = min(1.0, (len(queries[url]) - 1) / 2)
+        return values
+
+SIGNALS = {
+    signal.name: signal
+    for signal in (TavilyScoreSignal, CompanyMatchSignal, RecencySignal, DomainReputationSignal, QueryAgreementSignal)
+}
+
+class RelevanceScorer:
+    """Tavily's score adjusted by further relevance signals, for every document in a job.
+
+    The combined score stays on the Tavily scale so the curation thresholds
+    keep their meaning: each other signal adds `weight * (value - neutral)`,
+    so a document from an unremarkable source that mentions nothing special
+    keeps its Tavily score, and the weight is the most a signal can move it.
+    Each signal scores the whole batch in one call and only counts for the
+    document types it applies to. Signals are pluggable: pass any `Signal`
+    instances with weights keyed by name; "tavily" scales the base score.
+    """
+
+    DEFAULT_WEIGHTS = {
+        "tavily": 1.0,
+        "company_match": 0.1,
+        "domain_reputation": 0.1,
+        "query_agreement": 0.1,
+        "recency": 0.1
+    }
+
+    def __init__(self, signals: List[Signal], weights: Dict[str, float]) -> None:
+        self.signals = [signal for signal in signals if weights.get(signal.name, 0) > 0]
+        self.weights = weights
+
+    @classmethod
+    def from_env(cls) -> "RelevanceScorer":
+        # CURATION_SIGNAL_WEIGHTS="company_match=0.2,recency=0"; a weight of 0 disables a signal
+        weights = dict(cls.DEFAULT_WEIGHTS)
+        for item in os.getenv("CURATION_SIGNAL_WEIGHTS", "").split(","):
+            name, _, weight = item.partition("=")
+            if name.strip() in SIGNALS and weight.strip():
+                weights[name.strip()] = float(weight)
+        signals = [
+            RecencySignal(float(os.getenv("CURATION_RECENCY_HALF_LIFE_DAYS", "30"))) if name == "recency" else signal()
+            for name, signal in SIGNALS.items()
+        ]
+        return cls(signals, weights)
+
+    def applies(self, name: str, doc_type: str) -> bool:
+        return any(signal.name == name and signal.applies_to(doc_type) for signal in self.signals)
+
+    def score(self, entries: List[Entry], context: Dict[str, Any]) -> Tuple[array, Dict[str, array]]:
+        """Combined score per entry, plus each signal's scores by name."""
+        breakdown = {signal.name: signal.scores(entries, context) for signal in self.signals}
+        base = breakdown.get("tavily") or TavilyScoreSignal().scores(entries, context)
+        combined = array('d', bytes(8 * len(entries)))
+        for i, (_, _, doc) in enumerate(entries):
+            doc_type = doc.get('doc_type')
+            total = self.weights.get("tavily", 1.0) * base[i]
+            for signal in self.signals:
+                if signal.name != "tavily" and signal.applies_to(doc_type):
+                    total += self.weights[signal.name] * (breakdown[signal.name][i] - signal.neutral)
+            combined[i] = min(1.0, max(0.0, total))
+        return combined, breakdown
@@ -0,0 +1,208 @@
+import logging
+import re
+from typing import Dict, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Fixed ## sections of the final report, in order
+REPORT_SECTIONS = ["Company Overview", "Industry Overview", "Financial Overview", "News", "References"]
+
+_BULLET_RE = re.compile(r'^(\s*)(?:[-*+•●▪]|\d+[.)])\s+')
+_SECTION_LOOKUP = {name.lower(): name for name in REPORT_SECTIONS}
+
+def report_title(company: str) -> str:
+    return f"# {company} Research Report"
+
+def _is_bullet(line: str) -> bool:
+    return bool(_BULLET_RE.match(line))
+
+def _normalize_bullet(line: str) -> str:
+    """Rewrite any bullet marker (-, +, •, 1.) as '*', keeping nesting indentation."""
+    match = _BULLET_RE.match(line)
+    if not match:
+        return line
+    indent = match.group(1).replace('\t', '    ')
+    return f"{indent}* {line[match.end():].strip()}"
+
+def split_sections(content: str) -> Tuple[List[str], Dict[str, List[str]], List[str]]:
+    """Split a markdown report into (preamble lines, {section: lines}, unknown ## headers)."""
+    preamble: List[str] = []
+    sections: Dict[str, List[str]] = {}
+    unknown_headers: List[str] = []
+    current = None
+
+    for line in content.splitlines():
+        stripped = line.strip()
+        if stripped.startswith('## '):
+            header = stripped[3:].strip().strip('#').strip()
+            if name := _SECTION_LOOKUP.get(header.lower()):
+                current = name
+                sections.setdefault(current, [])
+                continue
+            unknown_headers.append(header)
+            # Demote unexpected ## headers to subsections of the current section
+            line = f"### {header}"
+        if current is None:
+            preamble.append(line)
+        else:
+            sections[current].append(line)
+
+    return preamble, sections, unknown_headers
+
+def _format_body(lines: List[str], section: str) -> List[str]:
+    """Normalize bullets and spacing inside a section body."""
+    body: List[str] = []
+    previous_kind = None
+    for line in lines:
+        line = line.rstrip()
+        stripped = line.strip()
+        if not stripped:
+            continue
+        if stripped.startswith('#'):
+            if section == "News":
+                # The News section is bullets only
+                continue
+            kind = "header"
+            line = "### " + stripped.lstrip('#').strip()
+        elif _is_bullet(line):
+            kind = "bullet"
+            line = _normalize_bullet(line)
+        else:
+            kind = "text"
+            line = stripped
+
+        # One blank line around headers and between lists and paragraphs
+        if body and (kind == "header" or previous_kind == "header" or kind != previous_kind):
+            body.append("")
+        body.append(line)
+        previous_kind = kind
+    return body
+
+def _strip_blank_edges(lines: List[str]) -> List[str]:
+    """Drop blank lines before and after a block, keeping the ones inside it."""
+    start, end = 0, len(lines)
+    while start < end and not lines[start].strip():
+        start += 1
+    while end > start and not lines[end - 1].strip():
+        end -= 1
+    return lines[start:end]
+
+def normalize_report(content: str, company: str) -> str:
+    """Deterministically enforce the report layout.
+
+    Sets the title, orders the ## sections, drops empty sections, rewrites
+    bullets as '*', removes code fences and collapses blank lines. The
+    References section is copied through unchanged.
+    """
+    content = "\n".join(line for line in content.splitlines() if not line.strip().startswith('```'))
+    preamble, sections, _ = split_sections(content)
+
+    # Text before the first section (other than the title) belongs to the overview
+    leading = [line for line in preamble if line.strip() and not line.strip().startswith('# ')]
+    if leading:
+        sections["Company Overview"] = leading + sections.get("Company Overview", [])
+
+    output = [report_title(company)]
+    for name in REPORT_SECTIONS:
+        lines = sections.get(name)
+        if not lines:
+            continue
+        if name == "References":
+            body = _strip_blank_edges(lines)
+        else:
+            body = _format_body(lines, name)
+        if not body:
+            continue
+        output.extend(["", f"## {name}", ""])
+        output.extend(body)
+
+    return "\n".join(output).strip() + "\n"
+
+def validate_report(content: str, company: str) -> List[str]:
+    """Return the layout problems in a report; an empty list means it is valid."""
+    problems = []
+    lines = [line for line in content.strip().splitlines()]
+    if not lines or lines[0].strip() != report_title(company):
+        problems.append("missing or incorrect title")
+    if any(line.strip().startswith('```') for line in lines):
+        problems.append("contains code blocks")
+
+    _, sections, unknown_headers = split_sections(content)
+    if unknown_headers:
+        problems.append(f"unexpected sections: {', '.join(unknown_headers)}")
+
+    order = [line.strip()[3:].strip() for line in lines if line.strip().startswith('## ')]
+    expected = [name for name in REPORT_SECTIONS if name in sections]
+    if [_SECTION_LOOKUP.get(header.lower(), header) for header in order] != expected:
+        problems.append("sections out of order or repeated")
+
+    for name, body in sections.items():
+        if name != "References" and not any(line.strip() for line in body):
+            problems.append(f"empty section: {name}")
+    if any(line.strip().startswith('#') for line in sections.get("News", [])):
+        problems.append("headers in News section")
+
+    return problems
+
+# Briefing categories and the report section each one fills
+BRIEFING_SECTIONS = {
+    'company': "Company Overview",
+    'industry': "Industry Overview",
+    'financial': "Financial Overview",
+    'news': "News"
+}
+
+_WORD_RE = re.compile(r"[a-z0-9$%.]+")
+
+def _bullet_tokens(line: str) -> frozenset:
+    text = _BULLET_RE.sub('', line).lower()
+    return frozenset(word.strip('.') for word in _WORD_RE.findall(text) if word.strip('.'))
+
+def _is_near_duplicate(tokens: frozenset, seen: List[frozenset], threshold: float) -> bool:
+    for other in seen:
+        union = len(tokens | other)
+        if union and len(tokens & other) / union >= threshold:
+            return True
+    return False
+
+def assemble_report(company: str, briefings: Dict[str, str], reference_text: str = "",
+                    duplicate_threshold: float = 0.8) -> str:
+    """Build the report skeleton directly from the category briefings.
+
+    Bullets that repeat an earlier bullet (Jaccard similarity of their word
+    sets at or above `duplicate_threshold`) are dropped across all sections.
+    """
+    seen: List[frozenset] = []
+    output = [report_title(company)]
+    removed = 0
+
+    for category, section in BRIEFING_SECTIONS.items():
+        content = (briefings.get(category) or "").strip()
+        if not content:
+            continue
+
+        lines = []
+        for line in content.splitlines():
+            stripped = line.strip()
+            if stripped.startswith('#'):
+                # Briefings only contribute subsections
+                lines.append("### " + stripped.lstrip('#').strip())
+                continue
+            if _is_bullet(line):
+                tokens = _bullet_tokens(line)
+                if tokens and _is_near_duplicate(tokens, seen, duplicate_threshold):
+                    removed += 1
+                    continue
+                seen.append(tokens)
+            lines.append(line)
+
+        output.extend(["", f"## {section}", ""])
+        output.extend(lines)
+
+    if removed:
+        logger.info(f"Removed {removed} near-duplicate bullets while assembling report")
+
+    report = "\n".join(output)
+    if reference_text:
+        report = f"{report}\n\n{reference_text.strip()}"
+    return normalize_report(report, company)
@@ -0,0 +1,83 @@
+import asyncio
+
+import pytest
+
+from backend.nodes import briefing as briefing_module
+from backend.nodes.briefing import Briefing
+from backend.services.llm_cache import LLMOutputCache
+
+COMPANY_DOCS = {
+    "https://acme.com/customers": {
+        "title": "Acme customers",
+        "raw_content": "Acme Corp sells anvil products to customers.",
+        "evaluation": {"overall_score": 0.9}
+    },
+    "https://acme.com/platform": {
+        "title": "Acme platform",
+        "raw_content": "Acme Corp runs an anvil platform with services.",
+        "evaluation": {"overall_score": 0.9}
+    }
+}
+
+
+def news_docs(headline, terms):
+    # News passages repeating `terms` would shift their BM25 weight in a shared index
+    return {
+        "https://reuters.com/acme": {
+            "title": headline,
+            "raw_content": "\n\n".join(f"{headline}, with {terms} number {i}." for i in range(5)),
+            "evaluation": {"overall_score": 0.8}
+        }
+    }
+
+
+@pytest.fixture
+def briefing(monkeypatch):
+    monkeypatch.setattr(briefing_module.client_pool, "get_model", lambda **kwargs: object())
+    monkeypatch.setattr(briefing_module, "llm_cache", LLMOutputCache())
+    node = Briefing(None, "project")
+    node.prompts = {}
+
+    async def fake_stream(prompt, category, context):
+        node.prompts.setdefault(category, []).append(prompt)
+        return f"* {category} briefing"
+
+    node._stream_briefing = fake_stream
+    return node
+
+
+def run_job(node, headline, terms="products customers"):
+    state = {
+        "company": "Acme Corp",
+        "industry": "Manufacturing",
+        "curated_company_data": COMPANY_DOCS,
+        "curated_news_data": news_docs(headline, terms)
+    }
+    return asyncio.run(node.create_briefings(state))
+
+
+def test_category_prompt_does_not_depend_on_other_categories(briefing, monkeypatch):
+    # One passage per briefing, so the prompt shows which passage ranked first
+    monkeypatch.setenv("BRIEFING_MAX_PASSAGES", "1")
+    keys = []
+    make_key = briefing_module.llm_cache.make_key
+    monkeypatch.setattr(briefing_module.llm_cache, "make_key", lambda *args: keys.append(make_key(*args)) or keys[-1])
+
+    first = run_job(briefing, "Acme opens a new plant")
+    second = run_job(briefing, "Acme appoints a new chief executive", terms="platform services")
+
+    # The company briefing came from the cache the second time; news had to be regenerated
+    assert len(briefing.prompts["company"]) == 1
+    assert len(briefing.prompts["news"]) == 2
+    assert first["company_briefing"] == second["company_briefing"] == "* company briefing"
+    assert first["briefing_fingerprints"]["company"] == second["briefing_fingerprints"]["company"]
+    assert len(set(keys)) == 3
+
+
+def test_passages_are_ranked_within_the_category(briefing):
+    run_job(briefing, "Acme opens a new plant")
+
+    company_prompt = briefing.prompts["company"][0]
+    assert "anvil products" in company_prompt
+    assert "anvil platform" in company_prompt
+    assert "Acme opens a new plant" not in company_prompt
@@ -0,0 +1,96 @@
+import asyncio
+import zlib
+
+from langchain_core.messages import AIMessage, SystemMessage
+
+from backend.graph import _node_runner
+from backend.services.checkpoint_store import CheckpointStore
+from backend.services.page_store import PageStore
+
+PAGE = "Acme Corp builds industrial anvils. " * 20
+
+
+def curated_output():
+    return {
+        "company": "Acme",
+        "websocket_manager": object(),
+        "messages": [SystemMessage(content="start"), AIMessage(content="enriched")],
+        "curated_news_data": {
+            "https://reuters.com/acme": {"url": "https://reuters.com/acme", "title": "Acme", "raw_content": PAGE},
+            "https://ft.com/acme": {"url": "https://ft.com/acme", "duplicate_of": "https://reuters.com/acme",
+                                    "raw_content": PAGE},
+            "https://example.com/acme": {"url": "https://example.com/acme", "content": "snippet"}
+        }
+    }
+
+
+def make_store(tmp_path=None):
+    page_store = PageStore()
+    db_path = str(tmp_path / "checkpoints.db") if tmp_path else None
+    return CheckpointStore(db_path, page_store=page_store), page_store
+
+
+def test_node_output_round_trips_without_transient_keys():
+    store, page_store = make_store()
+    asyncio.run(page_store.put_many({"https://reuters.com/acme": PAGE}))
+
+    asyncio.run(store.save_node("job-1", "enricher", curated_output()))
+    loaded = asyncio.run(store.load_node("job-1", "enricher"))
+
+    assert "websocket_manager" not in loaded
+    assert [m.content for m in loaded["messages"]] == ["start", "enriched"]
+    docs = loaded["curated_news_data"]
+    assert docs["https://reuters.com/acme"]["raw_content"] == PAGE
+    assert docs["https://ft.com/acme"]["raw_content"] == PAGE
+    assert "raw_content" not in docs["https://example.com/acme"]
+    assert all("__page_content__" not in doc for doc in docs.values())
+
+
+def test_page_text_is_not_checkpointed():
+    store, _ = make_store()
+    asyncio.run(store.save_node("job-1", "enricher", curated_output()))
+
+    blobs = store._jobs["job-1"]["blobs"].values()
+    assert all(b"industrial anvils" not in zlib.decompress(blob) for blob in blobs)
+
+
+def test_missing_page_text_is_logged(caplog):
+    store, _ = make_store()
+    asyncio.run(store.save_node("job-1", "enricher", curated_output()))
+
+    loaded = asyncio.run(store.load_node("job-1", "enricher"))
+
+    assert "raw_content" not in loaded["curated_news_data"]["https://reuters.com/acme"]
+    assert "no longer holds the content of 2/2" in caplog.text
+
+
+def test_unchanged_state_is_stored_once():
+    store, _ = make_store()
+    output = {"company": "Acme", "briefings": {"news": "* item"}}
+    asyncio.run(store.save_node("job-1", "briefing", output))
+    blobs = len(store._jobs["job-1"]["blobs"])
+    asyncio.run(store.save_node("job-1", "editor", {**output, "report": "# Acme"}))
+
+    assert len(store._jobs["job-1"]["blobs"]) == blobs + 1
+    assert asyncio.run(store.completed_nodes("job-1", ["briefing", "editor", "curator"])) == ["briefing", "editor"]
+
+
+def test_checkpoints_survive_a_new_store(tmp_path):
+    store, _ = make_store(tmp_path)
+    asyncio.run(store.save_job("job-1", {"company": "Acme"}))
+    asyncio.run(store.save_node("job-1", "collector", {"company": "Acme", "news_data": {"a": {"title": "A"}}}))
+
+    reopened, _ = make_store(tmp_path)
+    assert asyncio.run(reopened.load_job("job-1")) == {"company": "Acme"}
+    assert asyncio.run(reopened.load_node("job-1", "collector"))["news_data"] == {"a": {"title": "A"}}
+    assert asyncio.run(reopened.load_node("job-1", "curator")) is None
+
+
+def test_resumed_node_is_replayed_from_its_checkpoint():
+    store, _ = make_store()
+    asyncio.run(store.save_node("job-1", "collector", {"company": "Acme", "collected": True}))
+    config = {"configurable": {"checkpoint_store": store, "resume": True, "job_id": "job-1"}}
+
+    output = asyncio.run(_node_runner("collector")({"company": "Acme"}, config))
+
+    assert output == {"company": "Acme", "collected": True}
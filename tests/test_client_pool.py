@@ -0,0 +1,52 @@
+import asyncio
+
+import httpx
+
+from backend.services.client_pool import ClientPool, PooledTavilyClient
+
+
+def slow_transport(started: asyncio.Event, release: asyncio.Event):
+    async def handler(request):
+        started.set()
+        await release.wait()
+        return httpx.Response(200, json={"results": [{"url": "https://example.com", "raw_content": "text"}]})
+    return httpx.MockTransport(handler)
+
+
+def test_evicted_client_finishes_in_flight_requests_before_closing():
+    async def scenario():
+        started, release = asyncio.Event(), asyncio.Event()
+        pool = ClientPool(max_clients=1)
+        client = PooledTavilyClient("key-a", transport=slow_transport(started, release))
+        pool._tavily[pool._key("key-a")] = client
+
+        request = asyncio.create_task(client.extract("https://example.com"))
+        await started.wait()
+
+        pool.get_tavily_client("key-b")  # evicts key-a while its request is running
+        await asyncio.sleep(0)
+        assert client.in_flight == 1
+        assert not client._http_client.is_closed
+
+        release.set()
+        result = await request
+        return result, client
+
+    result, client = asyncio.run(scenario())
+    assert result["results"][0]["raw_content"] == "text"
+    assert client.in_flight == 0
+    assert client._http_client.is_closed
+
+
+def test_retired_client_reopens_for_late_requests():
+    async def scenario():
+        started, release = asyncio.Event(), asyncio.Event()
+        release.set()
+        client = PooledTavilyClient("key-a", transport=slow_transport(started, release))
+        await client.aclose()
+        result = await client.extract("https://example.com")
+        return result, client
+
+    result, client = asyncio.run(scenario())
+    assert result["results"]
+    assert client._http_client.is_closed
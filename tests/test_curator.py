@@ -0,0 +1,66 @@
+import asyncio
+
+from backend.nodes.curator import Curator
+from backend.utils.relevance import RelevanceScorer, TavilyScoreSignal
+
+STORY = "Acme Corp agreed to buy Widget Works for two billion dollars in cash, the companies said on Monday"
+OTHER = "Acme Corp reported record quarterly revenue driven by strong demand for its industrial anvils"
+
+
+def doc(content, score):
+    return {"title": content[:20], "content": content, "score": score, "query": "acme"}
+
+
+class FakeWebSocketManager:
+    def __init__(self):
+        self.updates = []
+
+    async def send_status_update(self, job_id, status, message=None, result=None):
+        self.updates.append({"status": status, "result": result})
+
+
+def test_duplicate_report_is_built_from_curated_documents():
+    curator = Curator()
+    curator.scorer = RelevanceScorer([TavilyScoreSignal()], {"tavily": 1.0})
+    curator.top_k["company"] = 1
+    manager = FakeWebSocketManager()
+    state = {
+        "company": "Acme Corp",
+        "job_id": "job-1",
+        "websocket_manager": manager,
+        # The best copy of the story is cut by the company top-k
+        "company_data": {
+            "https://acme.com/results": doc(OTHER, 0.9),
+            "https://acme.com/deal": doc(STORY, 0.8)
+        },
+        "news_data": {
+            "https://reuters.com/deal": doc(STORY, 0.7),
+            "https://example.com/deal": doc(STORY + ".", 0.6)
+        }
+    }
+
+    state = asyncio.run(curator.curate_data(state))
+
+    assert list(state["curated_company_data"]) == ["https://acme.com/results"]
+    assert list(state["curated_news_data"]) == ["https://reuters.com/deal"]
+    complete = next(u for u in manager.updates if u["status"] == "curation_complete")
+    assert complete["result"]["duplicate_clusters"] == [{
+        "kept": "https://reuters.com/deal",
+        "aliases": ["https://example.com/deal"],
+        "categories": ["news_data"]
+    }]
+
+
+def test_cross_category_copies_point_at_best_survivor():
+    curator = Curator()
+    curator.scorer = RelevanceScorer([TavilyScoreSignal()], {"tavily": 1.0})
+    state = {
+        "company": "Acme Corp",
+        "industry_data": {"https://ft.com/deal": doc(STORY, 0.6)},
+        "news_data": {"https://reuters.com/deal": doc(STORY, 0.7)}
+    }
+
+    state = asyncio.run(curator.curate_data(state))
+
+    assert state["curated_industry_data"]["https://ft.com/deal"]["duplicate_of"] == "https://reuters.com/deal"
+    assert "duplicate_of" not in state["curated_news_data"]["https://reuters.com/deal"]
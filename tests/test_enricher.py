@@ -0,0 +1,83 @@
+import asyncio
+
+from backend.nodes.enricher import Enricher
+
+
+class FakeTavily:
+    def __init__(self, fail_batches=False):
+        self.fail_batches = fail_batches
+        self.calls = []
+
+    async def extract(self, urls):
+        self.calls.append(urls)
+        if isinstance(urls, list) and self.fail_batches:
+            raise RuntimeError("batch failed")
+        urls = urls if isinstance(urls, list) else [urls]
+        return {"results": [{"url": url, "raw_content": f"content of {url}"} for url in urls]}
+
+
+class FakeWebSocketManager:
+    def __init__(self):
+        self.updates = []
+
+    async def send_status_update(self, job_id, status, message=None, result=None):
+        self.updates.append({"job_id": job_id, "status": status, "result": result})
+
+
+def test_fetch_single_content_reports_success():
+    manager = FakeWebSocketManager()
+    enricher = Enricher(FakeTavily())
+
+    result = asyncio.run(enricher.fetch_single_content("https://example.com/a", manager, "job-1", "news"))
+
+    assert result == {"https://example.com/a": "content of https://example.com/a"}
+    assert [update["status"] for update in manager.updates] == ["extracting", "extracted"]
+    assert manager.updates[-1]["result"]["success"] is True
+
+
+def test_batch_retry_goes_through_fetch_single_content():
+    manager = FakeWebSocketManager()
+    tavily = FakeTavily(fail_batches=True)
+    enricher = Enricher(tavily)
+    urls = ["https://example.com/a", "https://example.com/b"]
+
+    contents = asyncio.run(enricher.fetch_raw_content(urls, manager, "job-1", "news"))
+
+    assert contents == {url: f"content of {url}" for url in urls}
+    assert tavily.calls[1:] == urls
+    assert "extraction_error" not in [update["status"] for update in manager.updates]
+
+
+class FailingUrlTavily(FakeTavily):
+    def __init__(self, failing_url):
+        super().__init__()
+        self.failing_url = failing_url
+
+    async def extract(self, urls):
+        response = await super().extract(urls)
+        response["results"] = [r for r in response["results"] if r["url"] != self.failing_url]
+        return response
+
+
+class EmptyPageStore:
+    async def get_many(self, urls):
+        return {}
+
+    async def put_many(self, contents):
+        pass
+
+
+def test_duplicate_falls_back_to_own_url_when_canonical_extraction_fails():
+    enricher = Enricher(FailingUrlTavily("https://reuters.com/deal"))
+    enricher.page_store = EmptyPageStore()
+    duplicate = {"url": "https://ft.com/deal", "doc_type": "industry", "duplicate_of": "https://reuters.com/deal"}
+    state = {
+        "company": "Acme",
+        "curated_news_data": {"https://reuters.com/deal": {"url": "https://reuters.com/deal", "doc_type": "news"}},
+        "curated_industry_data": {"https://ft.com/deal": duplicate}
+    }
+
+    state = asyncio.run(enricher.enrich_data(state))
+
+    assert "raw_content" not in state["curated_news_data"]["https://reuters.com/deal"]
+    assert state["curated_industry_data"]["https://ft.com/deal"]["raw_content"] == "content of https://ft.com/deal"
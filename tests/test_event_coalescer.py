@@ -0,0 +1,40 @@
+import asyncio
+import logging
+
+from backend.services.event_coalescer import EventCoalescer
+
+
+def status(name, **result):
+    return {"type": "status_update", "data": {"status": name, "message": "", "result": result}}
+
+
+def test_timed_flush_merges_chunks():
+    async def scenario():
+        sent = []
+
+        async def emit(job_id, update):
+            sent.append(update["data"]["result"]["chunk"])
+
+        coalescer = EventCoalescer(emit, window=0.01)
+        for chunk in ("Acme ", "builds ", "rockets"):
+            await coalescer.submit("job-1", status("briefing_chunk", category="company", chunk=chunk))
+        await asyncio.sleep(0.05)
+        return sent, coalescer._flush_tasks
+
+    sent, tasks = asyncio.run(scenario())
+    assert sent == ["Acme builds rockets"]
+    assert not tasks
+
+
+def test_failed_timed_flush_is_logged(caplog):
+    async def scenario():
+        async def emit(job_id, update):
+            raise ConnectionError("broadcast failed")
+
+        coalescer = EventCoalescer(emit, window=0.01)
+        await coalescer.submit("job-1", status("briefing_chunk", category="company", chunk="text"))
+        await asyncio.sleep(0.05)
+
+    with caplog.at_level(logging.ERROR, logger="backend.services.event_coalescer"):
+        asyncio.run(scenario())
+    assert "Failed to flush coalesced updates for job job-1: broadcast failed" in caplog.text
@@ -0,0 +1,75 @@
+import asyncio
+
+from backend import graph
+from backend.graph import Graph, _node_runner
+from backend.services.checkpoint_store import CheckpointStore
+
+
+class RecordingNode:
+    def __init__(self):
+        self.seen = None
+
+    async def run(self, state):
+        self.seen = dict(state)
+        state["collected"] = True
+        return state
+
+
+def test_job_context_comes_from_the_run_config(monkeypatch):
+    node = RecordingNode()
+    monkeypatch.setitem(graph.NODE_FACTORIES, "collector", lambda deps: node)
+    store = CheckpointStore()
+    manager = object()
+    config = {"configurable": {"websocket_manager": manager, "job_id": "job-1", "checkpoint_store": store}}
+
+    output = asyncio.run(_node_runner("collector")({"company": "Acme"}, config))
+
+    assert node.seen["websocket_manager"] is manager
+    assert node.seen["job_id"] == "job-1"
+    assert output == {"company": "Acme", "collected": True}
+    assert asyncio.run(store.load_node("job-1", "collector")) == output
+
+
+def test_graph_passes_job_context_through_config_not_state():
+    manager = object()
+    research = Graph(company="Acme", websocket_manager=manager, job_id="job-1")
+
+    assert "websocket_manager" not in research.input_state
+    assert "job_id" not in research.input_state
+    assert research._configurable()["websocket_manager"] is manager
+    assert research._configurable()["job_id"] == "job-1"
+
+
+def test_workflow_runs_with_job_context_outside_state(monkeypatch):
+    seen = []
+
+    class StubNode:
+        def __init__(self, name):
+            self.name = name
+
+        async def run(self, state):
+            seen.append((self.name, state["job_id"]))
+            if self.name == "editor":
+                return {"report": "# Acme", "job_id": state["job_id"]}
+            # Analysts run in parallel, so each may only write keys of its own
+            return {"job_id": state["job_id"]}
+
+    for name in graph.NODE_FACTORIES:
+        monkeypatch.setitem(graph.NODE_FACTORIES, name, lambda deps, name=name: StubNode(name))
+    graph.compiled_workflow.cache_clear()
+    try:
+        async def run():
+            final = {}
+            async for update in Graph(company="Acme", job_id="job-1").run(thread={}):
+                for output in update.values():
+                    final.update(output or {})
+            return final
+
+        final = asyncio.run(run())
+    finally:
+        graph.compiled_workflow.cache_clear()
+
+    assert final["report"] == "# Acme"
+    assert "job_id" not in final
+    assert {job_id for _, job_id in seen} == {"job-1"}
+    assert len(seen) == len(graph.NODE_FACTORIES)
@@ -0,0 +1,35 @@
+import os
+
+os.environ.setdefault("JOB_STORE", "memory")
+
+from starlette.requests import Request
+
+from application import job_priority
+
+
+def request_with(headers):
+    return Request({
+        "type": "http",
+        "headers": [(name.lower().encode(), value.encode()) for name, value in headers.items()]
+    })
+
+
+def test_priority_is_ignored_without_an_operator_token(monkeypatch):
+    monkeypatch.delenv("JOB_PRIORITY_TOKEN", raising=False)
+    assert job_priority(request_with({"X-Job-Priority": "100"})) == 0
+
+
+def test_priority_requires_the_matching_token(monkeypatch):
+    monkeypatch.setenv("JOB_PRIORITY_TOKEN", "secret")
+    assert job_priority(request_with({"X-Job-Priority": "5"})) == 0
+    assert job_priority(request_with({"X-Job-Priority": "5", "Authorization": "Bearer wrong"})) == 0
+    assert job_priority(request_with({"X-Job-Priority": "5", "Authorization": "Bearer secret"})) == 5
+
+
+def test_priority_is_clamped(monkeypatch):
+    monkeypatch.setenv("JOB_PRIORITY_TOKEN", "secret")
+    monkeypatch.setenv("MAX_JOB_PRIORITY", "10")
+    headers = {"Authorization": "Bearer secret"}
+    assert job_priority(request_with({**headers, "X-Job-Priority": "1000"})) == 10
+    assert job_priority(request_with({**headers, "X-Job-Priority": "-1000"})) == -10
+    assert job_priority(request_with({**headers, "X-Job-Priority": "high"})) == 0
@@ -0,0 +1,83 @@
+from backend.services.job_registry import JobRegistry
+
+
+class DeferredReportStore:
+    """Job store stand-in whose report writes complete only when the test says so."""
+
+    def __init__(self):
+        self.pending = {}
+
+    def enqueue_report(self, job_id, report_data, on_done=None):
+        self.pending[job_id] = (report_data, on_done)
+
+    def finish(self, job_id, written):
+        _, on_done = self.pending.pop(job_id)
+        on_done(written)
+
+
+def completed_job(registry, job_id, report):
+    registry.create(job_id)
+    registry.transition(job_id, JobRegistry.PROCESSING)
+    registry.transition(job_id, JobRegistry.COMPLETED, report=report)
+
+
+def test_report_stays_in_memory_until_the_store_confirms_it():
+    store = DeferredReportStore()
+    registry = JobRegistry(max_reports=1, job_store=store)
+    completed_job(registry, "a", "report a")
+    completed_job(registry, "b", "report b")
+
+    # "a" is over the in-memory limit; its write has started but is unconfirmed
+    assert "a" in store.pending
+    assert registry["a"]["report"] == "report a"
+    assert registry["a"]["report_persisted"] is False
+
+    store.finish("a", written=False)
+    assert registry["a"]["report"] == "report a"
+
+    # A later pass retries the write, and the copy is released once it is confirmed
+    completed_job(registry, "c", "report c")
+    store.finish("a", written=True)
+    assert registry["a"]["report_persisted"] is True
+    completed_job(registry, "d", "report d")
+    assert registry["a"]["report"] is None
+
+
+def test_finished_job_with_unwritten_report_is_not_evicted():
+    store = DeferredReportStore()
+    registry = JobRegistry(max_jobs=1, job_store=store)
+    completed_job(registry, "a", "report a")
+    completed_job(registry, "b", "report b")
+
+    assert "a" in registry
+    store.finish("a", written=True)
+    completed_job(registry, "c", "report c")
+    assert "a" not in registry
+
+
+def test_oldest_finished_jobs_are_evicted_first():
+    registry = JobRegistry(max_jobs=3)
+    registry.create("running")
+    registry.transition("running", JobRegistry.PROCESSING)
+    for job_id in ("a", "b", "c"):
+        completed_job(registry, job_id, None)
+
+    assert "running" in registry
+    assert "a" not in registry
+    assert "b" in registry and "c" in registry
+    assert registry.evicted_jobs == 1
+
+
+def test_spilled_reports_are_released_oldest_first():
+    store = DeferredReportStore()
+    registry = JobRegistry(max_reports=2, job_store=store)
+    for job_id in ("a", "b", "c"):
+        completed_job(registry, job_id, f"report {job_id}")
+
+    assert list(store.pending) == ["a"]
+    store.finish("a", written=True)
+    completed_job(registry, "d", "report d")
+
+    assert registry["a"]["report"] is None
+    assert list(store.pending) == ["b"]
+    assert registry.memory_usage()["reports_in_memory"] == 3
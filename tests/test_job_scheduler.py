@@ -0,0 +1,115 @@
+import asyncio
+import logging
+
+import pytest
+
+from backend.services.job_scheduler import JobScheduler, QueueFullError
+
+
+class FailingWebSocketManager:
+    async def send_status_update(self, job_id, status, message=None, result=None):
+        raise ConnectionError("client went away")
+
+
+def test_failed_position_updates_are_logged(caplog):
+    async def scenario():
+        scheduler = JobScheduler(max_concurrent=1, websocket_manager=FailingWebSocketManager())
+        release = asyncio.Event()
+        scheduler.submit("running", release.wait)
+        scheduler.submit("queued", release.wait)
+        assert scheduler._notifications
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        pending = len(scheduler._notifications)
+        release.set()
+        await asyncio.sleep(0.01)
+        return pending
+
+    with caplog.at_level(logging.WARNING, logger="backend.services.job_scheduler"):
+        assert asyncio.run(scenario()) == 0
+    assert "Failed to send queue position update: client went away" in caplog.text
+
+
+def test_higher_priority_starts_first_and_equal_priority_is_fifo():
+    async def scenario():
+        scheduler = JobScheduler(max_concurrent=1)
+        started = []
+        releases = {}
+
+        def job(job_id):
+            releases[job_id] = asyncio.Event()
+
+            async def run():
+                started.append(job_id)
+                await releases[job_id].wait()
+            return run
+
+        scheduler.submit("running", job("running"))
+        positions = [
+            scheduler.submit("low", job("low"), priority=-1),
+            scheduler.submit("first", job("first")),
+            scheduler.submit("second", job("second")),
+            scheduler.submit("urgent", job("urgent"), priority=5)
+        ]
+        waiting = scheduler._waiting()
+
+        # Finish whichever job is running and wait for the next one to start
+        while not started:
+            await asyncio.sleep(0)
+        while len(started) < len(releases):
+            count = len(started)
+            releases[started[-1]].set()
+            while len(started) == count:
+                await asyncio.sleep(0)
+        releases[started[-1]].set()
+        return positions, waiting, started
+
+    positions, waiting, started = asyncio.run(scenario())
+    assert positions == [1, 1, 2, 1]
+    assert waiting == ["urgent", "first", "second", "low"]
+    assert started == ["running", "urgent", "first", "second", "low"]
+
+
+def test_submit_raises_when_the_queue_is_full():
+    async def scenario():
+        scheduler = JobScheduler(max_concurrent=1, max_queue=1)
+        release = asyncio.Event()
+        scheduler.submit("running", release.wait)
+        scheduler.submit("queued", release.wait)
+        with pytest.raises(QueueFullError):
+            scheduler.submit("rejected", release.wait)
+        assert scheduler.stats()["queued"] == 1
+        release.set()
+
+    asyncio.run(scenario())
+
+
+def test_only_queued_jobs_can_be_cancelled():
+    async def scenario():
+        scheduler = JobScheduler(max_concurrent=1)
+        started = []
+        release = asyncio.Event()
+
+        async def running():
+            await release.wait()
+
+        async def queued():
+            started.append("queued")
+
+        scheduler.submit("running", running)
+        scheduler.submit("queued", queued)
+        await asyncio.sleep(0)
+
+        assert scheduler.cancel("running") is False
+        assert scheduler.is_running("running")
+        assert scheduler.cancel("queued") is True
+        assert scheduler.position("queued") is None
+        assert scheduler.cancel("queued") is False
+
+        release.set()
+        await asyncio.sleep(0.01)
+        return started, scheduler.stats()
+
+    started, stats = asyncio.run(scenario())
+    assert started == []
+    assert stats["running"] == 0 and stats["queued"] == 0
@@ -0,0 +1,43 @@
+import asyncio
+
+import pytest
+
+from backend.services.job_store import InMemoryJobStore, JobStore, MongoJobStore
+
+
+class FlakyMongo:
+    def __init__(self, failures):
+        self.failures = failures
+        self.reports = {}
+
+    def store_report(self, job_id, report_data):
+        if self.failures:
+            self.failures -= 1
+            raise RuntimeError("mongodb unavailable")
+        self.reports[job_id] = report_data
+
+
+def test_incomplete_store_fails_at_construction():
+    class PartialStore(JobStore):
+        async def create_job(self, job_id, inputs):
+            pass
+
+    with pytest.raises(TypeError):
+        PartialStore()
+
+
+def test_complete_stores_can_be_created():
+    InMemoryJobStore()
+
+
+@pytest.mark.parametrize("failures, written", [(0, True), (1, True), (3, False)])
+def test_report_write_outcome_is_reported(failures, written):
+    async def scenario():
+        store = MongoJobStore(FlakyMongo(failures), report_retries=2)
+        outcomes = []
+        store.enqueue_report("job-1", {"report": "text"}, on_done=outcomes.append)
+        await store.flush()
+        await store.close()
+        return outcomes
+
+    assert asyncio.run(scenario()) == [written]
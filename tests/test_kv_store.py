@@ -0,0 +1,46 @@
+import time
+
+import pytest
+
+from backend.services.kv_store import SQLiteKeyValueStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    return SQLiteKeyValueStore(str(tmp_path / "nested" / "kv.db"), "entries")
+
+
+def test_set_get_delete(store):
+    assert store.get("a") is None
+    store.set("a", b"value", stored_at=10.0)
+    assert store.get("a") == (b"value", 10.0)
+    store.set("a", b"newer")
+    assert store.get("a")[0] == b"newer"
+    store.delete("a")
+    assert store.get("a") is None
+
+
+def test_invalid_table_name_is_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        SQLiteKeyValueStore(str(tmp_path / "kv.db"), "entries; DROP TABLE x")
+
+
+def test_purge_touch_and_trim(store):
+    now = time.time()
+    store.set("old", b"1", stored_at=now - 100)
+    store.set("kept", b"2", stored_at=now - 100)
+    store.set("new", b"3", stored_at=now)
+    store.touch("kept", now - 1)
+
+    assert store.purge_older_than(50) == 1
+    assert store.get("old") is None
+
+    assert store.trim(1) == 1
+    assert store.get("new") is not None and store.get("kept") is None
+
+
+def test_tables_in_one_file_are_separate(tmp_path):
+    path = str(tmp_path / "kv.db")
+    first, second = SQLiteKeyValueStore(path, "first"), SQLiteKeyValueStore(path, "second")
+    first.set("key", b"first")
+    assert second.get("key") is None
@@ -0,0 +1,71 @@
+import asyncio
+
+from backend.services.kv_store import SQLiteKeyValueStore
+from backend.services.llm_cache import LLMOutputCache
+
+PARAMS = {"decoding_method": "greedy", "temperature": 0.7}
+
+
+def key(prompt, model_id="ibm/granite", params=PARAMS, version="1"):
+    return LLMOutputCache.make_key("briefing", model_id, params, version, prompt)
+
+
+def test_key_covers_model_params_version_and_prompt():
+    base = key("prompt")
+    assert key("prompt") == base
+    assert key("other prompt") != base
+    assert key("prompt", model_id="ibm/other") != base
+    assert key("prompt", params={**PARAMS, "temperature": 0.2}) != base
+    assert key("prompt", version="2") != base
+
+
+def test_hit_after_set_and_stats_per_node():
+    cache = LLMOutputCache()
+
+    async def run():
+        missed = await cache.get("briefing", key("prompt"))
+        await cache.set(key("prompt"), "* briefing")
+        return missed, await cache.get("briefing", key("prompt"))
+
+    assert asyncio.run(run()) == (None, "* briefing")
+    assert cache.stats()["nodes"]["briefing"] == {"hits": 1, "misses": 1, "hit_ratio": 0.5}
+
+
+def test_entries_expire_after_ttl(monkeypatch):
+    cache = LLMOutputCache(ttl=60)
+    now = [1000.0]
+    monkeypatch.setattr("backend.services.llm_cache.time.time", lambda: now[0])
+    asyncio.run(cache.set(key("prompt"), "* briefing"))
+
+    now[0] += 61
+    assert asyncio.run(cache.get("briefing", key("prompt"))) is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_memory_tier_is_bounded_by_entries_and_chars():
+    cache = LLMOutputCache(max_entries=2, max_chars=10)
+
+    async def run():
+        await cache.set("a", "1234")
+        await cache.set("b", "1234")
+        await cache.set("c", "1234")  # over max_entries: "a" goes
+        await cache.set("d", "12345678")  # over max_chars: "b" and "c" go
+
+    asyncio.run(run())
+    assert list(cache._entries) == ["d"]
+    assert cache.stats()["chars"] == 8
+
+
+def test_empty_outputs_are_not_cached():
+    cache = LLMOutputCache()
+    asyncio.run(cache.set(key("prompt"), ""))
+    assert cache.stats()["entries"] == 0
+
+
+def test_persistent_tier_survives_a_new_cache(tmp_path):
+    path = str(tmp_path / "llm.db")
+    asyncio.run(LLMOutputCache(backend=SQLiteKeyValueStore(path, "llm_outputs")).set(key("prompt"), "* briefing"))
+
+    reopened = LLMOutputCache(backend=SQLiteKeyValueStore(path, "llm_outputs"))
+    assert asyncio.run(reopened.get("briefing", key("prompt"))) == "* briefing"
+    assert reopened.stats()["entries"] == 1
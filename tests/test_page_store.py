@@ -0,0 +1,43 @@
+import asyncio
+import time
+
+from backend.services.page_store import PageStore
+
+
+def test_expired_pages_and_blobs_are_collected(tmp_path):
+    store = PageStore(max_age=60, db_path=str(tmp_path / "pages.db"))
+    asyncio.run(store.put_many({"https://acme.com/a": "old page"}))
+    old = time.time() - 120
+    store.urls.touch(store.url_key("https://acme.com/a"), old)
+    store.blobs.touch(store.content_hash("old page"), old)
+    asyncio.run(store.put_many({"https://acme.com/b": "new page"}))
+
+    store.collect_garbage()
+
+    assert store.urls.get(store.url_key("https://acme.com/a")) is None
+    assert store.blobs.get(store.content_hash("old page")) is None
+    assert store.blobs.get(store.content_hash("new page")) is not None
+
+
+def test_store_is_capped_at_max_entries(tmp_path):
+    store = PageStore(db_path=str(tmp_path / "pages.db"), max_entries=2, hot_entries=0)
+    for i in range(4):
+        asyncio.run(store.put_many({f"https://acme.com/{i}": f"page {i}"}))
+        time.sleep(0.01)
+
+    store.collect_garbage()
+
+    found = asyncio.run(store.get_many([f"https://acme.com/{i}" for i in range(4)]))
+    assert found == {"https://acme.com/2": "page 2", "https://acme.com/3": "page 3"}
+
+
+def test_shared_blob_lives_as_long_as_its_newest_url(tmp_path):
+    store = PageStore(max_age=60, db_path=str(tmp_path / "pages.db"))
+    asyncio.run(store.put_many({"https://acme.com/a": "same page"}))
+    digest = store.content_hash("same page")
+    store.blobs.touch(digest, time.time() - 120)
+    asyncio.run(store.put_many({"https://acme.com/b": "same page"}))
+
+    store.collect_garbage()
+
+    assert store.blobs.get(digest) is not None
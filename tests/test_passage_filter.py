@@ -0,0 +1,74 @@
+import pytest
+
+from backend.utils.passage_filter import (
+    CATEGORY_QUERIES, PassageIndex, category_query, clean_content, is_boilerplate, tokenize
+)
+
+PAGE = """[Home](https://acme.com) | [Products](https://acme.com/p) | [Careers](https://acme.com/c)
+Skip to main content
+We use cookies to improve your experience. Accept all
+
+Acme Corp raised $50 million in a Series B round led by Example Ventures.
+
+Acme's platform helps construction customers order anvils online.
+
+Subscribe to our newsletter
+© 2025 Acme Corp. All rights reserved."""
+
+
+@pytest.mark.parametrize("line", [
+    "Skip to main content",
+    "Subscribe to our newsletter",
+    "© 2025 Acme Corp. All rights reserved.",
+    "[Home](https://acme.com) | [About](https://acme.com/about)",
+    "   ",
+])
+def test_boilerplate_lines(line):
+    assert is_boilerplate(line)
+
+
+def test_long_lines_mentioning_chrome_words_are_kept():
+    line = ("Acme said it will subscribe its customers to a new maintenance plan covering every anvil "
+            "sold in North America during the next three years.")
+    assert not is_boilerplate(line)
+
+
+def test_clean_content_removes_boilerplate_and_link_markup():
+    cleaned = clean_content(PAGE)
+
+    assert cleaned == (
+        "Acme Corp raised $50 million in a Series B round led by Example Ventures.\n\n"
+        "Acme's platform helps construction customers order anvils online."
+    )
+
+
+def test_most_query_relevant_passage_ranks_first():
+    index = PassageIndex.from_documents([
+        ("https://acme.com", PAGE),
+        ("https://news.com", "Acme appointed a new head of sales.\n\nThe weather in Phoenix was sunny.")
+    ])
+
+    scores = index.scores(category_query("financial", "Acme Corp"))
+    ranked = [index.passages[i] for i in sorted(scores, key=scores.get, reverse=True)]
+
+    assert ranked[0].startswith("Acme Corp raised $50 million")
+    assert "The weather in Phoenix was sunny." not in ranked
+    scorer = index.scorer(category_query("financial", "Acme Corp"))
+    assert scorer(ranked[0]) == 1.0
+    assert scorer("The weather in Phoenix was sunny.") == 0.0
+
+
+def test_documents_are_split_once_and_shared_passages_indexed_once():
+    text = "Acme opened a plant.\n\nAcme hired staff."
+    index = PassageIndex.from_documents([("a", text), ("b", text), ("a", "ignored")])
+
+    assert index.passages_for("a") == index.passages_for("b") == ["Acme opened a plant.", "Acme hired staff."]
+    assert len(index.passages) == 2
+
+
+def test_category_queries_describe_each_category():
+    assert set(CATEGORY_QUERIES) == {"company", "industry", "financial", "news"}
+    assert category_query("financial", "Acme").startswith("Acme revenue funding")
+    assert category_query("industry", "Acme", "Manufacturing").endswith("Manufacturing")
+    assert "Manufacturing" not in category_query("news", "Acme", "Manufacturing")
+    assert tokenize("The Acme of a platform") == ["acme", "platform"]
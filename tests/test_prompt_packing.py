@@ -0,0 +1,105 @@
+import pytest
+
+from backend.utils.prompt_packing import (
+    estimate_tokens, pack_documents, passage_key, passage_limit, split_passages, term_scorer, token_budget
+)
+
+
+def paragraph(word, sentences=10):
+    return " ".join(f"{word} sentence number {i} about the company." for i in range(sentences))
+
+
+def test_category_budgets_and_overrides(monkeypatch):
+    monkeypatch.delenv("BRIEFING_TOKEN_BUDGET", raising=False)
+    monkeypatch.delenv("BRIEFING_TOKEN_BUDGET_COMPANY", raising=False)
+    assert token_budget("company") == 10000
+    assert token_budget("news") == 8000
+    assert token_budget("unknown") == 8000
+
+    monkeypatch.setenv("BRIEFING_TOKEN_BUDGET", "500")
+    assert token_budget("news") == 500
+    monkeypatch.setenv("BRIEFING_TOKEN_BUDGET_COMPANY", "700")
+    assert token_budget("company") == 700
+    assert token_budget("news") == 500
+
+    monkeypatch.setenv("BRIEFING_MAX_PASSAGES", "7")
+    assert passage_limit() == 7
+
+
+def test_split_passages_keeps_paragraphs_and_breaks_long_ones():
+    text = "Short first paragraph.\n\n\n  \nSecond paragraph.\n\n" + paragraph("long", 40)
+
+    passages = split_passages(text, target_chars=200)
+
+    assert passages[:2] == ["Short first paragraph.", "Second paragraph."]
+    assert len(passages) > 3
+    assert all(len(p) <= 400 for p in passages)
+    # Long paragraphs are split on sentence boundaries
+    assert all(p.endswith(".") for p in passages[2:])
+
+
+def test_text_without_sentence_breaks_is_cut():
+    passages = split_passages("x" * 2000, target_chars=100)
+    assert "".join(passages) == "x" * 2000
+    assert max(len(p) for p in passages) <= 200
+
+
+def test_passage_key_ignores_case_punctuation_and_whitespace():
+    assert passage_key("Acme raised $10M!") == passage_key("acme  raised 10m")
+    assert passage_key("Acme raised $10M") != passage_key("Acme raised $20M")
+
+
+@pytest.mark.parametrize("budget", [60, 150, 400])
+def test_packed_prompt_stays_under_budget(budget):
+    docs = [(f"Doc {i}", paragraph(f"topic{i}", 20), 0.5) for i in range(5)]
+
+    entries, stats = pack_documents(docs, budget_tokens=budget)
+
+    assert stats["tokens"] <= budget
+    assert sum(estimate_tokens(entry) for entry in entries) <= budget + len(entries)
+    assert stats["budget"] == budget
+
+
+def test_best_ranked_passages_are_kept_first():
+    docs = [
+        ("Weak", "Weak passage about nothing in particular.", 0.1),
+        ("Strong", "Strong passage about Acme funding.", 0.9),
+        ("Middle", "Middle passage about the market.", 0.5)
+    ]
+
+    # Room for two documents only
+    entries, stats = pack_documents(docs, budget_tokens=30)
+
+    assert stats["documents"] == 2
+    assert [entry.split("\n")[0] for entry in entries] == ["Title: Strong", "Title: Middle"]
+
+
+def test_scorer_ranks_passages_within_a_document():
+    content = ["Filler passage with no subject.", "Acme Acme revenue passage."]
+
+    entries, _ = pack_documents([("Doc", content, 0.5)], budget_tokens=15, scorer=term_scorer(["Acme"]))
+
+    assert entries == ["Title: Doc\n\nContent: Acme Acme revenue passage."]
+
+
+def test_duplicate_passages_are_packed_once():
+    shared = "Acme announced a partnership with Widget Works."
+    docs = [("First", [shared, "Only in first."], 0.9), ("Second", [shared, "Only in second."], 0.8)]
+
+    entries, stats = pack_documents(docs, budget_tokens=1000)
+
+    assert stats["duplicates"] == 1
+    assert sum(entry.count(shared) for entry in entries) == 1
+    assert "Only in second." in entries[1]
+
+
+def test_per_document_cap_and_passage_limit():
+    docs = [("A", [paragraph("a", 3), paragraph("b", 3)], 0.9), ("B", [paragraph("c", 3)], 0.5)]
+    cap = estimate_tokens(paragraph("a", 3))
+
+    entries, stats = pack_documents(docs, budget_tokens=1000, max_doc_tokens=cap)
+    assert stats["passages"] == 2
+    assert len(entries) == 2
+
+    _, stats = pack_documents(docs, budget_tokens=1000, max_passages=1)
+    assert stats["passages"] == 1
@@ -0,0 +1,49 @@
+import time
+
+import pytest
+
+from backend.nodes.curator import Curator
+from backend.utils.relevance import RelevanceScorer
+
+CONTEXT = {"company": "Acme Corp", "company_url": "https://www.acme.com", "now": time.time()}
+
+
+def entry(url, score, doc_type="industry", data_field="industry_data", **doc):
+    return (data_field, url, {"url": url, "score": score, "doc_type": doc_type, "query": "q", **doc})
+
+
+@pytest.mark.parametrize("doc_entry, kept", [
+    # Documents that neither mention the company nor come from a notable source keep their Tavily score
+    (entry("https://example.com/market", 0.5, title="Cloud market grows"), True),
+    (entry("https://example.com/market", 0.4, title="Cloud market grows"), True),
+    (entry("https://example.com/market", 0.39, title="Cloud market grows"), False),
+    (entry("https://example.com/n", 0.4, "news", "news_data", title="Sector update"), True),
+    # Company pages and reputable sources are lifted over the threshold
+    (entry("https://acme.com/about", 0.35, "company", "company_data", title="About us"), True),
+    (entry("https://www.reuters.com/x", 0.36, title="Cloud market grows"), True),
+    # Low-reputation sources and stale news are pushed under it
+    (entry("https://www.pinterest.com/x", 0.42, title="Cloud boards"), False),
+    (entry("https://example.com/old", 0.42, "news", "news_data", title="Old", published_date="2020-01-01"), False),
+])
+def test_combined_score_keeps_tavily_threshold(doc_entry, kept):
+    scorer = RelevanceScorer.from_env()
+    scores, _ = scorer.score([doc_entry], CONTEXT)
+    assert (scores[0] >= 0.4) is kept
+
+
+def test_unremarkable_document_keeps_tavily_score():
+    scores, _ = RelevanceScorer.from_env().score([entry("https://example.com/a", 0.5)], CONTEXT)
+    assert scores[0] == pytest.approx(0.5)
+
+
+def test_curator_threshold_applies_to_combined_score():
+    curator = Curator()
+    entries = [
+        entry("https://example.com/a", 0.5),
+        entry("https://example.com/b", 0.3),
+        entry("https://acme.com/about", 0.35, "company", "company_data"),
+    ]
+    scores, signals = curator.scorer.score(entries, CONTEXT)
+    evaluated = curator.select_documents(entries, scores, signals)
+    assert [doc["url"] for doc in evaluated["industry_data"]] == ["https://example.com/a"]
+    assert [doc["url"] for doc in evaluated["company_data"]] == ["https://acme.com/about"]
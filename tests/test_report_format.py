@@ -0,0 +1,53 @@
+from backend.utils.report_format import normalize_report
+
+
+def test_references_are_copied_verbatim():
+    before = "\n".join([
+        "# Acme Research Report",
+        "## Company Overview",
+        "- Acme makes anvils.",
+        "## References",
+        "",
+        "### Company",
+        "",
+        "* Acme. \"About us\". https://acme.com/about",
+        "",
+        "",
+        "### News",
+        "",
+        "* Reuters. \"Acme expands\". https://reuters.com/acme",
+        "",
+    ])
+
+    after = normalize_report(before, "Acme")
+
+    assert after == "\n".join([
+        "# Acme Research Report",
+        "",
+        "## Company Overview",
+        "",
+        "* Acme makes anvils.",
+        "",
+        "## References",
+        "",
+        "### Company",
+        "",
+        "* Acme. \"About us\". https://acme.com/about",
+        "",
+        "",
+        "### News",
+        "",
+        "* Reuters. \"Acme expands\". https://reuters.com/acme",
+    ]) + "\n"
+
+
+def test_sections_are_normalized_and_ordered():
+    before = "# Acme\n## News\n+ Acme raised prices.\n\n\n## Company Overview\n\n1. Founded in 1949.\n"
+
+    after = normalize_report(before, "Acme")
+
+    assert after == (
+        "# Acme Research Report\n\n"
+        "## Company Overview\n\n* Founded in 1949.\n\n"
+        "## News\n\n* Acme raised prices.\n"
+    )
@@ -0,0 +1,92 @@
+import asyncio
+import os
+
+os.environ.setdefault("JOB_STORE", "memory")
+
+import pytest
+from fastapi.testclient import TestClient
+
+import application
+from backend.services.checkpoint_store import CheckpointStore
+from backend.services.job_registry import JobRegistry
+from backend.services.job_scheduler import JobScheduler
+
+API_KEYS = {"X-Tavily-API-Key": "t", "X-WatsonX-API-Key": "w", "X-WatsonX-Project-ID": "p"}
+
+
+@pytest.fixture
+def client():
+    return TestClient(application.app)
+
+
+def test_full_queue_returns_429_with_retry_after(client, monkeypatch):
+    monkeypatch.setattr(application, "scheduler", JobScheduler(max_concurrent=0, max_queue=0))
+
+    response = client.post("/research", json={"company": "Acme"}, headers=API_KEYS)
+
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "30"
+    assert "queue is full" in response.json()["detail"]
+
+
+def test_queued_job_can_be_cancelled(client, monkeypatch):
+    scheduler = JobScheduler(max_concurrent=0)
+    monkeypatch.setattr(application, "scheduler", scheduler)
+    application.job_registry.create("queued-job", company="Acme")
+
+    async def never_started():
+        raise AssertionError("cancelled job started")
+
+    scheduler.submit("queued-job", never_started)
+    response = client.post("/research/queued-job/cancel")
+
+    assert response.status_code == 200
+    assert response.json() == {"status": "cancelled", "job_id": "queued-job"}
+    assert application.job_registry["queued-job"]["status"] == JobRegistry.CANCELLED
+    assert scheduler.position("queued-job") is None
+
+
+def test_running_job_cannot_be_cancelled(client, monkeypatch):
+    scheduler = JobScheduler(max_concurrent=1)
+    monkeypatch.setattr(application, "scheduler", scheduler)
+    scheduler._running["running-job"] = None
+
+    response = client.post("/research/running-job/cancel")
+
+    assert response.status_code == 409
+
+
+def test_resume_without_a_checkpoint_is_404(client, monkeypatch):
+    monkeypatch.setattr(application, "checkpoint_store", CheckpointStore())
+
+    response = client.post("/research/unknown-job/resume", headers=API_KEYS)
+
+    assert response.status_code == 404
+
+
+def test_resume_of_a_running_job_is_409(client, monkeypatch):
+    scheduler = JobScheduler(max_concurrent=1)
+    scheduler._running["running-job"] = None
+    monkeypatch.setattr(application, "scheduler", scheduler)
+
+    response = client.post("/research/running-job/resume", headers=API_KEYS)
+
+    assert response.status_code == 409
+
+
+def test_resume_requeues_the_job_with_its_completed_nodes(client, monkeypatch):
+    store = CheckpointStore()
+    scheduler = JobScheduler(max_concurrent=0)
+    monkeypatch.setattr(application, "checkpoint_store", store)
+    monkeypatch.setattr(application, "scheduler", scheduler)
+    asyncio.run(store.save_job("failed-job", {"company": "Acme", "company_url": "acme.com"}))
+    for node in ("grounding", "financial_analyst"):
+        asyncio.run(store.save_node("failed-job", node, {"company": "Acme"}))
+
+    response = client.post("/research/failed-job/resume", headers=API_KEYS)
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["completed_nodes"] == ["grounding", "financial_analyst"]
+    assert body["queue_position"] == 1
+    assert application.job_registry["failed-job"]["status"] == JobRegistry.PENDING
@@ -0,0 +1,45 @@
+import asyncio
+import time
+
+from backend.services import research_refresh
+from backend.services.checkpoint_store import CheckpointStore
+from backend.services.research_refresh import plan_refresh, record_completed_job
+from backend.services.search_cache import SearchCache
+
+
+def test_pointers_survive_job_traffic():
+    store = CheckpointStore(max_jobs=2)
+
+    async def run():
+        await record_completed_job(store, "Acme Corp", "https://acme.com", "job-1")
+        for i in range(10):
+            await store.save_job(f"other-{i}", {"company": f"Other {i}"})
+        return await store.load_pointer("company:acme corp|acme.com")
+
+    pointer = asyncio.run(run())
+    assert pointer["job_id"] == "job-1"
+
+
+def test_pointers_persist_in_their_own_table(tmp_path):
+    db_path = str(tmp_path / "checkpoints.db")
+    asyncio.run(record_completed_job(CheckpointStore(db_path), "Acme Corp", None, "job-1"))
+
+    reopened = CheckpointStore(db_path)
+    assert reopened.manifests.get("pointer:company:acme corp|/value") is None
+    assert asyncio.run(reopened.load_pointer("company:acme corp|"))["job_id"] == "job-1"
+
+
+def test_refresh_uses_topic_ttls(monkeypatch):
+    cache = SearchCache(max_entries=10, ttls={"finance": 60}, default_ttl=3600)
+    monkeypatch.setattr(research_refresh, "search_cache", cache)
+    store = CheckpointStore()
+
+    async def run():
+        for node in research_refresh.REUSABLE_NODES:
+            await store.save_node("job-1", node, {"done": True})
+        await store.save_pointer("company:acme|", {"job_id": "job-1", "completed_at": time.time() - 120})
+        return await plan_refresh(store, "Acme")
+
+    plan = asyncio.run(run())
+    assert "financial_analyst" not in plan["reuse_nodes"]
+    assert {"grounding", "industry_analyst", "company_analyst"} <= set(plan["reuse_nodes"])
@@ -0,0 +1,115 @@
+import asyncio
+
+import pytest
+
+from backend.nodes.researchers import base
+from backend.nodes.researchers.company import CompanyAnalyzer
+from backend.nodes.researchers.financial import FinancialAnalyst
+from backend.nodes.researchers.news import NewsScanner
+from backend.services.search_cache import SearchCache
+
+
+class FakeTavily:
+    def __init__(self):
+        self.calls = []
+
+    async def search(self, query, **params):
+        self.calls.append(params)
+        return {"results": []}
+
+
+@pytest.fixture
+def make_researcher(monkeypatch):
+    monkeypatch.setattr(base.client_pool, "get_model", lambda **kwargs: object())
+
+    def make(cls, tavily=None):
+        return cls(tavily, None, "project")
+
+    return make
+
+
+@pytest.mark.parametrize("cls, topic", [
+    (NewsScanner, "news"),
+    (FinancialAnalyst, "finance"),
+    (CompanyAnalyzer, None)
+])
+def test_search_topic_follows_analyst(make_researcher, cls, topic):
+    assert make_researcher(cls)._search_params().get("topic") == topic
+
+
+def test_news_searches_expire_with_news_ttl(make_researcher):
+    tavily = FakeTavily()
+    scanner = make_researcher(NewsScanner, tavily)
+    scanner.search_cache = SearchCache(ttls={"news": 0}, default_ttl=3600)
+
+    async def run():
+        params = scanner._search_params()
+        await scanner._cached_search("acme news", params)
+        return await scanner._cached_search("acme news", params)
+
+    _, cached = asyncio.run(run())
+    assert tavily.calls[0]["topic"] == "news"
+    assert not cached
+
+
+class FakeChatStream:
+    """Async generator stand-in for a watsonx.ai chat stream that records being closed."""
+
+    def __init__(self, lines):
+        self.chunks = [{"choices": [{"delta": {"content": f"{line}\n"}}]} for line in lines]
+        self.closed = False
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if self.closed or not self.chunks:
+            raise StopAsyncIteration
+        return self.chunks.pop(0)
+
+    async def aclose(self):
+        self.closed = True
+
+
+def test_query_stream_is_closed_after_the_last_needed_query(make_researcher):
+    researcher = make_researcher(CompanyAnalyzer)
+    stream = FakeChatStream([f"acme query {i}" for i in range(10)])
+
+    class FakeModel:
+        async def achat_stream(self, messages):
+            return stream
+
+    researcher.watsonx_model = FakeModel()
+
+    queries = asyncio.run(researcher.generate_queries({"company": "Acme"}, "Find {company}"))
+
+    assert queries == [f"acme query {i}" for i in range(researcher.max_queries)]
+    assert stream.closed
+    assert len(stream.chunks) == 10 - researcher.max_queries
+
+
+class DelayedTavily:
+    """Returns the same URL for every query, finishing the queries in reverse order."""
+
+    def __init__(self, delays):
+        self.delays = delays
+
+    async def search(self, query, **params):
+        await asyncio.sleep(self.delays[query])
+        if query == "broken":
+            raise RuntimeError("search failed")
+        return {"results": [{"url": "https://acme.com", "title": f"Acme via {query}",
+                             "content": "Acme", "score": 0.5}]}
+
+
+def test_search_results_merge_in_query_order(make_researcher):
+    queries = ["slow", "broken", "fast"]
+    researcher = make_researcher(CompanyAnalyzer, DelayedTavily({"slow": 0.03, "broken": 0.02, "fast": 0}))
+    researcher.search_cache = SearchCache()
+
+    docs = asyncio.run(researcher.search_documents({}, queries))
+
+    doc = docs["https://acme.com"]
+    assert doc["query"] == "slow"
+    assert doc["title"] == "Acme via slow"
+    assert doc["queries"] == ["slow", "fast"]
@@ -0,0 +1,109 @@
+import asyncio
+
+import pytest
+
+from backend.nodes.researchers import base
+from backend.nodes.researchers.company import CompanyAnalyzer
+from backend.nodes.researchers.news import NewsScanner
+from backend.services.kv_store import SQLiteKeyValueStore
+from backend.services.search_cache import SearchCache
+
+NEWS = {"topic": "news", "search_depth": "basic", "max_results": 5}
+GENERAL = {"search_depth": "basic", "max_results": 5}
+RESULT = {"results": [{"url": "https://reuters.com/acme", "content": "Acme news"}]}
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("backend.services.search_cache.time.time", lambda: now[0])
+    return now
+
+
+def test_key_normalizes_query_and_covers_result_params():
+    cache = SearchCache()
+    assert cache.make_key('  Acme  "Funding" ', GENERAL) == cache.make_key("acme funding", GENERAL)
+    assert cache.make_key("acme funding", GENERAL) != cache.make_key("acme funding", NEWS)
+    assert cache.make_key("acme", GENERAL) != cache.make_key("acme", {**GENERAL, "max_results": 10})
+
+
+def test_entries_expire_per_topic(clock):
+    cache = SearchCache(ttls={"news": 900}, default_ttl=86400)
+
+    async def run():
+        await cache.set("acme", NEWS, RESULT)
+        await cache.set("acme", GENERAL, RESULT)
+        clock[0] += 901
+        return await cache.get("acme", NEWS), await cache.get("acme", GENERAL)
+
+    assert asyncio.run(run()) == (None, RESULT)
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+
+
+def test_memory_tier_is_lru_bounded():
+    cache = SearchCache(max_entries=2)
+
+    async def run():
+        await cache.set("a", GENERAL, RESULT)
+        await cache.set("b", GENERAL, RESULT)
+        await cache.get("a", GENERAL)
+        await cache.set("c", GENERAL, RESULT)
+        return [await cache.get(query, GENERAL) is not None for query in ("a", "b", "c")]
+
+    assert asyncio.run(run()) == [True, False, True]
+    assert cache.stats()["evictions"] == 1
+
+
+def test_sqlite_tier_serves_a_new_process(tmp_path, clock):
+    path = str(tmp_path / "search.db")
+    asyncio.run(SearchCache(backend=SQLiteKeyValueStore(path, "search_cache")).set("acme", NEWS, RESULT))
+
+    warm = SearchCache(ttls={"news": 900}, backend=SQLiteKeyValueStore(path, "search_cache"))
+    assert asyncio.run(warm.get("acme", NEWS)) == RESULT
+    assert warm.stats()["entries"] == 1
+
+    # The stored age carries over, so expiry still applies
+    cold = SearchCache(ttls={"news": 900}, backend=SQLiteKeyValueStore(path, "search_cache"))
+    clock[0] += 901
+    assert asyncio.run(cold.get("acme", NEWS)) is None
+
+
+def test_finance_ttl_from_env(monkeypatch):
+    monkeypatch.setenv("SEARCH_CACHE_NEWS_TTL", "60")
+    monkeypatch.setenv("SEARCH_CACHE_FINANCE_TTL", "3600")
+    monkeypatch.setenv("SEARCH_CACHE_TTL", "7200")
+    monkeypatch.delenv("SEARCH_CACHE_DB", raising=False)
+    cache = SearchCache.from_env()
+    assert (cache.ttl_for("news"), cache.ttl_for("finance"), cache.ttl_for(None)) == (60, 3600, 7200)
+
+
+class FakeTavily:
+    def __init__(self):
+        self.calls = []
+
+    async def search(self, query, **params):
+        self.calls.append(params)
+        return RESULT
+
+
+@pytest.mark.parametrize("cls, topic", [(NewsScanner, "news"), (CompanyAnalyzer, None)])
+def test_researcher_searches_use_their_topic_ttl(cls, topic, clock, monkeypatch):
+    # Regression: news searches used to go out with the general topic and its TTL
+    monkeypatch.setattr(base.client_pool, "get_model", lambda **kwargs: object())
+    tavily = FakeTavily()
+    researcher = cls(tavily, None, "project")
+    researcher.search_cache = SearchCache(ttls={"news": 900}, default_ttl=86400)
+
+    async def run():
+        params = researcher._search_params()
+        await researcher._cached_search("acme", params)
+        clock[0] += 600
+        _, fresh = await researcher._cached_search("acme", params)
+        clock[0] += 600
+        _, later = await researcher._cached_search("acme", params)
+        return fresh, later
+
+    fresh, later = asyncio.run(run())
+    assert tavily.calls[0].get("topic") == topic
+    assert fresh is True
+    assert later is (topic != "news")
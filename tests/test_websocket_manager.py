@@ -0,0 +1,52 @@
+import asyncio
+import json
+
+from backend.services.websocket_manager import ConnectionWriter, is_coalescible
+
+
+class BlockedWebSocket:
+    """A client that never finishes receiving, so the send queue only grows."""
+
+    def __init__(self):
+        self.closed_with = None
+
+    async def send_text(self, message):
+        await asyncio.Event().wait()
+
+    async def close(self, code=1000):
+        self.closed_with = code
+
+
+def status(name, **result):
+    return {"type": "status_update", "data": {"status": name, "result": result}}
+
+
+def test_only_latest_wins_statuses_are_coalescible():
+    assert is_coalescible(status("query_generating", query="acme rev"))
+    assert not is_coalescible(status("briefing_chunk", chunk="Acme "))
+    assert not is_coalescible(status("report_chunk", chunk="# Report"))
+
+
+def test_full_queue_drops_query_progress_but_never_briefing_chunks():
+    async def scenario():
+        metrics = {"sent": 0, "dropped": 0, "slow_disconnects": 0, "max_queue_depth": 0}
+        writer = ConnectionWriter(BlockedWebSocket(), "job-1", 3, metrics, lambda ws, job_id: None)
+        messages = [
+            status("briefing_chunk", chunk="one "),
+            status("query_generating", query="acme"),
+            status("briefing_chunk", chunk="two "),
+            status("briefing_chunk", chunk="three"),
+        ]
+        results = [writer.enqueue(json.dumps(m), is_coalescible(m)) for m in messages]
+        queued = [json.loads(m)["data"]["result"] for m, _ in writer.queue]
+        # A fifth chunk cannot be queued without losing text, so the client is disconnected
+        overflow = writer.enqueue(json.dumps(status("briefing_chunk", chunk="four")), False)
+        writer.close()
+        return results, queued, overflow, metrics
+
+    results, queued, overflow, metrics = asyncio.run(scenario())
+    assert all(results)
+    assert [r.get("chunk") for r in queued if "chunk" in r] == ["one ", "two ", "three"]
+    assert metrics["dropped"] == 1
+    assert overflow is False
+    assert metrics["slow_disconnects"] == 1
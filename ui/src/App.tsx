@@ -446,7 +446,8 @@ function App() {
                       [category]: {
                         ...currentCounts,
                         enriched: Math.min(
-                          currentCounts.enriched + 1,
+                          currentCounts.enriched +
+                            (statusData.result.count ?? 1),
                           currentCounts.total
                         ),
                       },
@@ -471,7 +472,10 @@ function App() {
                       ...prev.enrichmentCounts,
                       [category]: {
                         ...currentCounts,
-                        total: Math.max(0, currentCounts.total - 1),
+                        total: Math.max(
+                          0,
+                          currentCounts.total - (statusData.result.count ?? 1)
+                        ),
                       },
                     } as EnrichmentCounts,
                   };
@@ -538,7 +542,7 @@ function App() {
                     ...prev.docCounts,
                     [docType]: {
                       initial: prev.docCounts[docType].initial,
-                      kept: prev.docCounts[docType].kept + 1,
+                      kept: prev.docCounts[docType].kept + (statusData.result.count ?? 1),
                     },
                   } as DocCounts,
                 };